@@ -7,6 +7,7 @@ import json
 import logging
 
 from anus.core.agent.base_agent import BaseAgent
+from anus.core.memory.retriever import HybridRetriever
 
 class ReactAgent(BaseAgent):
     """
@@ -15,18 +16,53 @@ class ReactAgent(BaseAgent):
     This agent implements a thought-action-observation loop for complex reasoning.
     """
     
-    def __init__(self, name: Optional[str] = None, max_iterations: int = 10, **kwargs):
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        max_iterations: int = 10,
+        retriever: Optional[HybridRetriever] = None,
+        **kwargs
+    ):
         """
         Initialize a ReactAgent instance.
         
         Args:
             name: Optional name for the agent.
             max_iterations: Maximum number of thought-action cycles to perform.
+            retriever: Optional retriever for memory context. If not provided, one
+                is created on first use over the agent's short-term and long-term
+                memory, measuring tokens with the ``model`` option if set.
             **kwargs: Additional configuration options for the agent.
         """
         super().__init__(name=name, **kwargs)
         self.max_iterations = max_iterations
         self.current_iteration = 0
+        self.retriever = retriever
+    
+    def retrieve_context(
+        self,
+        query: str,
+        token_budget: int = 2000,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the memory items most relevant to a query within a token budget.
+        
+        Args:
+            query: The text to retrieve context for, usually the task.
+            token_budget: Maximum total tokens of the retrieved items.
+            filters: Optional exact search query every retrieved item must match.
+            
+        Returns:
+            The retrieval result, with packed ``items`` and per-stage ``latency_ms``.
+        """
+        if self.retriever is None:
+            self.retriever = HybridRetriever(
+                memories=[self.config.get("short_term_memory"), self.config.get("long_term_memory")],
+                model=self.config.get("model")
+            )
+        
+        return self.retriever.retrieve(query, token_budget=token_budget, filters=filters)
     
     def execute(self, task: str, **kwargs) -> Dict[str, Any]:
         """
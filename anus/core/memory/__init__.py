@@ -4,11 +4,36 @@ Memory module for the ANUS framework.
 This module contains various memory implementations:
 - BaseMemory: Abstract base class for all memory systems
 - ShortTermMemory: Volatile in-memory storage with LRU eviction
+- ShardedShortTermMemory: Thread-safe, lock-striped short-term memory
+- SharedShortTermMemory: Short-term memory shared between processes on one host
 - LongTermMemory: Persistent storage backed by a file system
+- SegmentMemory: Persistent log-structured storage in append-only segment files
+- SQLiteMemory: Persistent storage in a SQLite database with indexed field queries
+- TieredMemory: Short-term and long-term memory behind one interface with automatic tiering
+- HybridRetriever: Token-budgeted context assembly across memory systems
+- MemoryConsolidator: Scheduled summarization of old episodes by task or session
 """
 
 from anus.core.memory.base_memory import BaseMemory
 from anus.core.memory.short_term import ShortTermMemory
+from anus.core.memory.sharded import ShardedShortTermMemory
+from anus.core.memory.shared import SharedShortTermMemory
 from anus.core.memory.long_term import LongTermMemory
+from anus.core.memory.segment_store import SegmentMemory
+from anus.core.memory.sqlite_memory import SQLiteMemory
+from anus.core.memory.tiered import TieredMemory
+from anus.core.memory.retriever import HybridRetriever
+from anus.core.memory.consolidation import MemoryConsolidator
 
-__all__ = ["BaseMemory", "ShortTermMemory", "LongTermMemory"] 
\ No newline at end of file
+__all__ = [
+    "BaseMemory",
+    "ShortTermMemory",
+    "ShardedShortTermMemory",
+    "SharedShortTermMemory",
+    "LongTermMemory",
+    "SegmentMemory",
+    "SQLiteMemory",
+    "TieredMemory",
+    "HybridRetriever",
+    "MemoryConsolidator"
+] 
\ No newline at end of file
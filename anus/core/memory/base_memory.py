@@ -3,7 +3,11 @@ Base Memory module that defines the common interface for memory systems.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Callable, BinaryIO
+import sys
+
+from anus.core.memory.query import CompiledQuery, compile_query
+from anus.core.memory.transfer import read_export, write_export
 
 class BaseMemory(ABC):
     """
@@ -52,6 +56,9 @@ class BaseMemory(ABC):
         """
         Search memory for items matching the query.
         
+        Queries map top-level or dotted field paths to values or operator
+        specs; see ``anus.core.memory.query`` for the supported operators.
+        
         Args:
             query: The search query.
             limit: Maximum number of results to return.
@@ -61,6 +68,70 @@ class BaseMemory(ABC):
         """
         pass
     
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream all items matching the query in a stable order.
+        
+        Every yielded result carries a ``cursor`` string. Passing it back as
+        ``after`` resumes the stream right after that result, so large result
+        sets can be paged through without materializing them. Cursors are
+        opaque and only valid for the memory type that produced them.
+        
+        The default implementation runs a full search and orders it by
+        identifier; memory systems override it with a streaming version.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of items to load per step.
+            after: Cursor of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        results = sorted(self.search(query, limit=sys.maxsize), key=lambda x: x["id"])
+        
+        for result in results:
+            if after is not None and result["id"] <= after:
+                continue
+            
+            result["cursor"] = result["id"]
+            yield result
+    
+    def search_similar(self, query: Union[str, List[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items most similar to a query embedding.
+        
+        Memory systems without vector search support raise NotImplementedError.
+        
+        Args:
+            query: A query vector, or text to embed with the configured embedding model.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with similarity scores, most similar first.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support similarity search")
+    
+    def search_text(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items that best match a keyword query.
+        
+        Memory systems without a text index raise NotImplementedError.
+        
+        Args:
+            query: The keyword query.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with relevance scores, best match first.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support text search")
+    
     @abstractmethod
     def update(self, identifier: str, item: Dict[str, Any]) -> bool:
         """
@@ -103,4 +174,173 @@ class BaseMemory(ABC):
         Returns:
             A dictionary containing memory statistics.
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several items to memory.
+        
+        The default implementation adds items one at a time; memory systems
+        override it with a batched version where that is cheaper.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        return [self.add(item) for item in items]
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        Used to move items between memory systems without changing their
+        identifiers. Memory systems that cannot choose identifiers do not
+        support it.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+            
+        Raises:
+            NotImplementedError: If the memory system does not support it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support storing under a given identifier")
+    
+    def get_many(self, identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several items from memory.
+        
+        Args:
+            identifiers: The identifiers of the items to retrieve.
+            
+        Returns:
+            The retrieved items in input order, with None for missing ones.
+        """
+        return [self.get(identifier) for identifier in identifiers]
+    
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Delete several items from memory.
+        
+        Args:
+            identifiers: The identifiers of the items to delete.
+            
+        Returns:
+            The number of items that were deleted.
+        """
+        return sum(1 for identifier in identifiers if self.delete(identifier))
+    
+    def export(
+        self,
+        fp: BinaryIO,
+        compression: Optional[str] = None,
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Stream every item to a binary file object as JSON lines.
+        
+        Items are read through ``iter_search``, so only one chunk is held in
+        memory at a time. See ``anus.core.memory.transfer`` for the format.
+        
+        Args:
+            fp: A binary file object opened for writing.
+            compression: None for plain JSON lines, or ``gzip``.
+            chunk_size: Number of items read and written per step.
+            progress: Optional callback invoked with the number of items exported so far.
+            
+        Returns:
+            The number of exported items.
+        """
+        return write_export(
+            fp,
+            self.iter_search({}, batch_size=chunk_size),
+            source=type(self).__name__,
+            compression=compression,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+    
+    def import_(
+        self,
+        fp: BinaryIO,
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Stream items from an export into this memory system, keeping their identifiers.
+        
+        Items replace existing items with the same identifier. Compressed
+        exports are detected automatically.
+        
+        Args:
+            fp: A binary file object opened for reading.
+            chunk_size: Number of items stored per step.
+            progress: Optional callback invoked with the number of items imported so far.
+            
+        Returns:
+            The number of imported items.
+            
+        Raises:
+            ValueError: If the stream is not a valid export.
+        """
+        count = 0
+        
+        for chunk in read_export(fp, chunk_size=chunk_size):
+            self._import_chunk(chunk)
+            count += len(chunk)
+            if progress is not None:
+                progress(count)
+        
+        self._finish_import()
+        return count
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store one chunk of imported records.
+        
+        Memory systems override this with a batched write where that is cheaper.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        for record in records:
+            self.put(record["id"], record["item"])
+    
+    def _finish_import(self) -> None:
+        """
+        Complete an import, e.g. by persisting indexes rebuilt during it.
+        """
+        self.flush()
+    
+    def flush(self) -> None:
+        """
+        Persist any buffered writes.
+        
+        Memory systems that write synchronously do not need to override this.
+        """
+        pass
+    
+    def close(self) -> None:
+        """
+        Flush buffered writes and release resources such as files and threads.
+        """
+        self.flush()
+    
+    def _matches_query(self, item: Dict[str, Any], query: Union[Dict[str, Any], CompiledQuery]) -> bool:
+        """
+        Check if an item matches a query.
+        
+        Callers checking many items should compile the query once with
+        ``compile_query`` and pass the compiled form.
+        
+        Args:
+            item: The item to check.
+            query: The query to match against, plain or compiled.
+            
+        Returns:
+            True if the item matches the query, False otherwise.
+        """
+        return compile_query(query).matches(item)
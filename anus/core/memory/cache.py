@@ -0,0 +1,177 @@
+"""
+Cache module for the ANUS framework.
+
+Provides small building blocks for memory read paths:
+- LRUCache: Bounded least-recently-used cache with hit/miss counters
+- BloomFilter: Probabilistic set for skipping lookups of unknown identifiers
+"""
+
+from typing import Dict, Any, Optional, Hashable
+from collections import OrderedDict
+import hashlib
+import math
+import threading
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry when full.
+    
+    All operations are O(1) and guarded by a lock so the cache can be shared
+    with background writer threads.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an LRUCache instance.
+        
+        Args:
+            capacity: Maximum number of entries to keep.
+        """
+        self.capacity = capacity
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry and mark it as most recently used.
+        
+        Args:
+            key: The key to look up.
+            
+        Returns:
+            The cached value, or None on a miss.
+        """
+        with self._lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Insert or replace an entry, evicting the least recently used one if needed.
+        
+        Args:
+            key: The key to store.
+            value: The value to store.
+        """
+        if self.capacity <= 0:
+            return
+        
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+    
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+        
+        Args:
+            key: The key to remove.
+        """
+        with self._lock:
+            self.entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """
+        Remove all entries. Counters are kept.
+        """
+        with self._lock:
+            self.entries = OrderedDict()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary containing cache statistics.
+        """
+        lookups = self.hits + self.misses
+        
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class BloomFilter:
+    """
+    Bloom filter over string keys.
+    
+    Answers "definitely absent" or "possibly present". Entries cannot be
+    removed, so deleted keys simply become false positives until the filter
+    is rebuilt.
+    """
+    
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        """
+        Initialize a BloomFilter instance sized for a target false positive rate.
+        
+        Args:
+            capacity: Expected number of keys.
+            error_rate: Target false positive rate at that capacity.
+        """
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+        
+        Args:
+            key: The key to add.
+        """
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    def clear(self) -> None:
+        """
+        Remove all keys.
+        """
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+    
+    def _positions(self, key: str):
+        """
+        Derive the bit positions for a key using double hashing.
+        
+        Args:
+            key: The key to hash.
+            
+        Returns:
+            An iterator over bit positions.
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        
+        return ((first + i * second) % self.size for i in range(self.hash_count))
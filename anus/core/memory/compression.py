@@ -0,0 +1,224 @@
+"""
+Compression module for the ANUS framework.
+
+Provides transparent compression of stored memory items with the standard
+library's zlib and lzma codecs, including shared zlib dictionaries that make
+small items compress well.
+"""
+
+from typing import Dict, Any, Optional, Iterable
+from collections import Counter
+import json
+import lzma
+import re
+import struct
+import zlib
+
+COMPRESSION_METHODS = ("none", "zlib", "lzma")
+
+# Compressed payloads start with a frame header. The leading NUL byte can never
+# start a JSON document, so plain JSON payloads stay readable as they are.
+_FRAME_MAGIC = b"\x00ANZ"
+_FRAME = struct.Struct("<4sBI")  # magic, method code, dictionary id (0 for none)
+_METHOD_CODES = {"zlib": 1, "lzma": 2}
+_METHOD_NAMES = {code: name for name, code in _METHOD_CODES.items()}
+
+# Candidate dictionary content: JSON keys and words
+_DICTIONARY_TOKEN = re.compile(rb'"[^"\\]{1,48}":?|[A-Za-z_][A-Za-z0-9_]{2,31}')
+
+
+class PayloadCodec:
+    """
+    Encoder and decoder for stored item payloads.
+    
+    With compression off, items are written as indented JSON as before.
+    Otherwise items are serialized as compact JSON and compressed, unless they
+    are smaller than ``min_size`` or would not get smaller, in which case the
+    compact JSON is stored as is. Items up to ``dictionary_threshold`` bytes
+    are compressed with zlib and the active shared dictionary when there is
+    one, whatever the configured method, since lzma cannot use one.
+    
+    Every dictionary ever used must stay registered to read items written
+    with it; a payload names its dictionary by the zlib Adler-32 id.
+    """
+    
+    def __init__(
+        self,
+        method: str = "none",
+        level: Optional[int] = None,
+        min_size: int = 256,
+        dictionary_threshold: int = 4096
+    ):
+        """
+        Initialize a PayloadCodec instance.
+        
+        Args:
+            method: Compression method, one of ``none``, ``zlib`` or ``lzma``.
+            level: Compression level, or None for the codec default.
+            min_size: Serialized size in bytes below which items are not compressed.
+            dictionary_threshold: Serialized size in bytes up to which items are
+                compressed with the shared dictionary.
+        """
+        if method not in COMPRESSION_METHODS:
+            raise ValueError(f"Unknown compression method '{method}'. Expected one of {COMPRESSION_METHODS}")
+        
+        self.method = method
+        self.level = level
+        self.min_size = min_size
+        self.dictionary_threshold = dictionary_threshold
+        
+        self.dictionaries: Dict[int, bytes] = {}
+        self.dictionary_id = 0
+        
+        self.bytes_in = 0
+        self.bytes_out = 0
+    
+    def add_dictionary(self, dictionary: bytes, active: bool = True) -> int:
+        """
+        Register a shared dictionary for decoding and optionally use it for encoding.
+        
+        Args:
+            dictionary: The dictionary bytes.
+            active: Whether to compress small items with it from now on.
+            
+        Returns:
+            The dictionary id.
+        """
+        dictionary_id = zlib.adler32(dictionary)
+        self.dictionaries[dictionary_id] = dictionary
+        if active:
+            self.dictionary_id = dictionary_id
+        return dictionary_id
+    
+    def encode(self, item: Dict[str, Any]) -> bytes:
+        """
+        Serialize and, if worthwhile, compress an item.
+        
+        Args:
+            item: The item to encode.
+            
+        Returns:
+            The payload bytes.
+        """
+        if self.method == "none":
+            return json.dumps(item, indent=2).encode("utf-8")
+        
+        raw = json.dumps(item, separators=(",", ":")).encode("utf-8")
+        if len(raw) < self.min_size:
+            return raw
+        
+        dictionary_id = 0
+        if self.dictionary_id and len(raw) <= self.dictionary_threshold:
+            dictionary_id = self.dictionary_id
+            compressor = zlib.compressobj(
+                self.level if self.level is not None else zlib.Z_DEFAULT_COMPRESSION,
+                zdict=self.dictionaries[dictionary_id]
+            )
+            method = "zlib"
+            body = compressor.compress(raw) + compressor.flush()
+        elif self.method == "zlib":
+            method = "zlib"
+            body = zlib.compress(raw, self.level if self.level is not None else zlib.Z_DEFAULT_COMPRESSION)
+        else:
+            method = "lzma"
+            body = lzma.compress(raw, preset=self.level)
+        
+        if _FRAME.size + len(body) >= len(raw):
+            return raw
+        
+        self.bytes_in += len(raw)
+        self.bytes_out += _FRAME.size + len(body)
+        
+        return _FRAME.pack(_FRAME_MAGIC, _METHOD_CODES[method], dictionary_id) + body
+    
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """
+        Decode a payload written by any configuration, including plain JSON.
+        
+        Args:
+            data: The payload bytes.
+            
+        Returns:
+            The decoded item.
+            
+        Raises:
+            ValueError: If the payload needs a dictionary that is not registered.
+        """
+        if not data.startswith(_FRAME_MAGIC):
+            return json.loads(data)
+        
+        _, method_code, dictionary_id = _FRAME.unpack_from(data)
+        body = memoryview(data)[_FRAME.size:]
+        method = _METHOD_NAMES.get(method_code)
+        
+        if method == "zlib" and dictionary_id:
+            dictionary = self.dictionaries.get(dictionary_id)
+            if dictionary is None:
+                raise ValueError(f"Compression dictionary {dictionary_id:08x} is not available")
+            decompressor = zlib.decompressobj(zdict=dictionary)
+            raw = decompressor.decompress(body) + decompressor.flush()
+        elif method == "zlib":
+            raw = zlib.decompress(body)
+        elif method == "lzma":
+            raw = lzma.decompress(body)
+        else:
+            raise ValueError(f"Unknown compression method code {method_code}")
+        
+        return json.loads(raw)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the payloads compressed so far.
+        
+        Returns:
+            A dictionary with the method, dictionary count and compression ratio.
+        """
+        return {
+            "method": self.method,
+            "dictionaries": len(self.dictionaries),
+            "active_dictionary": f"{self.dictionary_id:08x}" if self.dictionary_id else None,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else None
+        }
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = 16384) -> bytes:
+    """
+    Build a shared zlib dictionary from sample payloads.
+    
+    Keys and words that occur in many samples are kept, scored by the number
+    of samples containing them times their length. zlib favours matches
+    close to the data, so the most valuable strings are placed last.
+    
+    Args:
+        samples: Serialized sample items, e.g. compact JSON.
+        size: Maximum dictionary size in bytes.
+        
+    Returns:
+        The dictionary bytes, empty if the samples share nothing.
+    """
+    document_counts: Counter = Counter()
+    sample_count = 0
+    
+    for sample in samples:
+        document_counts.update(set(_DICTIONARY_TOKEN.findall(sample)))
+        sample_count += 1
+    
+    # Strings seen in a single sample do not help other items
+    threshold = 2 if sample_count > 1 else 1
+    scored = sorted(
+        (count * len(token), token)
+        for token, count in document_counts.items()
+        if count >= threshold
+    )
+    
+    chosen = []
+    total = 0
+    for _, token in reversed(scored):
+        if total + len(token) > size:
+            continue
+        chosen.append(token)
+        total += len(token)
+    
+    return b"".join(reversed(chosen))
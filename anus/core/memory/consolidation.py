@@ -0,0 +1,387 @@
+"""
+Consolidation module for the ANUS framework.
+
+Keeps long-term memory small over months of use by replacing old episodes
+with model-written summaries. Items are grouped by a task or session field,
+and each group of old items becomes one summary item that links back to the
+items it replaced.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Sequence, Tuple
+import logging
+import threading
+import time
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.retriever import format_item
+from anus.models.base.base_model import is_error_response
+
+SUMMARY_TYPE = "memory_summary"
+
+DEFAULT_SYSTEM_MESSAGE = (
+    "You condense an agent's memory. Summarize the episodes you are given into "
+    "a short, self-contained note that keeps the goals, decisions, results and "
+    "facts worth remembering, and drops step-by-step detail."
+)
+
+class MemoryConsolidator:
+    """
+    Background job that summarizes old memory items group by group.
+    
+    A run streams the memory once with ``iter_search`` and groups items older
+    than ``min_age`` by the first ``group_by`` field they have; items with
+    none of the fields are left alone. Every group with at least
+    ``min_group_size`` episodes, or with any old episodes and a summary
+    already, is summarized with one ``generate`` call, the summary is added
+    as a new item, and the episodes are deleted, or moved to ``archive``
+    first if one is given.
+    
+    Summaries carry ``source_ids`` backlinks, the group field and value, and
+    the time range they cover. An existing summary of a group is folded into
+    the next summary of that group together with its backlinks, so each group
+    keeps a single summary. At most ``max_group_size`` episodes are summarized
+    per group and run; the rest are picked up by later runs.
+    
+    Model calls are rate limited to ``calls_per_minute`` and a run stops after
+    ``max_groups_per_run`` groups, so a large backlog is worked off gradually.
+    """
+    
+    def __init__(
+        self,
+        memory: BaseMemory,
+        model: Any,
+        group_by: Sequence[str] = ("task_id", "session_id"),
+        min_age: float = 7 * 24 * 3600,
+        min_group_size: int = 5,
+        max_group_size: int = 50,
+        max_groups_per_run: int = 10,
+        calls_per_minute: float = 10.0,
+        interval: float = 3600.0,
+        max_prompt_tokens: int = 6000,
+        summary_max_tokens: Optional[int] = 512,
+        archive: Optional[BaseMemory] = None,
+        formatter: Optional[Callable[[Dict[str, Any]], str]] = None,
+        system_message: str = DEFAULT_SYSTEM_MESSAGE
+    ):
+        """
+        Initialize a MemoryConsolidator instance.
+        
+        Args:
+            memory: The memory system to consolidate, usually long-term memory.
+            model: The BaseModel that writes the summaries.
+            group_by: Item fields that identify a task or session, in order of preference.
+            min_age: Age in seconds an item must reach before it is consolidated.
+            min_group_size: Minimum number of old episodes in a group before it is summarized.
+            max_group_size: Maximum number of episodes summarized per group and run.
+            max_groups_per_run: Maximum number of groups summarized per run.
+            calls_per_minute: Maximum rate of model calls.
+            interval: Seconds between runs of the background thread.
+            max_prompt_tokens: Token budget of the episodes in one prompt; the
+                oldest episodes that fit are summarized first.
+            summary_max_tokens: Maximum tokens of a generated summary, or None
+                for the model default.
+            archive: Optional memory system that replaced episodes are moved to,
+                keeping their identifiers so backlinks can be followed.
+            formatter: Function rendering an item as prompt text. Defaults to its
+                ``content`` field, or its JSON without ``_meta``.
+            system_message: The system message of the summarization prompt.
+        """
+        if min_group_size < 1 or max_group_size < min_group_size:
+            raise ValueError("Expected 1 <= min_group_size <= max_group_size")
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+        
+        self.memory = memory
+        self.model = model
+        self.group_by = tuple(group_by)
+        self.min_age = min_age
+        self.min_group_size = min_group_size
+        self.max_group_size = max_group_size
+        self.max_groups_per_run = max_groups_per_run
+        self.min_call_interval = 60.0 / calls_per_minute
+        self.interval = interval
+        self.max_prompt_tokens = max_prompt_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.archive = archive
+        self.formatter = formatter or format_item
+        self.system_message = system_message
+        
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_call = 0.0
+        
+        self.runs = 0
+        self.groups_consolidated = 0
+        self.items_consolidated = 0
+        self.model_calls = 0
+        self.failures = 0
+        self.last_run_at: Optional[float] = None
+        self.last_run_seconds: Optional[float] = None
+    
+    def start(self) -> None:
+        """
+        Start consolidating in a background thread every ``interval`` seconds.
+        """
+        if self._thread is not None:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """
+        Stop the background thread, interrupting any rate-limit wait.
+        
+        A group being summarized when this is called is finished first.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def run_once(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run one consolidation pass.
+        
+        Args:
+            now: The current time, for tests; defaults to ``time.time()``.
+            
+        Returns:
+            A dictionary with the number of ``groups`` summarized, ``items``
+            replaced, and ``failures``.
+        """
+        with self._run_lock:
+            start = time.perf_counter()
+            now = time.time() if now is None else now
+            groups, summaries = self._collect(now - self.min_age)
+            
+            result = {"groups": 0, "items": 0, "failures": 0}
+            for key, episodes in groups:
+                if result["groups"] >= self.max_groups_per_run or self._stop_event.is_set():
+                    break
+                
+                try:
+                    replaced = self._consolidate_group(key, episodes, summaries.get(key))
+                except Exception as e:
+                    logging.error(f"Error consolidating memory group {key[0]}={key[1]!r}: {e}")
+                    result["failures"] += 1
+                    continue
+                
+                if replaced:
+                    result["groups"] += 1
+                    result["items"] += replaced
+            
+            self.runs += 1
+            self.groups_consolidated += result["groups"]
+            self.items_consolidated += result["items"]
+            self.failures += result["failures"]
+            self.last_run_at = now
+            self.last_run_seconds = time.perf_counter() - start
+        
+        if result["groups"]:
+            logging.info(f"Consolidated {result['items']} memory items into {result['groups']} summaries")
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about consolidation so far.
+        
+        Returns:
+            A dictionary with run, group, item, model call and failure counts.
+        """
+        return {
+            "running": self._thread is not None,
+            "runs": self.runs,
+            "groups_consolidated": self.groups_consolidated,
+            "items_consolidated": self.items_consolidated,
+            "model_calls": self.model_calls,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": self.last_run_seconds
+        }
+    
+    def _run_loop(self) -> None:
+        """
+        Run consolidation passes until stopped.
+        """
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Error running memory consolidation: {e}")
+    
+    def _collect(
+        self,
+        cutoff: float
+    ) -> Tuple[List[Tuple[Tuple[str, Any], List[Tuple[str, float]]]], Dict[Tuple[str, Any], Dict[str, Any]]]:
+        """
+        Stream the memory and group the identifiers of old episodes.
+        
+        Only identifiers and creation times are kept, so memory use grows with
+        the number of old episodes rather than their size.
+        
+        Args:
+            cutoff: Creation time before which episodes are consolidated.
+            
+        Returns:
+            The eligible groups as ``(key, [(id, created_at), ...])``, largest
+            first, with episodes oldest first, and the existing summaries by key.
+        """
+        groups: Dict[Tuple[str, Any], List[Tuple[str, float]]] = {}
+        summaries: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        
+        for result in self.memory.iter_search({}):
+            item = result["item"]
+            key = self._group_key(item)
+            if key is None:
+                continue
+            
+            if item.get("type") == SUMMARY_TYPE:
+                summaries[key] = result
+            elif result["created_at"] < cutoff:
+                groups.setdefault(key, []).append((result["id"], result["created_at"]))
+        
+        eligible = [
+            (key, sorted(episodes, key=lambda episode: episode[1]))
+            for key, episodes in groups.items()
+            if len(episodes) >= self.min_group_size or key in summaries
+        ]
+        eligible.sort(key=lambda group: len(group[1]), reverse=True)
+        
+        return eligible, summaries
+    
+    def _group_key(self, item: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+        """
+        Find the group an item belongs to.
+        
+        Args:
+            item: The memory item.
+            
+        Returns:
+            The first ``group_by`` field the item has and its value, or None.
+        """
+        for field in self.group_by:
+            value = item.get(field)
+            if value is not None and isinstance(value, (str, int, float, bool)):
+                return field, value
+        return None
+    
+    def _consolidate_group(
+        self,
+        key: Tuple[str, Any],
+        episodes: List[Tuple[str, float]],
+        previous: Optional[Dict[str, Any]]
+    ) -> int:
+        """
+        Summarize one group and replace its episodes with the summary.
+        
+        The summary is stored before anything is deleted, so a failure never
+        loses information; at worst a later run summarizes an episode twice.
+        
+        Args:
+            key: The group field and value.
+            episodes: Identifiers and creation times of the group's old episodes, oldest first.
+            previous: The group's existing summary as an ``iter_search`` result, if any.
+            
+        Returns:
+            The number of episodes replaced.
+        """
+        created_at = dict(episodes[:self.max_group_size])
+        identifiers = list(created_at)
+        items = [
+            (identifier, item)
+            for identifier, item in zip(identifiers, self.memory.get_many(identifiers))
+            if item is not None
+        ]
+        
+        previous_text = self.formatter(previous["item"]) if previous else None
+        budget = self.max_prompt_tokens - (self.model.get_token_count(previous_text) if previous_text else 0)
+        
+        texts = []
+        included = []
+        for identifier, item in items:
+            text = self.formatter(item)
+            cost = self.model.get_token_count(text)
+            if included and cost > budget:
+                break
+            texts.append(text)
+            included.append((identifier, item))
+            budget -= cost
+        
+        if not included:
+            return 0
+        
+        summary_text = self._summarize(key, texts, previous_text)
+        if summary_text is None:
+            return 0
+        
+        source_ids = [identifier for identifier, _ in included]
+        created = [created_at[identifier] for identifier in source_ids]
+        summary = {
+            "type": SUMMARY_TYPE,
+            key[0]: key[1],
+            "content": summary_text,
+            "group": {"field": key[0], "value": key[1]},
+            "source_ids": source_ids,
+            "source_count": len(source_ids),
+            "time_range": [min(created), max(created)],
+            "summarized_at": time.time()
+        }
+        
+        if previous:
+            earlier = previous["item"]
+            summary["source_ids"] = earlier.get("source_ids", []) + source_ids
+            summary["source_count"] = earlier.get("source_count", 0) + len(source_ids)
+            summary["time_range"][0] = min(earlier.get("time_range", summary["time_range"])[0], min(created))
+            summary["previous_summary_id"] = previous["id"]
+        
+        self.memory.add(summary)
+        
+        if self.archive is not None:
+            for identifier, item in included:
+                self.archive.put(identifier, item)
+        
+        self.memory.delete_many(source_ids + ([previous["id"]] if previous else []))
+        
+        return len(included)
+    
+    def _summarize(self, key: Tuple[str, Any], texts: List[str], previous_text: Optional[str]) -> Optional[str]:
+        """
+        Ask the model for a summary, waiting for the rate limit first.
+        
+        Args:
+            key: The group field and value.
+            texts: The episodes as prompt text, oldest first.
+            previous_text: The group's existing summary, if any.
+            
+        Returns:
+            The summary text, or None if consolidation was stopped while waiting.
+            
+        Raises:
+            ValueError: If the model reports an error or returns an empty summary.
+        """
+        delay = self._last_call + self.min_call_interval - time.monotonic()
+        if delay > 0 and self._stop_event.wait(delay):
+            return None
+        
+        parts = [f"Memory episodes for {key[0]} {key[1]}, oldest first."]
+        if previous_text:
+            parts.append(f"Summary of earlier episodes:\n{previous_text}")
+        parts.extend(f"Episode {number}:\n{text}" for number, text in enumerate(texts, start=1))
+        parts.append("Write one summary covering all of the above.")
+        
+        self._last_call = time.monotonic()
+        self.model_calls += 1
+        summary = self.model.generate(
+            "\n\n".join(parts),
+            system_message=self.system_message,
+            max_tokens=self.summary_max_tokens
+        )
+        
+        # Models report failures as text; storing that would lose the episodes
+        if is_error_response(summary):
+            raise ValueError(f"Model returned no usable summary: {str(summary)[:200]!r}")
+        
+        return summary.strip()
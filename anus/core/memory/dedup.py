@@ -0,0 +1,51 @@
+"""
+Deduplication module for the ANUS framework.
+
+Provides content hashing and content-derived identifiers for memory systems
+that store identical payloads only once.
+"""
+
+from typing import Dict, Any, Iterator
+import hashlib
+import itertools
+import json
+import uuid
+
+# Namespace for identifiers derived from content hashes
+CONTENT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "anus:memory:content")
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """
+    Hash the payload of an item, ignoring its ``_meta`` field.
+    
+    Keys are sorted so that equal dicts hash equally regardless of insertion
+    order. Values JSON cannot represent are hashed by their ``repr``.
+    
+    Args:
+        item: The item to hash.
+        
+    Returns:
+        The hex SHA-256 digest of the payload.
+    """
+    payload = {key: value for key, value in item.items() if key != "_meta"}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def content_identifiers(digest: str) -> Iterator[str]:
+    """
+    Generate the candidate identifiers for a content hash, in probe order.
+    
+    The first candidate is normally the one in use. Later candidates are only
+    needed when an earlier one is held by an item whose content was updated
+    after it was added.
+    
+    Args:
+        digest: The content hash.
+        
+    Yields:
+        Deterministic UUID strings.
+    """
+    for attempt in itertools.count():
+        yield str(uuid.uuid5(CONTENT_NAMESPACE, f"{digest}/{attempt}"))
@@ -0,0 +1,217 @@
+"""
+Field index module for the ANUS framework.
+
+Provides hash-based secondary indexes over memory item fields.
+"""
+
+from typing import Dict, List, Any, Optional, Set, Hashable, Iterable, Tuple
+
+# Sentinel returned when a path does not exist in an item
+_MISSING = object()
+
+
+def resolve_path(item: Any, parts: List[str]) -> Any:
+    """
+    Resolve a pre-split dotted path against an item.
+    
+    Args:
+        item: The item to resolve the path in.
+        parts: The path components, e.g. ``["result", "status"]``.
+        
+    Returns:
+        The value at the path, or the ``_MISSING`` sentinel if it does not exist.
+    """
+    curr = item
+    for part in parts:
+        if isinstance(curr, dict) and part in curr:
+            curr = curr[part]
+        else:
+            return _MISSING
+    return curr
+
+
+class FieldIndex:
+    """
+    Hash indexes over a declared set of top-level or dotted fields.
+    
+    Each indexed field maps a value to the set of identifiers (its posting set)
+    whose items hold that value. Values that are not hashable (lists, dicts)
+    are not indexed, which is safe because they can never equal a hashable
+    query value.
+    
+    Items are indexed by value at the time they are added, so callers that
+    mutate a stored item in place must go through ``update`` to keep the
+    index consistent.
+    """
+    
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        """
+        Initialize a FieldIndex instance.
+        
+        Args:
+            fields: The field paths to index. Dotted paths address nested values.
+        """
+        self.fields: Dict[str, List[str]] = {}
+        self.postings: Dict[str, Dict[Hashable, Set[str]]] = {}
+        
+        for field in fields or []:
+            self.add_field(field)
+    
+    def add_field(self, field: str) -> None:
+        """
+        Declare a new indexed field.
+        
+        Existing items are not indexed retroactively; use ``rebuild`` for that.
+        
+        Args:
+            field: The field path to index.
+        """
+        if field in self.fields:
+            return
+        
+        self.fields[field] = field.split(".")
+        self.postings[field] = {}
+    
+    def add(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Index an item under all declared fields.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to index.
+        """
+        for field, parts in self.fields.items():
+            value = resolve_path(item, parts)
+            if value is _MISSING or not _is_hashable(value):
+                continue
+            
+            self.postings[field].setdefault(value, set()).add(identifier)
+    
+    def remove(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Remove an item from all declared fields.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item as it was when indexed.
+        """
+        for field, parts in self.fields.items():
+            value = resolve_path(item, parts)
+            if value is _MISSING or not _is_hashable(value):
+                continue
+            
+            posting = self.postings[field].get(value)
+            if posting is None:
+                continue
+            
+            posting.discard(identifier)
+            if not posting:
+                del self.postings[field][value]
+    
+    def lookup(self, field: str, value: Any) -> Optional[Set[str]]:
+        """
+        Get the posting set for a field value.
+        
+        Args:
+            field: The indexed field path.
+            value: The value to look up.
+            
+        Returns:
+            The set of matching identifiers, or None if the index cannot answer
+            the lookup (field not indexed or value not hashable).
+        """
+        if field not in self.postings or not _is_hashable(value):
+            return None
+        
+        return self.postings[field].get(value, set())
+    
+    def plan(self, conditions: Iterable[Any]) -> Tuple[Optional[Set[str]], List[Any]]:
+        """
+        Answer the ``$eq`` and ``$in`` conditions of a compiled query from the index.
+        
+        Args:
+            conditions: The conditions of a compiled query.
+            
+        Returns:
+            A tuple of (candidate identifiers, or None if no condition could be
+            answered; the conditions the candidates already satisfy).
+        """
+        postings = []
+        answered = []
+        
+        for condition in conditions:
+            if condition.operator == "$eq":
+                posting = self.lookup(condition.key, condition.operand)
+            elif condition.operator == "$in" and condition.key in self.postings:
+                if not all(_is_hashable(value) for value in condition.operand):
+                    continue
+                field_postings = self.postings[condition.key]
+                posting = set().union(*(field_postings.get(value, ()) for value in condition.operand))
+            else:
+                continue
+            
+            if posting is not None:
+                postings.append(posting)
+                answered.append(condition)
+        
+        if not postings:
+            return None, []
+        
+        return _intersect(postings), answered
+    
+    def rebuild(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Rebuild all postings from scratch.
+        
+        Args:
+            items: Mapping of identifier to item.
+        """
+        for field in self.postings:
+            self.postings[field] = {}
+        
+        for identifier, item in items.items():
+            self.add(identifier, item)
+    
+    def clear(self) -> None:
+        """
+        Remove all postings while keeping the declared fields.
+        """
+        for field in self.postings:
+            self.postings[field] = {}
+
+
+def _intersect(postings: List[Set[str]]) -> Set[str]:
+    """
+    Intersect posting sets, smallest first to keep the working set small.
+    
+    Args:
+        postings: The posting sets to intersect. Must not be empty.
+        
+    Returns:
+        A new set with the identifiers present in every posting set.
+    """
+    postings = sorted(postings, key=len)
+    result = set(postings[0])
+    for posting in postings[1:]:
+        if not result:
+            break
+        result &= posting
+    
+    return result
+
+
+def _is_hashable(value: Any) -> bool:
+    """
+    Check whether a value can be used as a dictionary key.
+    
+    Args:
+        value: The value to check.
+        
+    Returns:
+        True if the value is hashable, False otherwise.
+    """
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
@@ -2,27 +2,91 @@
 Long-term memory module for the ANUS framework.
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator
+import bisect
 import uuid
 import time
 import json
 import os
 import logging
+import threading
 from pathlib import Path
 
 from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.compression import PayloadCodec, train_dictionary
+from anus.core.memory.dedup import content_hash, content_identifiers
+from anus.core.memory.metrics import MemoryMetrics
+from anus.core.memory.query import compile_query
+from anus.core.memory.text_index import TextIndex
+from anus.core.memory.vector_index import VectorIndex
+from anus.core.memory.cache import LRUCache, BloomFilter
 
 class LongTermMemory(BaseMemory):
     """
     Persistent implementation of the BaseMemory interface.
     
     Provides a file-based persistent memory store.
+    
+    When the index is kept in memory, a snapshot of it is persisted as a single
+    JSON-lines file so that startup costs one read plus a directory scan, and
+    only item files whose modification time or size changed since the snapshot
+    are parsed again.
+    
+    In write-behind mode, writes are queued, repeated writes to the same item
+    are coalesced, and a background thread flushes them in batches. Every file
+    is written to a temporary path and atomically renamed into place.
+    
+    Without an in-memory index, an optional bounded LRU read cache and a Bloom
+    filter over known identifiers reduce how often reads have to hit the disk.
+    
+    With text search, an inverted index over the configured text fields is
+    kept in memory and its postings are persisted next to the item files, so
+    only files that changed since the postings were saved are tokenized again.
+    
+    With deduplication, identical payloads are stored in one file under an
+    identifier derived from their content, with a reference count in ``_meta``.
+    
+    With compression, item files hold zlib or lzma compressed compact JSON,
+    and small items can share a trained zlib dictionary stored next to them.
+    Compressed files keep the ``.json`` extension but hold binary frames
+    starting with a NUL byte and ``ANZ``, so other tools cannot read them as
+    JSON. Plain JSON files are always readable, so compression can be
+    switched on for an existing store.
     """
     
+    INDEX_SNAPSHOT_FILE = "_index.snapshot"
+    INDEX_SNAPSHOT_VERSION = 1
+    TEXT_INDEX_FILE = "_text.index.npz"
+    DICTIONARY_PREFIX = "_compression-"
+    DICTIONARY_SUFFIX = ".zdict"
+    DICTIONARY_MIN_SAMPLES = 100
+    DURABILITY_LEVELS = ("none", "batch", "every-write")
+    
     def __init__(
         self, 
         storage_path: Optional[str] = None,
         index_in_memory: bool = True,
+        vector_search: bool = False,
+        embedding_model: Optional[Any] = None,
+        embedding_field: str = "embedding",
+        embedding_text_field: str = "content",
+        index_snapshot: bool = True,
+        lazy_index: bool = False,
+        write_behind: bool = False,
+        durability: str = "none",
+        flush_interval: float = 1.0,
+        flush_batch_size: int = 256,
+        read_cache_size: int = 0,
+        bloom_filter: bool = False,
+        bloom_capacity: int = 100000,
+        deduplicate: bool = False,
+        text_search: bool = False,
+        text_fields: Optional[List[str]] = None,
+        tokenizer: Optional[Any] = None,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_min_size: int = 256,
+        compression_dictionary: bool = False,
         **kwargs
     ):
         """
@@ -31,6 +95,41 @@ class LongTermMemory(BaseMemory):
         Args:
             storage_path: Path to store memory files. If None, uses a default location.
             index_in_memory: Whether to keep an in-memory index for faster searches.
+            vector_search: Whether to maintain a vector index for search_similar.
+                Embeddings computed by the embedding model are persisted in ``_meta``.
+            embedding_model: Optional BaseModel used to embed item text and text queries.
+            embedding_field: Item key holding a precomputed embedding vector.
+            embedding_text_field: Item key holding the text to embed when no vector is present.
+            index_snapshot: Whether to persist and reuse an index snapshot for fast startup.
+            lazy_index: Whether to build the in-memory index in a background thread.
+                Reads are served from disk until the index is ready. Ignored when
+                vector_search or text_search is enabled.
+            write_behind: Whether to queue writes and flush them from a background thread.
+            durability: When to fsync: ``none`` never, ``batch`` once per flushed batch,
+                ``every-write`` after every file.
+            flush_interval: Seconds between background flushes in write-behind mode.
+            flush_batch_size: Number of queued writes that triggers an early flush.
+            read_cache_size: Maximum number of items in the read cache used when
+                index_in_memory is off. 0 disables the cache.
+            bloom_filter: Whether to skip disk lookups for unknown identifiers using
+                a Bloom filter. Only used when index_in_memory is off.
+            bloom_capacity: Expected number of identifiers the Bloom filter is sized for.
+            deduplicate: Whether to store identical payloads once. Adding a duplicate
+                returns the existing identifier, and the file is kept until every
+                reference is deleted.
+            text_search: Whether to maintain an inverted index for search_text.
+            text_fields: Top-level or dotted fields to index for text search.
+                Defaults to ``content``.
+            tokenizer: Optional function splitting text into terms for text search.
+            compression: How to compress item files: ``none``, ``zlib`` or ``lzma``.
+                Compressed items are still stored as ``<id>.json`` files, which
+                then hold binary frames rather than JSON text.
+            compression_level: Compression level, or None for the codec default.
+            compression_min_size: Serialized size in bytes below which items are
+                stored uncompressed.
+            compression_dictionary: Whether to compress small items with a shared
+                zlib dictionary. One is trained from stored items at startup once
+                there are enough of them, or on ``train_compression_dictionary``.
             **kwargs: Additional configuration options.
         """
         super().__init__(**kwargs)
@@ -42,16 +141,85 @@ class LongTermMemory(BaseMemory):
         
         self.storage_path = storage_path
         self.index_in_memory = index_in_memory
+        self.index_snapshot = index_snapshot
+        self.deduplicate = deduplicate
+        self.snapshot_generation = 0
+        
+        if durability not in self.DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level '{durability}'. Expected one of {self.DURABILITY_LEVELS}")
+        
+        self.write_behind = write_behind
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
         
         # Create storage directory if it doesn't exist
         os.makedirs(self.storage_path, exist_ok=True)
         
+        self.metrics = MemoryMetrics()
+        
+        # Every stored dictionary is loaded so older items stay readable
+        self.codec = PayloadCodec(
+            method=compression,
+            level=compression_level,
+            min_size=compression_min_size
+        )
+        self.compression_dictionary = compression_dictionary and compression != "none"
+        self._load_dictionaries()
+        
         # Create indexes
         self.index: Dict[str, Dict[str, Any]] = {}
+        self.vector_index: Optional[VectorIndex] = None
+        
+        if vector_search:
+            self.vector_index = VectorIndex(
+                embedding_model=embedding_model,
+                embedding_field=embedding_field,
+                text_field=embedding_text_field
+            )
+        
+        self.text_index: Optional[TextIndex] = None
+        if text_search:
+            self.text_index = TextIndex(text_fields=text_fields or ["content"], tokenizer=tokenizer)
+        
+        # Guards the index while it is being built in the background
+        self._index_lock = threading.RLock()
+        self._index_ready = threading.Event()
+        self._dirty_ids: set = set()
+        
+        # Read path helpers for when the whole index is not kept in memory
+        self.read_cache: Optional[LRUCache] = None
+        self.bloom: Optional[BloomFilter] = None
+        self.bloom_negatives = 0
+        
+        if not self.index_in_memory:
+            if read_cache_size > 0:
+                self.read_cache = LRUCache(read_cache_size)
+            if bloom_filter:
+                self._build_bloom_filter(bloom_capacity)
+        
+        # Queued writes for write-behind mode; None marks a pending delete
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        
+        if self.write_behind:
+            self._writer = threading.Thread(target=self._flush_loop, daemon=True)
+            self._writer.start()
         
         # Load index from disk if using in-memory indexing
-        if self.index_in_memory:
+        if lazy_index and self.index_in_memory and self.vector_index is None and self.text_index is None:
+            threading.Thread(target=self._load_index, daemon=True).start()
+        elif self.index_in_memory or self.vector_index is not None or self.text_index is not None:
             self._load_index()
+        else:
+            self._index_ready.set()
+        
+        if self.compression_dictionary and not self.codec.dictionary_id:
+            self.train_compression_dictionary(min_samples=self.DICTIONARY_MIN_SAMPLES)
     
     def add(self, item: Dict[str, Any]) -> str:
         """
@@ -63,6 +231,13 @@ class LongTermMemory(BaseMemory):
         Returns:
             A string identifier for the added item.
         """
+        start = time.perf_counter()
+        
+        if self.deduplicate:
+            identifier = self._add_deduplicated(item)
+            self.metrics.observe("add", start)
+            return identifier
+        
         # Generate a unique identifier
         identifier = str(uuid.uuid4())
         
@@ -73,20 +248,134 @@ class LongTermMemory(BaseMemory):
             "created_at": time.time(),
             "updated_at": time.time()
         }
+        self._index_vector(identifier, item_with_metadata)
         
-        # Save the item to disk
-        self._save_item(identifier, item_with_metadata)
-        
-        # Update the index
-        if self.index_in_memory:
-            self.index[identifier] = item_with_metadata
+        # Save the item to disk and update the index together, so a concurrent
+        # index snapshot never pairs a new file with a stale item
+        with self._index_lock:
+            self._save_item(identifier, item_with_metadata)
+            self._index_put(identifier, item_with_metadata)
         
+        self.metrics.observe("add", start)
         return identifier
     
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several items with one batched write and index update.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        start = time.perf_counter()
+        
+        if self.deduplicate:
+            identifiers = [self._add_deduplicated(item) for item in items]
+            self.metrics.observe("add", start)
+            return identifiers
+        
+        now = time.time()
+        batch: Dict[str, Dict[str, Any]] = {}
+        
+        for item in items:
+            identifier = str(uuid.uuid4())
+            item_with_metadata = item.copy()
+            item_with_metadata["_meta"] = {
+                "id": identifier,
+                "created_at": now,
+                "updated_at": now
+            }
+            self._index_vector(identifier, item_with_metadata)
+            batch[identifier] = item_with_metadata
+        
+        with self._index_lock:
+            self._save_items(batch)
+            for identifier, item_with_metadata in batch.items():
+                self._index_put(identifier, item_with_metadata)
+        
+        self.metrics.observe("add", start)
+        return list(batch)
+    
+    def _add_deduplicated(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item, or take another reference to a stored item with the same payload.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            The identifier of the stored copy.
+        """
+        digest = content_hash(item)
+        
+        with self._index_lock:
+            for identifier in content_identifiers(digest):
+                existing = self._get(identifier)
+                
+                if existing is None:
+                    now = time.time()
+                    item_with_metadata = item.copy()
+                    item_with_metadata["_meta"] = {
+                        "id": identifier,
+                        "created_at": now,
+                        "updated_at": now,
+                        "content_hash": digest,
+                        "ref_count": 1
+                    }
+                    self._index_vector(identifier, item_with_metadata)
+                elif existing.get("_meta", {}).get("content_hash") == digest:
+                    item_with_metadata = self._with_ref_count(existing, 1)
+                else:
+                    # Taken by an item whose content was updated; probe the next one
+                    continue
+                
+                self._save_item(identifier, item_with_metadata)
+                self._index_put(identifier, item_with_metadata)
+                return identifier
+    
+    def _with_ref_count(self, item: Dict[str, Any], delta: int) -> Dict[str, Any]:
+        """
+        Copy an item with its reference count adjusted.
+        
+        Args:
+            item: The stored item.
+            delta: The change to the reference count.
+            
+        Returns:
+            The updated copy.
+        """
+        updated = item.copy()
+        updated["_meta"] = dict(item.get("_meta", {}))
+        updated["_meta"]["ref_count"] = updated["_meta"].get("ref_count", 1) + delta
+        return updated
+    
     def get(self, identifier: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve an item from memory by its identifier.
         
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        start = time.perf_counter()
+        item = self._get(identifier)
+        
+        if item is None:
+            self.metrics.record_lookup(0, 1)
+        else:
+            self.metrics.record_lookup(1)
+        self.metrics.observe("get", start)
+        
+        return item
+    
+    def _get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an item without counting it in the metrics.
+        
         Args:
             identifier: The identifier of the item to retrieve.
             
@@ -94,20 +383,26 @@ class LongTermMemory(BaseMemory):
             The retrieved item, or None if not found.
         """
         # Check in-memory index first if available
-        if self.index_in_memory and identifier in self.index:
+        if self.index_in_memory and self._index_ready.is_set() and identifier in self.index:
             return self.index[identifier]
         
-        # Otherwise, load from disk
-        item_path = self._get_item_path(identifier)
-        if not os.path.exists(item_path):
+        # Identifiers the Bloom filter has never seen cannot be on disk
+        if self.bloom is not None and identifier not in self.bloom:
+            self.bloom_negatives += 1
             return None
         
-        try:
-            with open(item_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading item {identifier}: {e}")
-            return None
+        if self.read_cache is not None:
+            item = self.read_cache.get(identifier)
+            if item is not None:
+                return item
+        
+        # Otherwise, load from disk
+        item = self._read_item_file(identifier)
+        
+        if item is not None and self.read_cache is not None:
+            self.read_cache.put(identifier, item)
+        
+        return item
     
     def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -120,11 +415,17 @@ class LongTermMemory(BaseMemory):
         Returns:
             A list of matching items.
         """
+        start = time.perf_counter()
+        query = compile_query(query)
+        
         results = []
         
         # If using in-memory index, search there
-        if self.index_in_memory:
-            for identifier, item in self.index.items():
+        if self.index_in_memory and self._index_ready.is_set():
+            with self._index_lock:
+                entries = list(self.index.items())
+            
+            for identifier, item in entries:
                 if self._matches_query(item, query):
                     results.append({
                         "id": identifier,
@@ -136,12 +437,13 @@ class LongTermMemory(BaseMemory):
                         break
         else:
             # Otherwise, scan the storage directory
+            self.flush()
             for item_file in os.listdir(self.storage_path):
                 if not item_file.endswith(".json"):
                     continue
                 
                 identifier = item_file[:-5]  # Remove .json extension
-                item = self.get(identifier)
+                item = self._get(identifier)
                 
                 if item and self._matches_query(item, query):
                     results.append({
@@ -156,8 +458,198 @@ class LongTermMemory(BaseMemory):
         # Sort by creation time (newest first)
         results.sort(key=lambda x: x["created_at"], reverse=True)
         
+        self.metrics.observe("search", start)
+        return results
+    
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream all items matching the query in identifier order.
+        
+        Identifiers are captured when iteration starts, from the index if it is
+        ready or from a directory listing otherwise. Item files are only parsed
+        one batch at a time, and items deleted since the stream started are
+        skipped.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of items to load per batch.
+            after: Cursor (identifier) of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        query = compile_query(query)
+        
+        use_index = self.index_in_memory and self._index_ready.is_set()
+        
+        if use_index:
+            with self._index_lock:
+                identifiers = sorted(self.index)
+        else:
+            self.flush()
+            identifiers = sorted(
+                name[:-5] for name in os.listdir(self.storage_path) if name.endswith(".json")
+            )
+        
+        start = bisect.bisect_right(identifiers, after) if after is not None else 0
+        
+        for offset in range(start, len(identifiers), batch_size):
+            batch = identifiers[offset:offset + batch_size]
+            
+            if use_index:
+                with self._index_lock:
+                    items = [self.index.get(identifier) for identifier in batch]
+            else:
+                items = [self._get(identifier) for identifier in batch]
+            
+            for identifier, item in zip(batch, items):
+                if item and self._matches_query(item, query):
+                    yield {
+                        "id": identifier,
+                        "item": item,
+                        "created_at": item.get("_meta", {}).get("created_at", 0),
+                        "cursor": identifier
+                    }
+    
+    def search_similar(self, query: Union[str, List[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items most similar to a query embedding.
+        
+        Args:
+            query: A query vector, or text to embed with the configured embedding model.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with similarity scores, most similar first.
+        """
+        if self.vector_index is None:
+            raise NotImplementedError("Long-term memory was created without vector_search")
+        
+        start = time.perf_counter()
+        results = []
+        for identifier, score in self.vector_index.query(query, k):
+            item = self._get(identifier)
+            if item is None:
+                continue
+            
+            results.append({
+                "id": identifier,
+                "item": item,
+                "created_at": item.get("_meta", {}).get("created_at", 0),
+                "score": score
+            })
+        
+        self.metrics.observe("search", start)
         return results
     
+    def search_text(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items that best match a keyword query, ranked by BM25.
+        
+        Args:
+            query: The keyword query.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with relevance scores, best match first.
+        """
+        if self.text_index is None:
+            raise NotImplementedError("Long-term memory was created without text_search")
+        
+        start = time.perf_counter()
+        
+        with self._index_lock:
+            ranked = self.text_index.search(query, k)
+        
+        results = []
+        for identifier, score in ranked:
+            item = self._get(identifier)
+            if item is None:
+                continue
+            
+            results.append({
+                "id": identifier,
+                "item": item,
+                "created_at": item.get("_meta", {}).get("created_at", 0),
+                "score": score
+            })
+        
+        self.metrics.observe("search", start)
+        return results
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        Metadata carried by the item, such as an item moved here from another
+        memory system, is kept apart from its identifier and update time.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+        """
+        item_with_metadata = self._with_put_metadata(identifier, item, time.time())
+        self._index_vector(identifier, item_with_metadata)
+        
+        with self._index_lock:
+            self._save_item(identifier, item_with_metadata)
+            self._index_put(identifier, item_with_metadata)
+    
+    def _with_put_metadata(self, identifier: str, item: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """
+        Copy an item with metadata for storing under a given identifier.
+        
+        Args:
+            identifier: The identifier the item is stored under.
+            item: The item, possibly carrying metadata from another memory system.
+            now: The current time.
+            
+        Returns:
+            The copy with ``_meta`` holding the identifier and update time.
+        """
+        item_with_metadata = item.copy()
+        item_with_metadata["_meta"] = dict(item.get("_meta") or {"created_at": now})
+        item_with_metadata["_meta"]["id"] = identifier
+        item_with_metadata["_meta"]["updated_at"] = now
+        return item_with_metadata
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Write a chunk of imported records as one batch.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        now = time.time()
+        batch: Dict[str, Dict[str, Any]] = {}
+        
+        for record in records:
+            item_with_metadata = self._with_put_metadata(record["id"], record["item"], now)
+            self._index_vector(record["id"], item_with_metadata)
+            batch[record["id"]] = item_with_metadata
+        
+        with self._index_lock:
+            self._save_items(batch)
+            for identifier, item_with_metadata in batch.items():
+                self._index_put(identifier, item_with_metadata)
+    
+    def _finish_import(self) -> None:
+        """
+        Flush imported items and persist the rebuilt indexes once, so the next
+        startup does not parse the imported files again.
+        """
+        self.flush()
+        
+        if self.index_in_memory and self.index_snapshot and self._index_ready.is_set():
+            self.save_index_snapshot()
+        if self.text_index is not None:
+            self.save_text_index()
+    
     def update(self, identifier: str, item: Dict[str, Any]) -> bool:
         """
         Update an item in memory.
@@ -170,28 +662,32 @@ class LongTermMemory(BaseMemory):
             True if the update was successful, False otherwise.
         """
         # Check if the item exists
-        existing_item = self.get(identifier)
+        existing_item = self._get(identifier)
         if existing_item is None:
             return False
         
         # Preserve metadata
         item_with_metadata = item.copy()
         if "_meta" in existing_item:
-            item_with_metadata["_meta"] = existing_item["_meta"]
+            item_with_metadata["_meta"] = dict(existing_item["_meta"])
             item_with_metadata["_meta"]["updated_at"] = time.time()
+            # The content may have changed, so any cached embedding is stale
+            item_with_metadata["_meta"].pop("embedding", None)
+            if self.deduplicate:
+                # Every reference sees the new content
+                item_with_metadata["_meta"]["content_hash"] = content_hash(item)
         else:
             item_with_metadata["_meta"] = {
                 "id": identifier,
                 "created_at": time.time(),
                 "updated_at": time.time()
             }
+        self._index_vector(identifier, item_with_metadata)
         
-        # Save the updated item
-        self._save_item(identifier, item_with_metadata)
-        
-        # Update the index
-        if self.index_in_memory:
-            self.index[identifier] = item_with_metadata
+        # Save the updated item and update the index
+        with self._index_lock:
+            self._save_item(identifier, item_with_metadata)
+            self._index_put(identifier, item_with_metadata)
         
         return True
     
@@ -205,26 +701,82 @@ class LongTermMemory(BaseMemory):
         Returns:
             True if the deletion was successful, False otherwise.
         """
-        item_path = self._get_item_path(identifier)
-        if not os.path.exists(item_path):
-            return False
-        
-        try:
-            os.remove(item_path)
+        # Hold the index lock throughout so a concurrent deduplicated add cannot
+        # take a new reference between the ref count check and the removal
+        with self._index_lock:
+            if self.deduplicate:
+                existing = self._get(identifier)
+                if existing is None:
+                    return False
+                
+                # Drop one reference while others remain
+                if existing.get("_meta", {}).get("ref_count", 1) > 1:
+                    item_with_metadata = self._with_ref_count(existing, -1)
+                    self._save_item(identifier, item_with_metadata)
+                    self._index_put(identifier, item_with_metadata)
+                    return True
             
-            # Update the index
-            if self.index_in_memory and identifier in self.index:
-                del self.index[identifier]
+            if not self._item_exists(identifier):
+                return False
             
-            return True
+            try:
+                self._remove_item(identifier)
+                
+                # Update the index
+                self._index_remove(identifier)
+                if self.vector_index is not None:
+                    self.vector_index.remove(identifier)
+                
+                return True
+            except Exception as e:
+                logging.error(f"Error deleting item {identifier}: {e}")
+                return False
+    
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Delete several items with one batched write and index update.
+        
+        Args:
+            identifiers: The identifiers of the items to delete.
+            
+        Returns:
+            The number of items that were deleted.
+        """
+        if self.deduplicate:
+            # Every listed reference has to be dropped individually
+            return sum(1 for identifier in identifiers if self.delete(identifier))
+        
+        existing = [identifier for identifier in dict.fromkeys(identifiers) if self._item_exists(identifier)]
+        if not existing:
+            return 0
+        
+        try:
+            with self._index_lock:
+                self._save_items({identifier: None for identifier in existing})
+                for identifier in existing:
+                    self._index_remove(identifier)
+                    if self.vector_index is not None:
+                        self.vector_index.remove(identifier)
         except Exception as e:
-            logging.error(f"Error deleting item {identifier}: {e}")
-            return False
+            logging.error(f"Error deleting {len(existing)} items: {e}")
+            return 0
+        
+        return len(existing)
     
     def clear(self) -> None:
         """
         Clear all items from memory.
         """
+        # Drop queued writes so the writer cannot resurrect cleared items
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending = {}
+        
+        if self.read_cache is not None:
+            self.read_cache.clear()
+        if self.bloom is not None:
+            self.bloom.clear()
+        
         for item_file in os.listdir(self.storage_path):
             if not item_file.endswith(".json"):
                 continue
@@ -236,7 +788,16 @@ class LongTermMemory(BaseMemory):
         
         # Clear the index
         if self.index_in_memory:
-            self.index = {}
+            with self._index_lock:
+                self.index = {}
+                self._dirty_ids = set()
+            self._remove_index_snapshot()
+        if self.vector_index is not None:
+            self.vector_index.clear()
+        if self.text_index is not None:
+            with self._index_lock:
+                self.text_index.clear()
+            self._remove_text_index()
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -245,8 +806,10 @@ class LongTermMemory(BaseMemory):
         Returns:
             A dictionary containing memory statistics.
         """
+        self.flush()
+        
         # Count the number of items
-        if self.index_in_memory:
+        if self.index_in_memory and self._index_ready.is_set():
             item_count = len(self.index)
         else:
             item_count = len([f for f in os.listdir(self.storage_path) if f.endswith(".json")])
@@ -258,10 +821,29 @@ class LongTermMemory(BaseMemory):
             if os.path.isfile(os.path.join(self.storage_path, f)) and f.endswith(".json")
         )
         
+        # Long-term items never expire; only the read cache evicts
+        metrics = self.metrics.snapshot()
+        if self.read_cache is not None:
+            metrics["evictions"]["lru"] = self.read_cache.evictions
+        
         return {
             "type": "long_term",
             "storage_path": self.storage_path,
             "index_in_memory": self.index_in_memory,
+            "index_ready": self._index_ready.is_set(),
+            "snapshot_generation": self.snapshot_generation,
+            "write_behind": self.write_behind,
+            "deduplicate": self.deduplicate,
+            "text_index_size": len(self.text_index) if self.text_index is not None else None,
+            "durability": self.durability,
+            "compression": self.codec.get_stats(),
+            "metrics": metrics,
+            "read_cache": self.read_cache.get_stats() if self.read_cache is not None else None,
+            "bloom_filter": {
+                "capacity": self.bloom.capacity,
+                "keys_added": self.bloom.count,
+                "negative_lookups": self.bloom_negatives
+            } if self.bloom is not None else None,
             "item_count": item_count,
             "total_size_bytes": total_size
         }
@@ -280,65 +862,553 @@ class LongTermMemory(BaseMemory):
     
     def _save_item(self, identifier: str, item: Dict[str, Any]) -> None:
         """
-        Save an item to disk.
+        Save an item to disk, or queue it in write-behind mode.
         
         Args:
             identifier: The identifier of the item.
             item: The item to save.
         """
-        item_path = self._get_item_path(identifier)
-        
         try:
-            with open(item_path, "w") as f:
-                json.dump(item, f, indent=2)
+            self._save_items({identifier: item})
         except Exception as e:
             logging.error(f"Error saving item {identifier}: {e}")
     
+    def _save_items(self, batch: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """
+        Save or remove several items at once, or queue them in write-behind mode.
+        
+        Args:
+            batch: Mapping of identifier to item, or None for deletions.
+        """
+        if self.write_behind:
+            self._queue_writes(batch)
+        else:
+            self._write_batch(batch)
+    
+    def _remove_item(self, identifier: str) -> None:
+        """
+        Remove an item file, or queue its removal in write-behind mode.
+        
+        Args:
+            identifier: The identifier of the item.
+        """
+        self._save_items({identifier: None})
+    
+    def _item_exists(self, identifier: str) -> bool:
+        """
+        Check whether an item exists, taking queued writes into account.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            True if the item exists, False otherwise.
+        """
+        with self._pending_lock:
+            if identifier in self._pending:
+                return self._pending[identifier] is not None
+        
+        return os.path.exists(self._get_item_path(identifier))
+    
+    def _queue_writes(self, batch: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """
+        Queue writes, replacing any earlier queued writes for the same items.
+        
+        Args:
+            batch: Mapping of identifier to item, or None for deletions.
+        """
+        with self._pending_lock:
+            self._pending.update(batch)
+            queued = len(self._pending)
+        
+        if queued >= self.flush_batch_size:
+            self._flush_event.set()
+    
+    def flush(self) -> None:
+        """
+        Write all queued items to disk.
+        
+        A no-op unless write-behind mode is enabled.
+        """
+        if not self.write_behind:
+            return
+        
+        with self._flush_lock:
+            with self._pending_lock:
+                batch = self._pending
+                self._pending = {}
+            
+            if not batch:
+                return
+            
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logging.error(f"Error flushing {len(batch)} queued memory writes: {e}")
+                
+                # Requeue whatever was not superseded in the meantime
+                with self._pending_lock:
+                    for identifier, item in batch.items():
+                        self._pending.setdefault(identifier, item)
+    
+    def close(self) -> None:
+        """
+        Stop the background writer, flush queued writes and persist the index snapshot.
+        """
+        self._stop_event.set()
+        self._flush_event.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        
+        self.flush()
+        
+        if self.index_snapshot:
+            self.save_index_snapshot()
+        if self.text_index is not None:
+            self.save_text_index()
+    
+    def _write_batch(self, batch: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """
+        Apply a batch of writes to disk using atomic renames.
+        
+        Args:
+            batch: Mapping of identifier to item, or None for deletions.
+        """
+        for identifier, item in batch.items():
+            item_path = self._get_item_path(identifier)
+            
+            if item is None:
+                if os.path.exists(item_path):
+                    os.remove(item_path)
+                continue
+            
+            temp_path = item_path + ".tmp"
+            payload = self.codec.encode(item)
+            with open(temp_path, "wb") as f:
+                f.write(payload)
+                if self.durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, item_path)
+            self.metrics.record_bytes(written=len(payload))
+            
+            if self.durability == "every-write":
+                self._fsync_directory()
+        
+        if self.durability == "batch":
+            self._fsync_directory()
+    
+    def _fsync_directory(self) -> None:
+        """
+        Fsync the storage directory so that renames are durable.
+        """
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        
+        fd = os.open(self.storage_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _flush_loop(self) -> None:
+        """
+        Flush queued writes periodically, or early when a batch fills up.
+        """
+        while not self._stop_event.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+    
     def _load_index(self) -> None:
         """
         Load the index from disk.
+        
+        Items are taken from the index snapshot when their file's modification
+        time and size still match it; only new or changed files are parsed.
+        Operations performed while the index is being built in the background
+        are reconciled before it is published.
         """
-        self.index = {}
+        snapshot = self._read_index_snapshot() if self.index_in_memory and self.index_snapshot else {}
+        text_fingerprints = self._load_text_index() if self.text_index is not None else {}
+        text_stale = self.text_index is not None and not text_fingerprints
+        index: Dict[str, Dict[str, Any]] = {}
+        reused = 0
+        seen = set()
         
-        for item_file in os.listdir(self.storage_path):
-            if not item_file.endswith(".json"):
+        for entry in os.scandir(self.storage_path):
+            if not entry.name.endswith(".json"):
                 continue
             
-            identifier = item_file[:-5]  # Remove .json extension
+            identifier = entry.name[:-5]  # Remove .json extension
+            seen.add(identifier)
             
             try:
-                with open(os.path.join(self.storage_path, item_file), "r") as f:
-                    item = json.load(f)
-                    self.index[identifier] = item
+                stat = entry.stat()
+                text_current = text_fingerprints.get(identifier) == (stat.st_mtime_ns, stat.st_size)
+                
+                # Nothing else needs the item if its postings are still current
+                if text_current and not self.index_in_memory and self.vector_index is None:
+                    continue
+                
+                cached = snapshot.get(identifier)
+                if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    item = cached[2]
+                    reused += 1
+                else:
+                    with open(entry.path, "rb") as f:
+                        data = f.read()
+                    self.metrics.record_bytes(read=len(data))
+                    item = self.codec.decode(data)
+                
+                if self.index_in_memory:
+                    index[identifier] = item
+                if self.vector_index is not None:
+                    self.vector_index.index_item(identifier, item)
+                if self.text_index is not None and not text_current:
+                    self.text_index.add(identifier, item)
+                    text_stale = True
             except Exception as e:
                 logging.error(f"Error loading index for {identifier}: {e}")
+        
+        if self.text_index is not None:
+            # Drop postings of items whose files are gone
+            for identifier in set(text_fingerprints) - seen:
+                self.text_index.remove(identifier)
+                text_stale = True
+        
+        with self._index_lock:
+            # Re-read anything that changed while the index was being built
+            for identifier in self._dirty_ids:
+                item = self._read_item_file(identifier)
+                if item is None:
+                    index.pop(identifier, None)
+                else:
+                    index[identifier] = item
+            self._dirty_ids = set()
+            
+            self.index = index
+            self._index_ready.set()
+        
+        changed = len(index) - reused
+        logging.debug(f"Long-term memory index loaded: {reused} items from snapshot, {changed} from files")
+        
+        if self.index_in_memory and self.index_snapshot and (changed or reused != len(snapshot) or not snapshot):
+            self.save_index_snapshot()
+        if text_stale:
+            self.save_text_index()
     
-    def _matches_query(self, item: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    def save_index_snapshot(self) -> None:
+        """
+        Persist the in-memory index as a JSON-lines snapshot.
+        
+        The first line is a header with a generation counter; each following
+        line holds one item with the modification time and size of its file.
+        The snapshot is written to a temporary file and atomically renamed.
         """
-        Check if an item matches a query.
+        if not self.index_in_memory or not self._index_ready.is_set():
+            return
+        
+        snapshot_path = os.path.join(self.storage_path, self.INDEX_SNAPSHOT_FILE)
+        temp_path = snapshot_path + ".tmp"
+        
+        try:
+            with self._index_lock:
+                generation = self.snapshot_generation + 1
+                
+                with open(temp_path, "w") as f:
+                    f.write(json.dumps({
+                        "version": self.INDEX_SNAPSHOT_VERSION,
+                        "generation": generation,
+                        "created_at": time.time()
+                    }) + "\n")
+                    
+                    for entry in os.scandir(self.storage_path):
+                        if not entry.name.endswith(".json"):
+                            continue
+                        
+                        identifier = entry.name[:-5]
+                        item = self.index.get(identifier)
+                        if item is None:
+                            continue
+                        
+                        stat = entry.stat()
+                        f.write(json.dumps({
+                            "id": identifier,
+                            "mtime_ns": stat.st_mtime_ns,
+                            "size": stat.st_size,
+                            "item": item
+                        }, separators=(",", ":")) + "\n")
+                
+                os.replace(temp_path, snapshot_path)
+                self.snapshot_generation = generation
+        except Exception as e:
+            logging.error(f"Error saving index snapshot: {e}")
+    
+    def save_text_index(self) -> None:
+        """
+        Persist the text index postings next to the item files.
+        
+        Each document is saved with the modification time and size of its
+        item file, so that on startup only files that changed are tokenized
+        again.
+        """
+        if self.text_index is None:
+            return
+        
+        try:
+            with self._index_lock:
+                fingerprints = {}
+                for entry in os.scandir(self.storage_path):
+                    identifier = entry.name[:-5]
+                    if entry.name.endswith(".json") and identifier in self.text_index.docs:
+                        stat = entry.stat()
+                        fingerprints[identifier] = (stat.st_mtime_ns, stat.st_size)
+                
+                self.text_index.save(os.path.join(self.storage_path, self.TEXT_INDEX_FILE), fingerprints)
+        except Exception as e:
+            logging.error(f"Error saving text index: {e}")
+    
+    def _load_text_index(self) -> Dict[str, tuple]:
+        """
+        Load persisted text index postings, if any.
+        
+        Returns:
+            A mapping of identifier to the (mtime_ns, size) of the item file the
+            postings were built from, or an empty mapping if there are none.
+        """
+        path = os.path.join(self.storage_path, self.TEXT_INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        
+        try:
+            return self.text_index.load(path)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable text index: {e}")
+            self.text_index.clear()
+            return {}
+    
+    def _read_index_snapshot(self) -> Dict[str, tuple]:
+        """
+        Read the index snapshot in a single pass.
+        
+        Returns:
+            A mapping of identifier to (mtime_ns, size, item), or an empty
+            mapping if there is no usable snapshot.
+        """
+        snapshot_path = os.path.join(self.storage_path, self.INDEX_SNAPSHOT_FILE)
+        if not os.path.exists(snapshot_path):
+            return {}
+        
+        snapshot = {}
+        
+        try:
+            with open(snapshot_path, "r") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != self.INDEX_SNAPSHOT_VERSION:
+                    logging.warning("Ignoring index snapshot with an unknown version")
+                    return {}
+                
+                self.snapshot_generation = header.get("generation", 0)
+                
+                for line in f:
+                    record = json.loads(line)
+                    snapshot[record["id"]] = (record["mtime_ns"], record["size"], record["item"])
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable index snapshot: {e}")
+            return {}
+        
+        return snapshot
+    
+    def _remove_index_snapshot(self) -> None:
+        """
+        Delete the index snapshot, if any.
+        """
+        snapshot_path = os.path.join(self.storage_path, self.INDEX_SNAPSHOT_FILE)
+        try:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+        except Exception as e:
+            logging.error(f"Error deleting index snapshot: {e}")
+    
+    def _remove_text_index(self) -> None:
+        """
+        Delete the persisted text index postings, if any.
+        """
+        text_index_path = os.path.join(self.storage_path, self.TEXT_INDEX_FILE)
+        try:
+            if os.path.exists(text_index_path):
+                os.remove(text_index_path)
+        except Exception as e:
+            logging.error(f"Error deleting text index: {e}")
+    
+    def _read_item_file(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an item directly from its file.
         
         Args:
-            item: The item to check.
-            query: The query to match against.
+            identifier: The identifier of the item.
             
         Returns:
-            True if the item matches the query, False otherwise.
-        """
-        for key, value in query.items():
-            # Handle nested keys with dot notation
-            if "." in key:
-                parts = key.split(".")
-                curr = item
-                for part in parts:
-                    if isinstance(curr, dict) and part in curr:
-                        curr = curr[part]
-                    else:
-                        return False
-                
-                if curr != value:
-                    return False
-            # Handle simple keys
-            elif key not in item or item[key] != value:
-                return False
+            The item, or None if the file is missing or unreadable.
+        """
+        # Queued writes are newer than anything on disk
+        with self._pending_lock:
+            if identifier in self._pending:
+                return self._pending[identifier]
+        
+        item_path = self._get_item_path(identifier)
+        if not os.path.exists(item_path):
+            return None
+        
+        try:
+            with open(item_path, "rb") as f:
+                data = f.read()
+            self.metrics.record_bytes(read=len(data))
+            return self.codec.decode(data)
+        except Exception as e:
+            logging.error(f"Error loading item {identifier}: {e}")
+            return None
+    
+    def _index_put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Record an added or updated item in the in-memory index or read cache.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item with metadata.
+        """
+        if self.read_cache is not None:
+            self.read_cache.put(identifier, item)
+        if self.bloom is not None:
+            self.bloom.add(identifier)
+        if self.text_index is not None:
+            with self._index_lock:
+                self.text_index.add(identifier, item)
+        
+        if not self.index_in_memory:
+            return
+        
+        with self._index_lock:
+            if self._index_ready.is_set():
+                self.index[identifier] = item
+            else:
+                self._dirty_ids.add(identifier)
+    
+    def _index_remove(self, identifier: str) -> None:
+        """
+        Remove a deleted item from the in-memory index or read cache.
+        
+        Args:
+            identifier: The identifier of the item.
+        """
+        if self.read_cache is not None:
+            self.read_cache.pop(identifier)
+        if self.text_index is not None:
+            with self._index_lock:
+                self.text_index.remove(identifier)
+        
+        if not self.index_in_memory:
+            return
+        
+        with self._index_lock:
+            if self._index_ready.is_set():
+                self.index.pop(identifier, None)
+            else:
+                self._dirty_ids.add(identifier)
+    
+    def train_compression_dictionary(
+        self,
+        sample_size: int = 1000,
+        size: int = 16384,
+        min_samples: int = 1
+    ) -> Optional[int]:
+        """
+        Train a shared compression dictionary from stored items and use it for new writes.
+        
+        Existing files are not rewritten; they stay readable because earlier
+        dictionaries are kept.
+        
+        Args:
+            sample_size: Maximum number of stored items to learn from.
+            size: Maximum dictionary size in bytes.
+            min_samples: Minimum number of stored items required to train.
+            
+        Returns:
+            The id of the new dictionary, or None if there were too few items
+            or they share no common strings.
+        """
+        self.flush()
+        
+        samples = []
+        for result in self.iter_search({}, batch_size=min(sample_size, 256)):
+            payload = {key: value for key, value in result["item"].items() if key != "_meta"}
+            samples.append(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+            if len(samples) >= sample_size:
+                break
+        
+        if len(samples) < min_samples:
+            return None
+        
+        dictionary = train_dictionary(samples, size=size)
+        if not dictionary:
+            return None
+        
+        dictionary_id = self.codec.add_dictionary(dictionary)
+        path = os.path.join(self.storage_path, f"{self.DICTIONARY_PREFIX}{dictionary_id:08x}{self.DICTIONARY_SUFFIX}")
+        
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(dictionary)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        
+        logging.info(f"ANUS trained a {len(dictionary)}-byte compression dictionary from {len(samples)} items")
+        return dictionary_id
+    
+    def _load_dictionaries(self) -> None:
+        """
+        Register every stored compression dictionary, activating the newest one
+        if dictionary compression is enabled.
+        """
+        entries = [
+            entry for entry in os.scandir(self.storage_path)
+            if entry.name.startswith(self.DICTIONARY_PREFIX) and entry.name.endswith(self.DICTIONARY_SUFFIX)
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        
+        for entry in entries:
+            with open(entry.path, "rb") as f:
+                self.codec.add_dictionary(f.read(), active=self.compression_dictionary)
+    
+    def _build_bloom_filter(self, capacity: int) -> None:
+        """
+        Create the Bloom filter and seed it with the identifiers on disk.
+        
+        Only file names are listed; no item is parsed.
+        
+        Args:
+            capacity: Minimum number of identifiers to size the filter for.
+        """
+        identifiers = [f[:-5] for f in os.listdir(self.storage_path) if f.endswith(".json")]
+        
+        self.bloom = BloomFilter(capacity=max(capacity, 2 * len(identifiers)))
+        for identifier in identifiers:
+            self.bloom.add(identifier)
+    
+    def _index_vector(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Add an item to the vector index, caching computed embeddings in its metadata.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item with metadata; modified in place.
+        """
+        if self.vector_index is None:
+            return
         
-        return True 
\ No newline at end of file
+        vector = self.vector_index.index_item(identifier, item)
+        if vector is not None and self.vector_index.embedding_field not in item:
+            item["_meta"]["embedding"] = [float(x) for x in vector]
@@ -0,0 +1,240 @@
+"""
+Metrics module for the ANUS framework.
+
+Provides the counters and latency histograms memory systems report through
+``get_stats``:
+- LatencyHistogram: Fixed-bucket latency distribution with percentile estimates
+- MemoryMetrics: Hits, misses, evictions by cause, bytes moved and per-operation latency
+"""
+
+from typing import Dict, List, Any, Iterable
+import bisect
+import threading
+import time
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open
+LATENCY_BUCKETS_MS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 25.0, 50.0,
+    100.0, 250.0, 500.0, 1000.0, 2500.0, 10000.0
+)
+
+class LatencyHistogram:
+    """
+    Latency distribution over fixed, roughly logarithmic buckets.
+    
+    Recording is a bisect and an increment, so it is cheap enough for every
+    operation. Percentiles are reported as the upper bound of the bucket
+    they fall in.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty LatencyHistogram.
+        """
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, elapsed_ms: float) -> None:
+        """
+        Record one observation.
+        
+        Args:
+            elapsed_ms: The latency in milliseconds.
+        """
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add another histogram's observations to this one.
+        
+        Args:
+            other: The histogram to merge in.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+    
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a latency percentile.
+        
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.95.
+            
+        Returns:
+            The upper bound in milliseconds of the bucket holding the percentile,
+            capped at the maximum observed latency. 0 without observations.
+        """
+        if self.count == 0:
+            return 0.0
+        
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(LATENCY_BUCKETS_MS[bucket], self.max_ms) if bucket < len(LATENCY_BUCKETS_MS) else self.max_ms
+        
+        return self.max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize the distribution.
+        
+        Returns:
+            A dictionary with the count, mean, percentiles, maximum and the
+            non-empty buckets keyed by their upper bound.
+        """
+        buckets = {}
+        for bucket, count in enumerate(self.counts):
+            if count:
+                bound = str(LATENCY_BUCKETS_MS[bucket]) if bucket < len(LATENCY_BUCKETS_MS) else "+inf"
+                buckets[bound] = count
+        
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": buckets
+        }
+
+
+class MemoryMetrics:
+    """
+    Operational counters for one memory system.
+    
+    Tracks lookup hits and misses, evictions by cause, bytes read and written,
+    and a latency histogram per operation. Updates take a lock so background
+    writer threads can report bytes safely.
+    """
+    
+    OPERATIONS = ("add", "get", "search")
+    EVICTION_CAUSES = ("ttl", "lru")
+    
+    def __init__(self):
+        """
+        Initialize a MemoryMetrics instance with all counters at zero.
+        """
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """
+        Set all counters back to zero.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions: Dict[str, int] = {cause: 0 for cause in self.EVICTION_CAUSES}
+            self.bytes_read = 0
+            self.bytes_written = 0
+            self.latency: Dict[str, LatencyHistogram] = {
+                operation: LatencyHistogram() for operation in self.OPERATIONS
+            }
+    
+    def observe(self, operation: str, start: float) -> None:
+        """
+        Record the latency of an operation.
+        
+        Args:
+            operation: One of ``OPERATIONS``.
+            start: The ``time.perf_counter`` reading taken when the operation began.
+        """
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.latency[operation].record(elapsed_ms)
+    
+    def record_lookup(self, hits: int, misses: int = 0) -> None:
+        """
+        Count lookup results.
+        
+        Args:
+            hits: Number of lookups that found an item.
+            misses: Number of lookups that did not.
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+    
+    def record_eviction(self, cause: str, count: int = 1) -> None:
+        """
+        Count evicted items.
+        
+        Args:
+            cause: One of ``EVICTION_CAUSES``.
+            count: Number of items evicted.
+        """
+        with self._lock:
+            self.evictions[cause] += count
+    
+    def record_bytes(self, read: int = 0, written: int = 0) -> None:
+        """
+        Count bytes moved to or from storage.
+        
+        Args:
+            read: Bytes read.
+            written: Bytes written.
+        """
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize all counters.
+        
+        Returns:
+            A dictionary with ``hits``, ``misses``, ``hit_ratio``, ``evictions``
+            by cause, ``bytes_read``, ``bytes_written`` and ``latency`` per operation.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": dict(self.evictions),
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "latency": {
+                    operation: histogram.snapshot()
+                    for operation, histogram in self.latency.items()
+                }
+            }
+    
+    @classmethod
+    def combine(cls, metrics: Iterable["MemoryMetrics"]) -> "MemoryMetrics":
+        """
+        Merge the counters of several memory systems, such as shards.
+        
+        Args:
+            metrics: The metrics to merge.
+            
+        Returns:
+            A new MemoryMetrics holding the totals.
+        """
+        combined = cls()
+        
+        for part in metrics:
+            with part._lock:
+                combined.hits += part.hits
+                combined.misses += part.misses
+                for cause, count in part.evictions.items():
+                    combined.evictions[cause] += count
+                combined.bytes_read += part.bytes_read
+                combined.bytes_written += part.bytes_written
+                for operation, histogram in part.latency.items():
+                    combined.latency[operation].merge(histogram)
+        
+        return combined
@@ -0,0 +1,294 @@
+"""
+Query module for the ANUS framework.
+
+Compiles memory search queries into matcher functions.
+
+A query maps top-level or dotted field paths to conditions. A plain value
+means equality, as before. A dict whose keys all start with ``$`` is an
+operator spec:
+
+- ``$eq`` / ``$ne``: equal / not equal (``$ne`` also matches missing fields)
+- ``$gt`` / ``$gte`` / ``$lt`` / ``$lte``: range comparisons
+- ``$in`` / ``$nin``: membership in a list of values
+- ``$prefix``: string prefix match
+- ``$exists``: whether the field is present
+- ``$not``: negation of a nested operator spec
+
+Several operators in one spec must all hold, e.g.
+``{"_meta.created_at": {"$gte": time.time() - 3600},
+"type": {"$in": ["observation", "result"]}}``.
+"""
+
+from typing import Dict, List, Any, Callable, Iterable, Union
+
+from anus.core.memory.field_index import resolve_path, _MISSING, _is_hashable
+
+# Operators that compare a field against a single value
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+OPERATORS = RANGE_OPERATORS | {"$eq", "$ne", "$in", "$nin", "$prefix", "$exists", "$not"}
+
+
+class Condition:
+    """
+    A single compiled test on one field path.
+    
+    ``test`` receives the resolved value, or ``_MISSING`` when the path does
+    not exist in the item.
+    """
+    
+    __slots__ = ("key", "parts", "operator", "operand", "test")
+    
+    def __init__(self, key: str, operator: str, operand: Any, test: Callable[[Any], bool]):
+        self.key = key
+        self.parts = key.split(".")
+        self.operator = operator
+        self.operand = operand
+        self.test = test
+    
+    def matches(self, item: Dict[str, Any]) -> bool:
+        """
+        Check the condition against an item.
+        
+        Args:
+            item: The item to check.
+            
+        Returns:
+            True if the condition holds, False otherwise.
+        """
+        return self.test(resolve_path(item, self.parts))
+
+
+class CompiledQuery:
+    """
+    A query compiled into a list of conditions and a single matcher function.
+    
+    Compiling splits every dotted path once, so checking many items does no
+    string work. Memory systems can inspect ``conditions`` to answer some of
+    them from an index and evaluate only the rest with ``without``.
+    """
+    
+    def __init__(self, conditions: List[Condition]):
+        """
+        Initialize a CompiledQuery instance.
+        
+        Args:
+            conditions: The conditions that must all hold.
+        """
+        self.conditions = conditions
+        self.matches = _build_matcher(conditions)
+    
+    def __call__(self, item: Dict[str, Any]) -> bool:
+        return self.matches(item)
+    
+    def __bool__(self) -> bool:
+        return bool(self.conditions)
+    
+    def without(self, conditions: Iterable[Condition]) -> "CompiledQuery":
+        """
+        Get a query with some conditions removed, e.g. ones answered by an index.
+        
+        Args:
+            conditions: The conditions to drop.
+            
+        Returns:
+            A new compiled query over the remaining conditions.
+        """
+        dropped = {id(condition) for condition in conditions}
+        return CompiledQuery([c for c in self.conditions if id(c) not in dropped])
+
+
+def compile_query(query: Union[Dict[str, Any], CompiledQuery]) -> CompiledQuery:
+    """
+    Compile a query into a matcher.
+    
+    Args:
+        query: The search query. Already compiled queries are returned as is.
+        
+    Returns:
+        The compiled query.
+        
+    Raises:
+        ValueError: If the query uses an unknown operator or mixes operators
+            with plain keys in one spec.
+    """
+    if isinstance(query, CompiledQuery):
+        return query
+    
+    conditions = []
+    for key, spec in query.items():
+        if _is_operator_spec(spec):
+            for operator, operand in spec.items():
+                conditions.append(_compile_operator(key, operator, operand))
+        else:
+            conditions.append(_compile_operator(key, "$eq", spec))
+    
+    return CompiledQuery(conditions)
+
+
+def _is_operator_spec(spec: Any) -> bool:
+    """
+    Check whether a query value is an operator spec rather than a literal.
+    
+    Args:
+        spec: The query value.
+        
+    Returns:
+        True if every key of a non-empty dict starts with ``$``.
+        
+    Raises:
+        ValueError: If the dict mixes operator and plain keys.
+    """
+    if not isinstance(spec, dict) or not spec:
+        return False
+    
+    operator_keys = [key for key in spec if isinstance(key, str) and key.startswith("$")]
+    if not operator_keys:
+        return False
+    if len(operator_keys) != len(spec):
+        raise ValueError(f"Query spec mixes operators and plain keys: {spec!r}")
+    
+    return True
+
+
+def _compile_operator(key: str, operator: str, operand: Any) -> Condition:
+    """
+    Compile one operator on one field into a condition.
+    
+    Args:
+        key: The field path.
+        operator: The operator name.
+        operand: The operator argument.
+        
+    Returns:
+        The compiled condition.
+        
+    Raises:
+        ValueError: If the operator is unknown or its operand is invalid.
+    """
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown query operator {operator!r} for {key!r}")
+    
+    if operator == "$eq":
+        test = lambda value: value is not _MISSING and value == operand
+    elif operator == "$ne":
+        test = lambda value: value is _MISSING or value != operand
+    elif operator in RANGE_OPERATORS:
+        test = _range_test(operator, operand)
+    elif operator in ("$in", "$nin"):
+        if not isinstance(operand, (list, tuple, set, frozenset)):
+            raise ValueError(f"{operator} for {key!r} needs a list of values")
+        contains = _membership_test(operand)
+        if operator == "$in":
+            test = lambda value: value is not _MISSING and contains(value)
+        else:
+            test = lambda value: value is _MISSING or not contains(value)
+    elif operator == "$prefix":
+        if not isinstance(operand, str):
+            raise ValueError(f"$prefix for {key!r} needs a string")
+        test = lambda value: isinstance(value, str) and value.startswith(operand)
+    elif operator == "$exists":
+        present = bool(operand)
+        test = lambda value: (value is not _MISSING) == present
+    else:
+        if not _is_operator_spec(operand):
+            raise ValueError(f"$not for {key!r} needs an operator spec")
+        inner = [_compile_operator(key, op, arg).test for op, arg in operand.items()]
+        test = lambda value: not all(check(value) for check in inner)
+    
+    return Condition(key, operator, operand, test)
+
+
+def _range_test(operator: str, operand: Any) -> Callable[[Any], bool]:
+    """
+    Build the test for a range operator.
+    
+    Values that cannot be ordered against the operand (missing fields, None,
+    mismatched types) never match. Booleans only compare with booleans, so
+    ``{"$gt": 0}`` does not match ``True``.
+    
+    Args:
+        operator: One of ``$gt``, ``$gte``, ``$lt``, ``$lte``.
+        operand: The bound.
+        
+    Returns:
+        The test function.
+    """
+    compare = {
+        "$gt": lambda value: value > operand,
+        "$gte": lambda value: value >= operand,
+        "$lt": lambda value: value < operand,
+        "$lte": lambda value: value <= operand,
+    }[operator]
+    
+    operand_is_bool = isinstance(operand, bool)
+    
+    def test(value: Any) -> bool:
+        if value is _MISSING or value is None or isinstance(value, bool) != operand_is_bool:
+            return False
+        try:
+            return compare(value)
+        except TypeError:
+            return False
+    
+    return test
+
+
+def _membership_test(values: Iterable[Any]) -> Callable[[Any], bool]:
+    """
+    Build a membership test, hashing the values that can be hashed.
+    
+    Args:
+        values: The allowed values.
+        
+    Returns:
+        The test function.
+    """
+    hashed = frozenset(value for value in values if _is_hashable(value))
+    unhashed = [value for value in values if not _is_hashable(value)]
+    
+    def contains(value: Any) -> bool:
+        if _is_hashable(value):
+            return value in hashed
+        return any(value == other for other in unhashed)
+    
+    return contains
+
+
+def _build_matcher(conditions: List[Condition]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Specialize a matcher function for a list of conditions.
+    
+    Top-level keys are read with ``dict.get`` instead of walking a path.
+    
+    Args:
+        conditions: The conditions that must all hold.
+        
+    Returns:
+        A function taking an item and returning whether it matches.
+    """
+    checks = []
+    for condition in conditions:
+        if len(condition.parts) == 1:
+            key = condition.parts[0]
+            checks.append((condition.test, None, key))
+        else:
+            checks.append((condition.test, condition.parts, None))
+    
+    if not checks:
+        return lambda item: True
+    
+    if len(checks) == 1:
+        test, parts, key = checks[0]
+        if parts is None:
+            return lambda item: test(item.get(key, _MISSING))
+        return lambda item: test(resolve_path(item, parts))
+    
+    def matches(item: Dict[str, Any]) -> bool:
+        for test, parts, key in checks:
+            value = item.get(key, _MISSING) if parts is None else resolve_path(item, parts)
+            if not test(value):
+                return False
+        return True
+    
+    return matches
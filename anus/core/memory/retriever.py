@@ -0,0 +1,361 @@
+"""
+Retriever module for the ANUS framework.
+
+Assembles memory items into prompt context under a token budget, combining
+exact filters, keyword scores and vector similarity.
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Tuple
+import json
+import logging
+import time
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.query import CompiledQuery, compile_query
+
+class HybridRetriever:
+    """
+    Token-budgeted hybrid retriever over one or more memory systems.
+    
+    Retrieval runs in stages, each timed separately:
+    
+    - filter: exact query filters, which also constrain the other stages
+    - keyword: BM25 candidates from ``search_text``
+    - vector: similarity candidates from ``search_similar``
+    - rerank: weighted combination of normalized keyword score, similarity
+      and recency
+    - pack: greedy selection in score order of every candidate that still
+      fits the token budget
+    
+    Memory systems without a text or vector index simply skip that stage.
+    """
+    
+    STAGES = ("filter", "keyword", "vector", "rerank", "pack")
+    
+    def __init__(
+        self,
+        memories: List[BaseMemory],
+        model: Optional[Any] = None,
+        candidate_k: int = 50,
+        keyword_weight: float = 0.5,
+        vector_weight: float = 0.5,
+        recency_weight: float = 0.1,
+        recency_half_life: float = 3600.0,
+        formatter: Optional[Callable[[Dict[str, Any]], str]] = None,
+        embedding_model: Optional[Any] = None
+    ):
+        """
+        Initialize a HybridRetriever instance.
+        
+        Args:
+            memories: The memory systems to retrieve from, e.g. short-term then long-term.
+            model: Optional BaseModel whose ``get_token_count`` measures item cost.
+                Without one, tokens are approximated as four characters each.
+            candidate_k: Number of candidates to request from each stage per memory.
+            keyword_weight: Weight of the normalized BM25 score.
+            vector_weight: Weight of the cosine similarity.
+            recency_weight: Weight of the recency score.
+            recency_half_life: Age in seconds at which the recency score halves.
+            formatter: Function rendering an item as prompt text. Defaults to its
+                ``content`` field, or its JSON without ``_meta``.
+            embedding_model: Optional BaseModel that embeds the query text. Defaults
+                to each memory's own embedding model.
+        """
+        self.memories = [memory for memory in memories if memory is not None]
+        self.model = model
+        self.candidate_k = candidate_k
+        self.keyword_weight = keyword_weight
+        self.vector_weight = vector_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life = recency_half_life
+        self.formatter = formatter or format_item
+        self.embedding_model = embedding_model
+        
+        self.calls = 0
+        self.stage_totals = {stage: 0.0 for stage in self.STAGES}
+    
+    def retrieve(
+        self,
+        query: str,
+        token_budget: int,
+        filters: Optional[Dict[str, Any]] = None,
+        query_vector: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the most relevant items that fit in a token budget.
+        
+        Args:
+            query: The text to retrieve context for.
+            token_budget: Maximum total tokens of the packed items.
+            filters: Optional exact search query every returned item must match.
+            query_vector: Optional precomputed query embedding. Without one, the
+                query text is embedded once per distinct embedding model.
+                
+        Returns:
+            A dictionary with the packed ``items`` (each with ``id``, ``item``,
+            ``text``, ``tokens`` and ``score``), ``tokens_used``, the number
+            of ``candidates`` considered and per-stage ``latency_ms``.
+        """
+        latency: Dict[str, float] = {}
+        started = time.perf_counter()
+        
+        # identifier -> [result, keyword score, vector score]
+        candidates: Dict[str, List[Any]] = {}
+        matches = compile_query(filters) if filters else None
+        
+        stage_start = time.perf_counter()
+        if filters:
+            for memory in self.memories:
+                for result in memory.search(filters, limit=self.candidate_k):
+                    candidates.setdefault(result["id"], [result, 0.0, 0.0])
+        latency["filter"] = _elapsed_ms(stage_start)
+        
+        stage_start = time.perf_counter()
+        for memory in self.memories:
+            results = _optional_stage(memory.search_text, query, self.candidate_k)
+            top = max((result["score"] for result in results), default=0.0)
+            for result in results:
+                if matches is not None and not _matches(matches, result):
+                    continue
+                entry = candidates.setdefault(result["id"], [result, 0.0, 0.0])
+                # BM25 scores are unbounded, so scale each memory's best match to 1
+                entry[1] = max(entry[1], result["score"] / top if top > 0 else 0.0)
+        latency["keyword"] = _elapsed_ms(stage_start)
+        
+        stage_start = time.perf_counter()
+        # id(model) -> query vector, so memories sharing a model share one embedding call
+        query_vectors: Dict[int, List[float]] = {}
+        for memory in self.memories:
+            vector_query = query_vector
+            if vector_query is None:
+                model = self.embedding_model or _embedding_model(memory)
+                if model is None:
+                    continue
+                if id(model) not in query_vectors:
+                    query_vectors[id(model)] = model.get_embedding(query) or []
+                vector_query = query_vectors[id(model)]
+            for result in _optional_stage(memory.search_similar, vector_query, self.candidate_k):
+                if matches is not None and not _matches(matches, result):
+                    continue
+                entry = candidates.setdefault(result["id"], [result, 0.0, 0.0])
+                entry[2] = max(entry[2], result["score"])
+        latency["vector"] = _elapsed_ms(stage_start)
+        
+        stage_start = time.perf_counter()
+        ranked = self._rerank(candidates.values())
+        latency["rerank"] = _elapsed_ms(stage_start)
+        
+        stage_start = time.perf_counter()
+        packed, tokens_used = self._pack(ranked, token_budget)
+        latency["pack"] = _elapsed_ms(stage_start)
+        
+        latency["total"] = _elapsed_ms(started)
+        
+        self.calls += 1
+        for stage in self.STAGES:
+            self.stage_totals[stage] += latency[stage]
+        
+        logging.debug(
+            f"Retrieved {len(packed)} of {len(candidates)} memory items "
+            f"({tokens_used}/{token_budget} tokens) in {latency['total']:.1f}ms"
+        )
+        
+        return {
+            "items": packed,
+            "tokens_used": tokens_used,
+            "token_budget": token_budget,
+            "candidates": len(candidates),
+            "latency_ms": latency
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cumulative statistics about retrieval calls.
+        
+        Returns:
+            A dictionary with the number of calls and the mean latency per stage.
+        """
+        return {
+            "calls": self.calls,
+            "mean_latency_ms": {
+                stage: total / self.calls if self.calls else 0.0
+                for stage, total in self.stage_totals.items()
+            }
+        }
+    
+    def _rerank(self, candidates: Any) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Score candidates and order them best first.
+        
+        Args:
+            candidates: Entries of [result, keyword score, vector score].
+            
+        Returns:
+            Pairs of (score, result), highest score first.
+        """
+        now = time.time()
+        ranked = []
+        
+        for result, keyword_score, vector_score in candidates:
+            age = max(0.0, now - (result.get("created_at") or now))
+            recency = 0.5 ** (age / self.recency_half_life) if self.recency_half_life > 0 else 0.0
+            
+            score = (
+                self.keyword_weight * keyword_score
+                + self.vector_weight * max(0.0, vector_score)
+                + self.recency_weight * recency
+            )
+            ranked.append((score, result))
+        
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        return ranked
+    
+    def _pack(self, ranked: List[Tuple[float, Dict[str, Any]]], token_budget: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Greedily select ranked items that fit the token budget.
+        
+        Items too large for the remaining budget are skipped, so smaller
+        lower-ranked items can still fill the space.
+        
+        Args:
+            ranked: Pairs of (score, result), highest score first.
+            token_budget: Maximum total tokens.
+            
+        Returns:
+            A tuple of (packed items, tokens used).
+        """
+        packed = []
+        tokens_used = 0
+        
+        for score, result in ranked:
+            if tokens_used >= token_budget:
+                break
+            
+            text = self.formatter(result["item"])
+            tokens = self._count_tokens(text)
+            if tokens_used + tokens > token_budget:
+                continue
+            
+            packed.append({
+                "id": result["id"],
+                "item": result["item"],
+                "text": text,
+                "tokens": tokens,
+                "score": score
+            })
+            tokens_used += tokens
+        
+        return packed, tokens_used
+    
+    def _count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text with the configured model.
+        
+        Args:
+            text: The text to measure.
+            
+        Returns:
+            The token count.
+        """
+        if self.model is not None:
+            return self.model.get_token_count(text)
+        return len(text) // 4
+
+
+def format_item(item: Dict[str, Any]) -> str:
+    """
+    Render a memory item as prompt text.
+    
+    Args:
+        item: The memory item.
+        
+    Returns:
+        Its ``content`` field if that is a string, otherwise its JSON without ``_meta``.
+    """
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    
+    payload = {key: value for key, value in item.items() if key != "_meta"}
+    return json.dumps(payload, default=str)
+
+
+def _matches(query: CompiledQuery, result: Dict[str, Any]) -> bool:
+    """
+    Check a search result against a filter query.
+    
+    Items from memories that keep no ``_meta``, such as short-term memory,
+    are checked as if their ``_meta`` held the result's ``created_at``, the
+    way those memories answer ``_meta.created_at`` in ``search``.
+    
+    Args:
+        query: The compiled filter query.
+        result: A search result with ``id``, ``item`` and ``created_at``.
+        
+    Returns:
+        True if the result matches the query, False otherwise.
+    """
+    item = result["item"]
+    if isinstance(item, dict) and "_meta" not in item:
+        item = dict(item, _meta={"created_at": result.get("created_at")})
+    return query(item)
+
+
+def _optional_stage(search: Callable[..., List[Dict[str, Any]]], query: Any, k: int) -> List[Dict[str, Any]]:
+    """
+    Run a ranked search that a memory system may not support.
+    
+    Args:
+        search: A bound ``search_text`` or ``search_similar`` method.
+        query: The query text or vector.
+        k: Maximum number of results.
+        
+    Returns:
+        The results, or an empty list if the memory lacks the required index
+        or cannot embed a text query.
+    """
+    try:
+        return search(query, k=k)
+    except NotImplementedError:
+        return []
+    except ValueError as e:
+        logging.debug(f"Skipping retrieval stage: {e}")
+        return []
+
+
+def _embedding_model(memory: BaseMemory) -> Optional[Any]:
+    """
+    Find the model a memory system embeds text queries with.
+    
+    Sharded and tiered memories are searched through their first shard or
+    their tiers.
+    
+    Args:
+        memory: The memory system.
+        
+    Returns:
+        The embedding model, or None if the memory has no vector index with one.
+    """
+    vector_index = getattr(memory, "vector_index", None)
+    if vector_index is not None:
+        return vector_index.embedding_model
+    
+    for inner in getattr(memory, "shards", [])[:1] + [getattr(memory, "hot", None), getattr(memory, "cold", None)]:
+        if inner is not None:
+            model = _embedding_model(inner)
+            if model is not None:
+                return model
+    return None
+
+
+def _elapsed_ms(start: float) -> float:
+    """
+    Get the milliseconds elapsed since a ``perf_counter`` reading.
+    
+    Args:
+        start: The starting ``perf_counter`` value.
+        
+    Returns:
+        The elapsed time in milliseconds.
+    """
+    return (time.perf_counter() - start) * 1000
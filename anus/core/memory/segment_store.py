@@ -0,0 +1,750 @@
+"""
+Segment store memory module for the ANUS framework.
+
+Provides a log-structured persistent memory store: items are appended to a
+small number of segment files instead of one file per item.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+import bisect
+import uuid
+import time
+import json
+import os
+import logging
+import threading
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.query import compile_query
+
+class SegmentMemory(BaseMemory):
+    """
+    Log-structured implementation of the BaseMemory interface.
+    
+    Every write appends one compact JSON record to the active segment file.
+    An in-memory offset index maps each identifier to the segment, offset and
+    length of its latest record, so a read is a single seek. Updates append a
+    new record and deletes append a tombstone; the space held by superseded
+    records is reclaimed by compaction, which rewrites live records into fresh
+    segments. Compaction can run on demand or from a background thread.
+    """
+    
+    SEGMENT_PREFIX = "segment-"
+    SEGMENT_SUFFIX = ".log"
+    
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: bool = False,
+        compaction_threshold: float = 0.5,
+        compaction_interval: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Initialize a SegmentMemory instance.
+        
+        Args:
+            storage_path: Directory for segment files. If None, uses a default location.
+            segment_size: Size in bytes after which the active segment is rolled over.
+            fsync: Whether to fsync the active segment after every write.
+            compaction_threshold: Fraction of dead bytes that triggers background compaction.
+            compaction_interval: Seconds between background compaction checks.
+                If None, compaction only runs when ``compact`` is called.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(**kwargs)
+        
+        # Set storage path
+        if storage_path is None:
+            home_dir = os.path.expanduser("~")
+            storage_path = os.path.join(home_dir, ".anus", "segments")
+        
+        self.storage_path = storage_path
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.compaction_threshold = compaction_threshold
+        self.compaction_interval = compaction_interval
+        
+        os.makedirs(self.storage_path, exist_ok=True)
+        
+        # identifier -> (segment number, offset, length)
+        self.offsets: Dict[str, Tuple[int, int, int]] = {}
+        self.segment_ids: List[int] = []
+        self.live_bytes = 0
+        self.dead_bytes = 0
+        
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._active = None
+        self._active_id = 0
+        self._read_handles: Dict[int, Any] = {}
+        
+        self._load_segments()
+        self._open_active_segment()
+        
+        self._stop_event = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        if compaction_interval:
+            self._compactor = threading.Thread(target=self._compaction_loop, daemon=True)
+            self._compactor.start()
+    
+    def add(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item to memory and return its identifier.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            A string identifier for the added item.
+        """
+        # Generate a unique identifier
+        identifier = str(uuid.uuid4())
+        
+        # Add metadata
+        item_with_metadata = item.copy()
+        item_with_metadata["_meta"] = {
+            "id": identifier,
+            "created_at": time.time(),
+            "updated_at": time.time()
+        }
+        
+        with self._lock:
+            self._append({"op": "put", "id": identifier, "item": item_with_metadata})
+        
+        return identifier
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Append several items with a single flush.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        identifiers = []
+        now = time.time()
+        
+        with self._lock:
+            for item in items:
+                identifier = str(uuid.uuid4())
+                item_with_metadata = item.copy()
+                item_with_metadata["_meta"] = {
+                    "id": identifier,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                self._append({"op": "put", "id": identifier, "item": item_with_metadata}, sync=False)
+                identifiers.append(identifier)
+            
+            self._sync_active()
+        
+        return identifiers
+    
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an item from memory by its identifier.
+        
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        with self._lock:
+            location = self.offsets.get(identifier)
+            if location is None:
+                return None
+            
+            try:
+                return self._read_record(*location)["item"]
+            except Exception as e:
+                logging.error(f"Error loading item {identifier}: {e}")
+                return None
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for items matching the query.
+        
+        Records are read in segment and offset order so the scan is sequential.
+        
+        Args:
+            query: The search query.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items.
+        """
+        query = compile_query(query)
+        
+        results = []
+        
+        with self._lock:
+            locations = sorted(self.offsets.values())
+            
+            for location in locations:
+                try:
+                    record = self._read_record(*location)
+                except Exception as e:
+                    logging.error(f"Error reading record at {location}: {e}")
+                    continue
+                
+                item = record["item"]
+                if self._matches_query(item, query):
+                    results.append({
+                        "id": record["id"],
+                        "item": item,
+                        "created_at": item.get("_meta", {}).get("created_at", 0)
+                    })
+                    
+                    if len(results) >= limit:
+                        break
+        
+        # Sort by creation time (newest first)
+        results.sort(key=lambda x: x["created_at"], reverse=True)
+        
+        return results
+    
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream all items matching the query in identifier order.
+        
+        Identifiers are captured when iteration starts. Each batch is read
+        under the lock in segment and offset order, and items deleted since
+        the stream started are skipped.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of records to read per batch.
+            after: Cursor (identifier) of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        query = compile_query(query)
+        
+        with self._lock:
+            identifiers = sorted(self.offsets)
+        
+        start = bisect.bisect_right(identifiers, after) if after is not None else 0
+        
+        for offset in range(start, len(identifiers), batch_size):
+            records = []
+            
+            with self._lock:
+                locations = [
+                    (self.offsets[identifier], identifier)
+                    for identifier in identifiers[offset:offset + batch_size]
+                    if identifier in self.offsets
+                ]
+                
+                for location, identifier in sorted(locations):
+                    try:
+                        records.append(self._read_record(*location))
+                    except Exception as e:
+                        logging.error(f"Error reading record at {location}: {e}")
+            
+            records.sort(key=lambda record: record["id"])
+            
+            for record in records:
+                item = record["item"]
+                if self._matches_query(item, query):
+                    yield {
+                        "id": record["id"],
+                        "item": item,
+                        "created_at": item.get("_meta", {}).get("created_at", 0),
+                        "cursor": record["id"]
+                    }
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier by appending a new version.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+        """
+        self._put_many([(identifier, item)])
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append a chunk of imported records with a single flush.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        self._put_many([(record["id"], record["item"]) for record in records])
+    
+    def _put_many(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Append new versions of items under caller-chosen identifiers.
+        
+        Metadata carried by the items is kept apart from their identifier and
+        update time.
+        
+        Args:
+            entries: Pairs of (identifier, item) to store.
+        """
+        now = time.time()
+        
+        with self._lock:
+            for identifier, item in entries:
+                item_with_metadata = item.copy()
+                item_with_metadata["_meta"] = dict(item.get("_meta") or {"created_at": now})
+                item_with_metadata["_meta"]["id"] = identifier
+                item_with_metadata["_meta"]["updated_at"] = now
+                self._append({"op": "put", "id": identifier, "item": item_with_metadata}, sync=False)
+            
+            self._sync_active()
+    
+    def update(self, identifier: str, item: Dict[str, Any]) -> bool:
+        """
+        Update an item in memory by appending a new version.
+        
+        Args:
+            identifier: The identifier of the item to update.
+            item: The updated item.
+            
+        Returns:
+            True if the update was successful, False otherwise.
+        """
+        with self._lock:
+            existing_item = self.get(identifier)
+            if existing_item is None:
+                return False
+            
+            # Preserve metadata
+            item_with_metadata = item.copy()
+            item_with_metadata["_meta"] = dict(existing_item.get("_meta", {
+                "id": identifier,
+                "created_at": time.time()
+            }))
+            item_with_metadata["_meta"]["updated_at"] = time.time()
+            
+            self._append({"op": "put", "id": identifier, "item": item_with_metadata})
+        
+        return True
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item from memory by appending a tombstone.
+        
+        Args:
+            identifier: The identifier of the item to delete.
+            
+        Returns:
+            True if the deletion was successful, False otherwise.
+        """
+        with self._lock:
+            if identifier not in self.offsets:
+                return False
+            
+            self._append({"op": "del", "id": identifier})
+        
+        return True
+    
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Append tombstones for several items with a single flush.
+        
+        Args:
+            identifiers: The identifiers of the items to delete.
+            
+        Returns:
+            The number of items that were deleted.
+        """
+        deleted = 0
+        
+        with self._lock:
+            for identifier in identifiers:
+                if identifier in self.offsets:
+                    self._append({"op": "del", "id": identifier}, sync=False)
+                    deleted += 1
+            
+            self._sync_active()
+        
+        return deleted
+    
+    def clear(self) -> None:
+        """
+        Clear all items from memory by removing every segment.
+        """
+        with self._compaction_lock, self._lock:
+            self._close_handles()
+            
+            for segment_id in self.segment_ids:
+                try:
+                    os.remove(self._segment_path(segment_id))
+                except Exception as e:
+                    logging.error(f"Error deleting segment {segment_id}: {e}")
+            
+            self.offsets = {}
+            self.segment_ids = []
+            self.live_bytes = 0
+            self.dead_bytes = 0
+            self._active_id = 0
+            self._open_active_segment()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the memory system.
+        
+        Returns:
+            A dictionary containing memory statistics.
+        """
+        with self._lock:
+            total = self.live_bytes + self.dead_bytes
+            
+            return {
+                "type": "segment",
+                "storage_path": self.storage_path,
+                "item_count": len(self.offsets),
+                "segment_count": len(self.segment_ids),
+                "total_size_bytes": total,
+                "live_bytes": self.live_bytes,
+                "dead_bytes": self.dead_bytes,
+                "garbage_ratio": self.dead_bytes / total if total else 0.0
+            }
+    
+    def compact(self) -> None:
+        """
+        Rewrite all live records into fresh segments and drop the old ones.
+        
+        The active segment is rolled over first, so the old segments no longer
+        change. Live records are then copied out of them without holding the
+        store lock, and reads and writes carry on meanwhile; the lock is only
+        taken again to point the index at the copies and delete the old files.
+        Records updated or deleted during the copy keep their newer version.
+        """
+        with self._compaction_lock:
+            with self._lock:
+                self._sync_active()
+                old_segments = list(self.segment_ids)
+                if not old_segments:
+                    return
+                
+                started = time.time()
+                reclaimed = self.dead_bytes
+                
+                # Live records of the old segments, in log order
+                snapshot = sorted(self.offsets.items(), key=lambda entry: entry[1])
+                
+                # Reserve segment numbers for the copies between the old segments
+                # and the new active one, so replay order stays correct
+                copy_bytes = sum(location[2] for _, location in snapshot)
+                reserved = copy_bytes // self.segment_size + 1
+                first_copy_id = old_segments[-1] + 1
+                
+                self._active.close()
+                self._active_id = first_copy_id + reserved
+                self._open_active_segment()
+            
+            copied = self._copy_records(snapshot, first_copy_id, reserved)
+            
+            with self._lock:
+                for identifier, old_location, new_location in copied:
+                    # Only move records that were not superseded during the copy
+                    if self.offsets.get(identifier) == old_location:
+                        self.offsets[identifier] = new_location
+                
+                for segment_id in old_segments:
+                    handle = self._read_handles.pop(segment_id, None)
+                    if handle is not None:
+                        handle.close()
+                    try:
+                        os.remove(self._segment_path(segment_id))
+                    except Exception as e:
+                        logging.error(f"Error deleting compacted segment {segment_id}: {e}")
+                
+                copy_ids = sorted({location[0] for _, _, location in copied})
+                self.segment_ids = sorted(
+                    [segment_id for segment_id in self.segment_ids if segment_id not in old_segments] + copy_ids
+                )
+                
+                self.live_bytes = sum(location[2] for location in self.offsets.values())
+                total = sum(os.path.getsize(self._segment_path(segment_id)) for segment_id in self.segment_ids)
+                self.dead_bytes = total - self.live_bytes
+            
+            logging.debug(
+                f"Compacted {len(old_segments)} segments, reclaimed {reclaimed} bytes "
+                f"in {time.time() - started:.2f}s"
+            )
+    
+    def _copy_records(
+        self,
+        snapshot: List[Tuple[str, Tuple[int, int, int]]],
+        first_segment_id: int,
+        segment_count: int
+    ) -> List[Tuple[str, Tuple[int, int, int], Tuple[int, int, int]]]:
+        """
+        Copy records from immutable segments into new segments.
+        
+        Runs without the store lock, using its own file handles. The copies are
+        fsynced before they are returned, so the old segments can be deleted.
+        
+        Args:
+            snapshot: Identifiers and locations of the records to copy, in log order.
+            first_segment_id: Number of the first segment to write.
+            segment_count: Number of segment numbers reserved for the copies;
+                the last one takes whatever does not fit in the others.
+            
+        Returns:
+            The identifier, old location and new location of every copied record.
+        """
+        copied = []
+        readers: Dict[int, Any] = {}
+        segment_id = first_segment_id
+        writer = open(self._segment_path(segment_id), "ab")
+        
+        try:
+            for identifier, location in snapshot:
+                reader = readers.get(location[0])
+                if reader is None:
+                    reader = open(self._segment_path(location[0]), "rb")
+                    readers[location[0]] = reader
+                
+                reader.seek(location[1])
+                data = reader.read(location[2])
+                try:
+                    json.loads(data)
+                except ValueError as e:
+                    logging.error(f"Dropping unreadable record for {identifier} during compaction: {e}")
+                    continue
+                
+                if writer.tell() >= self.segment_size and segment_id < first_segment_id + segment_count - 1:
+                    self._finish_copy(writer)
+                    segment_id += 1
+                    writer = open(self._segment_path(segment_id), "ab")
+                
+                offset = writer.tell()
+                writer.write(data)
+                copied.append((identifier, location, (segment_id, offset, len(data))))
+        finally:
+            self._finish_copy(writer)
+            for reader in readers.values():
+                reader.close()
+        
+        return copied
+    
+    def _finish_copy(self, writer: Any) -> None:
+        """
+        Make a compaction output segment durable and close it, or remove it if empty.
+        
+        Args:
+            writer: The open output segment.
+        """
+        writer.flush()
+        os.fsync(writer.fileno())
+        empty = writer.tell() == 0
+        writer.close()
+        
+        if empty:
+            os.remove(writer.name)
+    
+    def flush(self) -> None:
+        """
+        Flush, and if configured fsync, the active segment.
+        """
+        with self._lock:
+            self._sync_active()
+    
+    def close(self) -> None:
+        """
+        Stop background compaction and close all open segment files.
+        """
+        self._stop_event.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        
+        with self._lock:
+            self._sync_active()
+            self._close_handles()
+    
+    def _segment_path(self, segment_id: int) -> str:
+        """
+        Get the file path for a segment.
+        
+        Args:
+            segment_id: The number of the segment.
+            
+        Returns:
+            The file path for the segment.
+        """
+        return os.path.join(self.storage_path, f"{self.SEGMENT_PREFIX}{segment_id:08d}{self.SEGMENT_SUFFIX}")
+    
+    def _load_segments(self) -> None:
+        """
+        Rebuild the offset index by replaying every segment in order.
+        
+        A truncated record at the end of a segment (from a crash mid-write) is
+        cut off so that later appends start on a clean record boundary. A
+        corrupt record anywhere else is skipped and counted as dead, so the
+        records after it are kept.
+        """
+        for file_name in os.listdir(self.storage_path):
+            if file_name.startswith(self.SEGMENT_PREFIX) and file_name.endswith(self.SEGMENT_SUFFIX):
+                number = file_name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    self.segment_ids.append(int(number))
+        
+        self.segment_ids.sort()
+        
+        for segment_id in self.segment_ids:
+            path = self._segment_path(segment_id)
+            offset = 0
+            
+            with open(path, "rb") as f:
+                for line in f:
+                    length = len(line)
+                    
+                    if not line.endswith(b"\n"):
+                        # Only the last line can lack a newline: a partial write
+                        logging.warning(f"Truncating incomplete record at the end of segment {segment_id}, offset {offset}")
+                        break
+                    
+                    try:
+                        record = json.loads(line)
+                        if not isinstance(record, dict) or "id" not in record or "op" not in record:
+                            raise ValueError("not a segment record")
+                    except ValueError as e:
+                        # Compaction drops it together with other dead records
+                        logging.warning(f"Skipping corrupt record in segment {segment_id} at offset {offset}: {e}")
+                        self.dead_bytes += length
+                        offset += length
+                        continue
+                    
+                    self._apply(record, segment_id, offset, length)
+                    offset += length
+            
+            if offset < os.path.getsize(path):
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+        
+        if self.segment_ids:
+            self._active_id = self.segment_ids[-1]
+    
+    def _open_active_segment(self) -> None:
+        """
+        Open the active segment for appending, creating it if needed.
+        """
+        if self._active_id not in self.segment_ids:
+            self.segment_ids.append(self._active_id)
+        
+        self._active = open(self._segment_path(self._active_id), "ab")
+    
+    def _append(self, record: Dict[str, Any], sync: bool = True) -> None:
+        """
+        Append a record to the active segment and apply it to the index.
+        
+        Args:
+            record: The record to append.
+            sync: Whether to honour the fsync setting for this write.
+        """
+        if self._active.tell() >= self.segment_size:
+            self._sync_active()
+            self._active.close()
+            self._active_id += 1
+            self._open_active_segment()
+        
+        data = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        offset = self._active.tell()
+        self._active.write(data)
+        
+        if sync:
+            self._active.flush()
+            if self.fsync:
+                os.fsync(self._active.fileno())
+        
+        self._apply(record, self._active_id, offset, len(data))
+    
+    def _apply(self, record: Dict[str, Any], segment_id: int, offset: int, length: int) -> None:
+        """
+        Apply a record to the offset index and byte counters.
+        
+        Args:
+            record: The record that was written or replayed.
+            segment_id: The segment holding the record.
+            offset: The byte offset of the record within the segment.
+            length: The length of the record in bytes.
+        """
+        identifier = record["id"]
+        previous = self.offsets.pop(identifier, None)
+        if previous is not None:
+            self.live_bytes -= previous[2]
+            self.dead_bytes += previous[2]
+        
+        if record["op"] == "put":
+            self.offsets[identifier] = (segment_id, offset, length)
+            self.live_bytes += length
+        else:
+            # Tombstones only matter until the next compaction
+            self.dead_bytes += length
+    
+    def _read_record(self, segment_id: int, offset: int, length: int) -> Dict[str, Any]:
+        """
+        Read a single record from a segment.
+        
+        Args:
+            segment_id: The segment holding the record.
+            offset: The byte offset of the record.
+            length: The length of the record in bytes.
+            
+        Returns:
+            The decoded record.
+        """
+        if segment_id == self._active_id:
+            self._active.flush()
+        
+        handle = self._read_handles.get(segment_id)
+        if handle is None:
+            handle = open(self._segment_path(segment_id), "rb")
+            self._read_handles[segment_id] = handle
+        
+        handle.seek(offset)
+        return json.loads(handle.read(length))
+    
+    def _sync_active(self) -> None:
+        """
+        Flush, and if configured fsync, the active segment.
+        """
+        if self._active is None or self._active.closed:
+            return
+        
+        self._active.flush()
+        if self.fsync:
+            os.fsync(self._active.fileno())
+    
+    def _close_handles(self) -> None:
+        """
+        Close the active segment and all cached read handles.
+        """
+        if self._active is not None and not self._active.closed:
+            self._active.close()
+        
+        for handle in self._read_handles.values():
+            handle.close()
+        self._read_handles = {}
+    
+    def _compaction_loop(self) -> None:
+        """
+        Periodically compact segments once enough of them is garbage.
+        """
+        while not self._stop_event.wait(self.compaction_interval):
+            with self._lock:
+                total = self.live_bytes + self.dead_bytes
+                should_compact = total > 0 and self.dead_bytes / total >= self.compaction_threshold
+            
+            if should_compact:
+                try:
+                    self.compact()
+                except Exception as e:
+                    logging.error(f"Background segment compaction failed: {e}")
@@ -0,0 +1,548 @@
+"""
+Sharded short-term memory module for the ANUS framework.
+
+Splits short-term memory into independently locked shards so that several
+agents running in threads can use it without a single global lock.
+"""
+
+from typing import Dict, List, Any, Optional, Union, Iterator, Callable
+import heapq
+import threading
+import uuid
+import logging
+import math
+import time
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.dedup import content_hash, content_identifiers
+from anus.core.memory.metrics import MemoryMetrics
+from anus.core.memory.short_term import ShortTermMemory, write_snapshot, read_snapshot, warn_about_capacity
+
+class ShardedShortTermMemory(BaseMemory):
+    """
+    Thread-safe, lock-striped implementation of the BaseMemory interface.
+    
+    Items are routed to one of several ShortTermMemory shards by identifier,
+    and every shard is guarded by its own lock. Operations on a single item
+    only take that item's shard lock, so concurrent agents rarely contend.
+    Capacity and byte budgets are split evenly across shards, which makes
+    eviction approximately rather than globally LRU.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 1000,
+        ttl: int = 3600,
+        shards: int = 8,
+        indexes: Optional[List[str]] = None,
+        max_bytes: Optional[int] = None,
+        deduplicate: bool = False,
+        **kwargs
+    ):
+        """
+        Initialize a ShardedShortTermMemory instance.
+        
+        Args:
+            capacity: Maximum number of items to store across all shards.
+            ttl: Time to live for items in seconds.
+            shards: Number of independently locked shards.
+            indexes: Optional list of top-level or dotted fields to index in every shard.
+            max_bytes: Optional byte budget across all shards.
+            deduplicate: Whether to store identical payloads once. Content-derived
+                identifiers route every copy of a payload to the same shard.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(**kwargs)
+        
+        if shards < 1:
+            raise ValueError("ANUS needs at least one memory shard")
+        
+        self.capacity = capacity
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.deduplicate = deduplicate
+        
+        shard_capacity = max(1, math.ceil(capacity / shards))
+        shard_bytes = math.ceil(max_bytes / shards) if max_bytes is not None else None
+        
+        # Shards would each judge their slice of the capacity, once per shard
+        warn_about_capacity(capacity)
+        
+        self.shards: List[ShortTermMemory] = [
+            ShortTermMemory(
+                capacity=shard_capacity,
+                ttl=ttl,
+                indexes=indexes,
+                max_bytes=shard_bytes,
+                deduplicate=deduplicate,
+                capacity_warnings=False,
+                **kwargs
+            )
+            for _ in range(shards)
+        ]
+        self.locks: List[threading.RLock] = [threading.RLock() for _ in range(shards)]
+        
+        # Latency of whole operations; shards count hits, evictions and bytes
+        self.metrics = MemoryMetrics()
+        
+        logging.info(f"ANUS short-term memory split into {shards} shards for concurrent access")
+    
+    @property
+    def on_evict(self) -> Optional[Callable[[str, Dict[str, Any], str], None]]:
+        """
+        Callback invoked with (identifier, item, cause) after any shard evicts an item.
+        
+        It runs under the evicting shard's lock.
+        """
+        return self.shards[0].on_evict
+    
+    @on_evict.setter
+    def on_evict(self, callback: Optional[Callable[[str, Dict[str, Any], str], None]]) -> None:
+        for shard in self.shards:
+            shard.on_evict = callback
+    
+    def add(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item to memory and return its identifier.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            A string identifier for the added item.
+        """
+        start = time.perf_counter()
+        
+        if self.deduplicate:
+            digest = content_hash(item)
+            for identifier in content_identifiers(digest):
+                index = self._shard_index(identifier)
+                with self.locks[index]:
+                    if self.shards[index]._add_content(identifier, digest, item):
+                        break
+        else:
+            identifier = str(uuid.uuid4())
+            index = self._shard_index(identifier)
+            
+            with self.locks[index]:
+                self.shards[index]._add_with_identifier(identifier, item)
+        
+        self.metrics.observe("add", start)
+        return identifier
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several items, taking each shard lock once.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        if self.deduplicate:
+            return [self.add(item) for item in items]
+        
+        start = time.perf_counter()
+        identifiers = [str(uuid.uuid4()) for _ in items]
+        
+        for index, entries in self._group_by_shard(list(zip(identifiers, items))).items():
+            with self.locks[index]:
+                self.shards[index]._add_many_with_identifiers(entries)
+        
+        self.metrics.observe("add", start)
+        return identifiers
+    
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an item from memory by its identifier.
+        
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        start = time.perf_counter()
+        index = self._shard_index(identifier)
+        
+        with self.locks[index]:
+            item = self.shards[index].get(identifier)
+        
+        self.metrics.observe("get", start)
+        return item
+    
+    def __contains__(self, identifier: str) -> bool:
+        """
+        Check whether an unexpired item is stored, without touching it.
+        
+        Args:
+            identifier: The identifier of the item to look for.
+            
+        Returns:
+            True if the item is in memory, False otherwise.
+        """
+        index = self._shard_index(identifier)
+        
+        with self.locks[index]:
+            return identifier in self.shards[index]
+    
+    def get_many(self, identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several items, taking each shard lock once.
+        
+        Args:
+            identifiers: The identifiers of the items to retrieve.
+            
+        Returns:
+            The retrieved items in input order, with None for missing ones.
+        """
+        start = time.perf_counter()
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        for index, entries in self._group_by_shard([(i, None) for i in identifiers]).items():
+            shard_ids = [identifier for identifier, _ in entries]
+            with self.locks[index]:
+                found.update(zip(shard_ids, self.shards[index].get_many(shard_ids)))
+        
+        self.metrics.observe("get", start)
+        return [found[identifier] for identifier in identifiers]
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search all shards for items matching the query.
+        
+        Shards are searched one at a time, each under its own lock, and the
+        results are merged newest first.
+        
+        Args:
+            query: The search query.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items.
+        """
+        start = time.perf_counter()
+        results = []
+        
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                results.extend(shard.search(query, limit=limit))
+        
+        results.sort(key=lambda x: x["created_at"], reverse=True)
+        
+        self.metrics.observe("search", start)
+        return results[:limit]
+    
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream matches from all shards, merged oldest first.
+        
+        A shard's lock is held only while its stream produces the next result.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of candidates to check per step in each shard.
+            after: Cursor of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        streams = [
+            _locked_iter(shard.iter_search(query, batch_size=batch_size, after=after), lock)
+            for shard, lock in zip(self.shards, self.locks)
+        ]
+        
+        yield from heapq.merge(*streams, key=lambda x: (x["created_at"], x["id"]))
+    
+    def search_similar(self, query: Union[str, List[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search all shards for the items most similar to a query embedding.
+        
+        A text query is embedded once, before any shard lock is taken.
+        
+        Args:
+            query: A query vector, or text to embed with the configured embedding model.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with similarity scores, most similar first.
+        """
+        start = time.perf_counter()
+        results = []
+        
+        # Shards share one configuration, so the first shard's index embeds for all
+        vector_index = self.shards[0].vector_index
+        if vector_index is not None:
+            query = vector_index.embed_query(query)
+            if len(query) == 0:
+                self.metrics.observe("search", start)
+                return []
+        
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                results.extend(shard.search_similar(query, k=k))
+        
+        results.sort(key=lambda x: x["score"], reverse=True)
+        
+        self.metrics.observe("search", start)
+        return results[:k]
+    
+    def search_text(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search all shards for the items that best match a keyword query.
+        
+        Every shard ranks against its own term statistics, so scores are
+        comparable only approximately.
+        
+        Args:
+            query: The keyword query.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with relevance scores, best match first.
+        """
+        start = time.perf_counter()
+        results = []
+        
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                results.extend(shard.search_text(query, k=k))
+        
+        results.sort(key=lambda x: x["score"], reverse=True)
+        
+        self.metrics.observe("search", start)
+        return results[:k]
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+        """
+        index = self._shard_index(identifier)
+        
+        with self.locks[index]:
+            self.shards[index].put(identifier, item)
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store imported records, taking each shard lock once.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        entries = [(record["id"], record) for record in records]
+        
+        for index, shard_entries in self._group_by_shard(entries).items():
+            with self.locks[index]:
+                self.shards[index]._import_chunk([record for _, record in shard_entries])
+    
+    def update(self, identifier: str, item: Dict[str, Any]) -> bool:
+        """
+        Update an item in memory.
+        
+        Args:
+            identifier: The identifier of the item to update.
+            item: The updated item.
+            
+        Returns:
+            True if the update was successful, False otherwise.
+        """
+        index = self._shard_index(identifier)
+        
+        with self.locks[index]:
+            return self.shards[index].update(identifier, item)
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item from memory.
+        
+        Args:
+            identifier: The identifier of the item to delete.
+            
+        Returns:
+            True if the deletion was successful, False otherwise.
+        """
+        index = self._shard_index(identifier)
+        
+        with self.locks[index]:
+            return self.shards[index].delete(identifier)
+    
+    def clear(self) -> None:
+        """
+        Clear all items from memory.
+        """
+        with self._all_locks():
+            for shard in self.shards:
+                shard.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a consistent snapshot of statistics across all shards.
+        
+        All shard locks are held while the statistics are collected, so the
+        totals reflect a single point in time.
+        
+        Returns:
+            A dictionary containing memory statistics.
+        """
+        with self._all_locks():
+            shard_stats = [shard.get_stats() for shard in self.shards]
+            metrics = MemoryMetrics.combine(shard.metrics for shard in self.shards).snapshot()
+        
+        metrics["latency"] = self.metrics.snapshot()["latency"]
+        
+        current_size = sum(stats["current_size"] for stats in shard_stats)
+        bytes_used = sum(stats["bytes_used"] for stats in shard_stats)
+        
+        return {
+            "type": "short_term_sharded",
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+            "shards": len(self.shards),
+            "current_size": current_size,
+            "utilization": current_size / self.capacity if self.capacity > 0 else 0,
+            "bytes_used": bytes_used,
+            "max_bytes": self.max_bytes,
+            "deduplicate": self.deduplicate,
+            "shared_references": sum(stats["shared_references"] for stats in shard_stats),
+            "shard_sizes": [stats["current_size"] for stats in shard_stats],
+            "metrics": metrics
+        }
+    
+    def snapshot(self, path: str) -> int:
+        """
+        Write all live items of every shard to a single snapshot file.
+        
+        All shard locks are held while the snapshot is written, so it reflects
+        a single point in time. The format is the same as ShortTermMemory's,
+        so a snapshot can be restored with a different shard count.
+        
+        Args:
+            path: Path of the snapshot file.
+            
+        Returns:
+            The number of items written.
+        """
+        with self._all_locks():
+            for shard in self.shards:
+                shard._prune_expired()
+            
+            records = (record for shard in self.shards for record in shard._snapshot_records())
+            count = write_snapshot(path, records)
+        
+        logging.info(f"ANUS short-term memory saved {count} items to {path}")
+        return count
+    
+    def restore(self, path: str) -> int:
+        """
+        Replace the contents of every shard with the items in a snapshot file.
+        
+        Args:
+            path: Path of the snapshot file.
+            
+        Returns:
+            The number of items restored.
+            
+        Raises:
+            ValueError: If the file is not a short-term memory snapshot.
+        """
+        records = read_snapshot(path)
+        
+        with self._all_locks():
+            for shard in self.shards:
+                shard.clear()
+            
+            count = 0
+            for index, shard_records in self._group_by_shard(records).items():
+                count += self.shards[index]._restore_records(shard_records)
+        
+        logging.info(f"ANUS short-term memory restored {count} items from {path}")
+        return count
+    
+    def _shard_index(self, identifier: str) -> int:
+        """
+        Map an identifier to the index of the shard that owns it.
+        
+        Args:
+            identifier: The identifier of the item.
+            
+        Returns:
+            The shard index.
+        """
+        try:
+            return uuid.UUID(identifier).int % len(self.shards)
+        except ValueError:
+            return hash(identifier) % len(self.shards)
+    
+    def _group_by_shard(self, entries: List[tuple]) -> Dict[int, List[tuple]]:
+        """
+        Group (identifier, value) pairs by the shard that owns each identifier.
+        
+        Args:
+            entries: Pairs whose first element is an identifier.
+            
+        Returns:
+            A mapping of shard index to the pairs routed to it.
+        """
+        groups: Dict[int, List[tuple]] = {}
+        for entry in entries:
+            groups.setdefault(self._shard_index(entry[0]), []).append(entry)
+        return groups
+    
+    def _all_locks(self) -> "_MultiLock":
+        """
+        Get a context manager that holds every shard lock.
+        
+        Returns:
+            A context manager acquiring the locks in shard order.
+        """
+        return _MultiLock(self.locks)
+
+
+def _locked_iter(iterator: Iterator[Any], lock: threading.RLock) -> Iterator[Any]:
+    """
+    Advance an iterator only while holding a lock.
+    
+    Args:
+        iterator: The iterator to wrap.
+        lock: The lock to hold around each step.
+        
+    Yields:
+        The values produced by the iterator.
+    """
+    while True:
+        with lock:
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+        yield value
+
+
+class _MultiLock:
+    """
+    Context manager that acquires several locks in a fixed order.
+    
+    Always acquiring in shard order prevents deadlocks between concurrent
+    callers that need more than one shard.
+    """
+    
+    def __init__(self, locks: List[threading.RLock]):
+        self.locks = locks
+    
+    def __enter__(self) -> None:
+        for lock in self.locks:
+            lock.acquire()
+    
+    def __exit__(self, *exc_info) -> None:
+        for lock in reversed(self.locks):
+            lock.release()
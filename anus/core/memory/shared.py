@@ -0,0 +1,516 @@
+"""
+Shared short-term memory module for the ANUS framework.
+
+Provides a short-term memory that several worker processes on one host can
+use at the same time, backed by a memory-mapped hash table.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+from contextlib import contextmanager
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.query import compile_query
+
+# File layout: a header, then ``slot_count`` fixed-size slots
+_MAGIC = b"ANUSSHM1"
+_HEADER = struct.Struct("<8sIII")  # magic, slot count, slot size, max probe
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<BxHIdd")  # state, key length, value length, created_at, accessed_at
+
+_EMPTY = 0
+_USED = 1
+
+class SharedShortTermMemory(BaseMemory):
+    """
+    Short-term memory shared between processes through a memory-mapped file.
+    
+    Items live in a fixed-size open-addressing hash table. An identifier
+    hashes to a home slot and may only occupy one of the ``max_probe`` slots
+    that follow it (its window), so every operation on a single item touches
+    a bounded, contiguous range of slots. That range is locked with POSIX
+    record locks on the backing file, so processes only contend when their
+    windows overlap. Threads within one process are serialized by a local
+    lock, because record locks are held per process.
+    
+    Items are stored as compact JSON and must fit in a slot. When a window is
+    full, an expired item is replaced if there is one, otherwise the least
+    recently accessed item in the window is evicted. This approximates LRU
+    without a shared recency list.
+    
+    The backing file outlives the processes; use ``unlink`` to remove it.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 1000,
+        ttl: int = 3600,
+        slot_size: int = 4096,
+        max_probe: int = 16,
+        **kwargs
+    ):
+        """
+        Initialize a SharedShortTermMemory instance, creating or attaching to the table.
+        
+        Args:
+            path: Path of the backing file. Processes using the same path share
+                memory. Defaults to a file in ``/dev/shm`` or the temp directory.
+            capacity: Number of slots. Ignored when attaching to an existing table.
+            ttl: Time to live for items in seconds.
+            slot_size: Size of a slot in bytes, which bounds the size of an item.
+                Ignored when attaching to an existing table.
+            max_probe: Number of slots an identifier may occupy. Ignored when
+                attaching to an existing table.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(**kwargs)
+        
+        if not FCNTL_AVAILABLE:
+            logging.error("Shared short-term memory needs POSIX file locking (fcntl), which is not available.")
+            raise ImportError("fcntl module not available")
+        
+        if path is None:
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            path = os.path.join(directory, "anus-short-term")
+        
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        
+        # Initialize the header under an exclusive lock so concurrent starters agree
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                slot_count = max(1, capacity)
+                max_probe = max(1, min(max_probe, slot_count))
+                os.ftruncate(self._fd, _HEADER_SIZE + slot_count * slot_size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, slot_count, slot_size, max_probe), 0)
+            
+            magic, slot_count, slot_size, max_probe = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+        
+        if magic != _MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"{path} is not a shared short-term memory file")
+        
+        self.capacity = slot_count
+        self.slot_size = slot_size
+        self.max_probe = max_probe
+        self.max_item_bytes = slot_size - _SLOT.size
+        self.map = mmap.mmap(self._fd, _HEADER_SIZE + slot_count * slot_size)
+        
+        logging.info(
+            f"ANUS shared short-term memory attached to {path} "
+            f"({slot_count} slots of {slot_size} bytes)"
+        )
+    
+    def add(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item to memory and return its identifier.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            A string identifier for the added item.
+            
+        Raises:
+            ValueError: If the item does not fit in a slot.
+        """
+        identifier = str(uuid.uuid4())
+        self.put(identifier, item)
+        return identifier
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+            
+        Raises:
+            ValueError: If the item does not fit in a slot.
+        """
+        key, value = self._encode(identifier, item)
+        now = time.time()
+        
+        with self._window(identifier) as slots:
+            victim = self._find(identifier, slots)
+            
+            if victim is None:
+                for slot in slots:
+                    state, _, _, created_at, accessed_at = self._read_header(slot)
+                    
+                    if state == _EMPTY or created_at + self.ttl < now:
+                        victim = slot
+                        break
+                    
+                    # Otherwise evict the least recently accessed item in the window
+                    if victim is None or accessed_at < self._read_header(victim)[4]:
+                        victim = slot
+            
+            self._write_slot(victim, key, value, now, now)
+    
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an item from memory by its identifier.
+        
+        Updates the access time of the item to prevent it from being evicted.
+        
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        with self._window(identifier) as slots:
+            slot = self._find(identifier, slots)
+            if slot is None:
+                return None
+            
+            self._set_accessed_at(slot, time.time())
+            return self._read_item(slot)
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for items matching the query.
+        
+        Scans the table block by block, locking one block of slots at a time.
+        Searching does not count as access.
+        
+        Args:
+            query: The search query.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items, newest first.
+        """
+        matches = compile_query(query)
+        results = []
+        
+        for identifier, created_at, item in self._scan():
+            if matches(item):
+                results.append({
+                    "id": identifier,
+                    "item": item,
+                    "created_at": created_at
+                })
+        
+        # Slots are in hash order, so sort before applying the limit
+        results.sort(key=lambda x: x["created_at"], reverse=True)
+        
+        return results[:limit]
+    
+    def update(self, identifier: str, item: Dict[str, Any]) -> bool:
+        """
+        Update an item in memory.
+        
+        Args:
+            identifier: The identifier of the item to update.
+            item: The updated item.
+            
+        Returns:
+            True if the update was successful, False otherwise.
+            
+        Raises:
+            ValueError: If the item does not fit in a slot.
+        """
+        key, value = self._encode(identifier, item)
+        
+        with self._window(identifier) as slots:
+            slot = self._find(identifier, slots)
+            if slot is None:
+                return False
+            
+            created_at = self._read_header(slot)[3]
+            self._write_slot(slot, key, value, created_at, time.time())
+        
+        return True
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item from memory.
+        
+        Args:
+            identifier: The identifier of the item to delete.
+            
+        Returns:
+            True if the deletion was successful, False otherwise.
+        """
+        with self._window(identifier) as slots:
+            slot = self._find(identifier, slots)
+            if slot is None:
+                return False
+            
+            self._clear_slot(slot)
+        
+        return True
+    
+    def clear(self) -> None:
+        """
+        Clear all items from memory, for every attached process.
+        """
+        with self._lock:
+            start = _HEADER_SIZE
+            length = self.capacity * self.slot_size
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                for slot in range(self.capacity):
+                    self._clear_slot(slot)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the memory system.
+        
+        Returns:
+            A dictionary containing memory statistics.
+        """
+        current_size = 0
+        bytes_used = 0
+        
+        for identifier, _, value_length in self._scan_headers():
+            current_size += 1
+            bytes_used += value_length
+        
+        return {
+            "type": "short_term_shared",
+            "path": self.path,
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+            "current_size": current_size,
+            "utilization": current_size / self.capacity if self.capacity > 0 else 0,
+            "slot_size": self.slot_size,
+            "max_probe": self.max_probe,
+            "bytes_used": bytes_used
+        }
+    
+    def close(self) -> None:
+        """
+        Detach from the shared table. The backing file is kept for other processes.
+        """
+        with self._lock:
+            if self.map.closed:
+                return
+            self.map.close()
+            os.close(self._fd)
+    
+    def unlink(self) -> None:
+        """
+        Detach from the shared table and delete its backing file.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+    
+    @contextmanager
+    def _window(self, identifier: str) -> Iterator[List[int]]:
+        """
+        Lock the probe window of an identifier.
+        
+        The window is locked as one byte range, or two when it wraps around
+        the end of the table, always in ascending file order.
+        
+        Args:
+            identifier: The identifier whose window to lock.
+            
+        Yields:
+            The slot numbers of the window, in probe order.
+        """
+        home = _home_slot(identifier, self.capacity)
+        slots = [(home + i) % self.capacity for i in range(self.max_probe)]
+        
+        first = min(self.max_probe, self.capacity - home)
+        ranges = [(home, first)]
+        if first < self.max_probe:
+            ranges.insert(0, (0, self.max_probe - first))
+        
+        with self._lock:
+            for start, count in ranges:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, count * self.slot_size, self._offset(start))
+            try:
+                yield slots
+            finally:
+                for start, count in reversed(ranges):
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, count * self.slot_size, self._offset(start))
+    
+    def _scan(self, block: int = 256) -> Iterator[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Read every live item, locking one block of slots at a time.
+        
+        Args:
+            block: Number of slots per locked block.
+            
+        Yields:
+            Tuples of (identifier, created_at, item).
+        """
+        now = time.time()
+        
+        for first in range(0, self.capacity, block):
+            count = min(block, self.capacity - first)
+            entries = []
+            
+            with self._lock:
+                fcntl.lockf(self._fd, fcntl.LOCK_SH, count * self.slot_size, self._offset(first))
+                try:
+                    for slot in range(first, first + count):
+                        state, _, _, created_at, _ = self._read_header(slot)
+                        if state == _USED and created_at + self.ttl >= now:
+                            entries.append((self._read_key(slot), created_at, self._read_item(slot)))
+                finally:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, count * self.slot_size, self._offset(first))
+            
+            yield from entries
+    
+    def _scan_headers(self, block: int = 256) -> Iterator[Tuple[str, float, int]]:
+        """
+        Read the headers of every live slot without decoding items.
+        
+        Args:
+            block: Number of slots per locked block.
+            
+        Yields:
+            Tuples of (identifier, created_at, value length).
+        """
+        now = time.time()
+        
+        for first in range(0, self.capacity, block):
+            count = min(block, self.capacity - first)
+            entries = []
+            
+            with self._lock:
+                fcntl.lockf(self._fd, fcntl.LOCK_SH, count * self.slot_size, self._offset(first))
+                try:
+                    for slot in range(first, first + count):
+                        state, _, value_length, created_at, _ = self._read_header(slot)
+                        if state == _USED and created_at + self.ttl >= now:
+                            entries.append((self._read_key(slot), created_at, value_length))
+                finally:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, count * self.slot_size, self._offset(first))
+            
+            yield from entries
+    
+    def _find(self, identifier: str, slots: List[int]) -> Optional[int]:
+        """
+        Find the slot holding a live item within a locked window.
+        
+        Expired items found on the way are cleared.
+        
+        Args:
+            identifier: The identifier to look for.
+            slots: The locked window.
+            
+        Returns:
+            The slot number, or None if the item is not present.
+        """
+        key = identifier.encode("utf-8")
+        now = time.time()
+        
+        for slot in slots:
+            state, key_length, _, created_at, _ = self._read_header(slot)
+            if state != _USED or key_length != len(key):
+                continue
+            
+            if self._read_key(slot).encode("utf-8") != key:
+                continue
+            
+            if created_at + self.ttl < now:
+                self._clear_slot(slot)
+                return None
+            
+            return slot
+        
+        return None
+    
+    def _encode(self, identifier: str, item: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        """
+        Encode an identifier and item for storage, checking that they fit.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to encode.
+            
+        Returns:
+            A tuple of (key bytes, value bytes).
+            
+        Raises:
+            ValueError: If the encoded item does not fit in a slot.
+        """
+        key = identifier.encode("utf-8")
+        value = json.dumps(item, separators=(",", ":")).encode("utf-8")
+        
+        if len(key) + len(value) > self.max_item_bytes:
+            raise ValueError(
+                f"Item of {len(value)} bytes does not fit in a {self.slot_size}-byte shared memory slot"
+            )
+        
+        return key, value
+    
+    def _offset(self, slot: int) -> int:
+        return _HEADER_SIZE + slot * self.slot_size
+    
+    def _read_header(self, slot: int) -> Tuple[int, int, int, float, float]:
+        return _SLOT.unpack_from(self.map, self._offset(slot))
+    
+    def _read_key(self, slot: int) -> str:
+        start = self._offset(slot) + _SLOT.size
+        key_length = self._read_header(slot)[1]
+        return self.map[start:start + key_length].decode("utf-8")
+    
+    def _read_item(self, slot: int) -> Dict[str, Any]:
+        _, key_length, value_length, _, _ = self._read_header(slot)
+        start = self._offset(slot) + _SLOT.size + key_length
+        return json.loads(self.map[start:start + value_length])
+    
+    def _write_slot(self, slot: int, key: bytes, value: bytes, created_at: float, accessed_at: float) -> None:
+        offset = self._offset(slot)
+        start = offset + _SLOT.size
+        self.map[start:start + len(key) + len(value)] = key + value
+        _SLOT.pack_into(self.map, offset, _USED, len(key), len(value), created_at, accessed_at)
+    
+    def _set_accessed_at(self, slot: int, accessed_at: float) -> None:
+        state, key_length, value_length, created_at, _ = self._read_header(slot)
+        _SLOT.pack_into(self.map, self._offset(slot), state, key_length, value_length, created_at, accessed_at)
+    
+    def _clear_slot(self, slot: int) -> None:
+        _SLOT.pack_into(self.map, self._offset(slot), _EMPTY, 0, 0, 0.0, 0.0)
+
+
+def _home_slot(identifier: str, slot_count: int) -> int:
+    """
+    Map an identifier to its home slot.
+    
+    Uses BLAKE2b rather than ``hash``, which is salted differently in every
+    process.
+    
+    Args:
+        identifier: The identifier of the item.
+        slot_count: Number of slots in the table.
+        
+    Returns:
+        The home slot number.
+    """
+    digest = hashlib.blake2b(identifier.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % slot_count
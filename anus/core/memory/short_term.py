@@ -4,14 +4,26 @@ Short-term memory module for the ANUS framework.
 Because even an ANUS needs to remember what it just processed.
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator, Callable
+from collections import OrderedDict
+import bisect
 import uuid
 import time
 import heapq
+import json
 import logging
+import os
 import random
+import struct
+import sys
 
 from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.dedup import content_hash, content_identifiers
+from anus.core.memory.field_index import FieldIndex
+from anus.core.memory.metrics import MemoryMetrics
+from anus.core.memory.query import CompiledQuery, Condition, compile_query
+from anus.core.memory.text_index import TextIndex
+from anus.core.memory.vector_index import VectorIndex
 
 class ShortTermMemory(BaseMemory):
     """
@@ -19,6 +31,10 @@ class ShortTermMemory(BaseMemory):
     
     Provides a volatile memory store with automatic pruning of old items.
     
+    Recency is tracked with an ordered dictionary so that touching, evicting and
+    deleting an item are all O(1). Expiry is driven by a min-heap keyed on the
+    expiration time, so pruning only does work for items that actually expired.
+    
     Just like the human ANUS, it's good at handling recent input but tends to 
     forget older stuff if not regularly refreshed.
     """
@@ -36,6 +52,18 @@ class ShortTermMemory(BaseMemory):
         self, 
         capacity: int = 1000, 
         ttl: int = 3600,  # Time to live in seconds
+        indexes: Optional[List[str]] = None,
+        max_bytes: Optional[int] = None,
+        vector_search: bool = False,
+        embedding_model: Optional[Any] = None,
+        embedding_field: str = "embedding",
+        embedding_text_field: str = "content",
+        deduplicate: bool = False,
+        text_search: bool = False,
+        text_fields: Optional[List[str]] = None,
+        tokenizer: Optional[Any] = None,
+        on_evict: Optional[Callable[[str, Dict[str, Any], str], None]] = None,
+        capacity_warnings: bool = True,
         **kwargs
     ):
         """
@@ -44,6 +72,26 @@ class ShortTermMemory(BaseMemory):
         Args:
             capacity: Maximum number of items to store.
             ttl: Time to live for items in seconds.
+            indexes: Optional list of top-level or dotted fields to maintain hash indexes on.
+            max_bytes: Optional budget for the estimated in-memory footprint of all items.
+                When set, least recently used items are evicted until the budget fits.
+            vector_search: Whether to maintain a vector index for search_similar.
+            embedding_model: Optional BaseModel used to embed item text and text queries.
+            embedding_field: Item key holding a precomputed embedding vector.
+            embedding_text_field: Item key holding the text to embed when no vector is present.
+            deduplicate: Whether to store identical payloads once. Identifiers are
+                then derived from content, adding a duplicate returns the existing
+                identifier, and the item is kept until every reference is deleted.
+            text_search: Whether to maintain an inverted index for search_text.
+            text_fields: Top-level or dotted fields to index for text search.
+                Defaults to ``content``.
+            tokenizer: Optional function splitting text into terms for text search.
+            on_evict: Optional callback invoked with (identifier, item, cause) after an
+                item is evicted, where cause is ``"lru"`` or ``"ttl"``. Explicit
+                deletes and clears do not invoke it.
+            capacity_warnings: Whether to warn about an unusually small or large
+                capacity. Wrappers that split one capacity across several
+                memories check the total instead.
             **kwargs: Additional configuration options.
         """
         super().__init__(**kwargs)
@@ -52,12 +100,32 @@ class ShortTermMemory(BaseMemory):
         self.items: Dict[str, Dict[str, Any]] = {}
         self.access_times: Dict[str, float] = {}
         self.creation_times: Dict[str, float] = {}
-        self.lru_queue: List[tuple] = []  # Priority queue for LRU eviction
+        self.lru_queue: OrderedDict = OrderedDict()  # Recency list, least recently used first
+        self.expiry_heap: List[Tuple[float, str]] = []  # Min-heap of (expires_at, identifier)
+        self.field_index = FieldIndex(indexes)
+        self.max_bytes = max_bytes
+        self.item_sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.vector_index: Optional[VectorIndex] = None
+        self.text_index: Optional[TextIndex] = None
+        self.deduplicate = deduplicate
+        self.content_hashes: Dict[str, str] = {}
+        self.ref_counts: Dict[str, int] = {}
+        self.on_evict = on_evict
+        self.metrics = MemoryMetrics()
+        
+        if vector_search:
+            self.vector_index = VectorIndex(
+                embedding_model=embedding_model,
+                embedding_field=embedding_field,
+                text_field=embedding_text_field
+            )
+        
+        if text_search:
+            self.text_index = TextIndex(text_fields=text_fields or ["content"], tokenizer=tokenizer)
         
-        if capacity < 100:
-            logging.warning(f"ANUS short-term memory capacity of {capacity} is quite small. Performance may suffer.")
-        elif capacity > 10000:
-            logging.warning(f"ANUS short-term memory capacity of {capacity} is unusually large. Hope you have enough RAM!")
+        if capacity_warnings:
+            warn_about_capacity(capacity)
         
         logging.info(f"ANUS short-term memory initialized with capacity for {capacity} items and {ttl}s retention")
     
@@ -65,7 +133,9 @@ class ShortTermMemory(BaseMemory):
         """
         Add an item to memory and return its identifier.
         
-        If the memory is at capacity, the least recently used item will be evicted.
+        If the memory is at capacity or over its byte budget, least recently used
+        items will be evicted. An item larger than the whole budget is kept on
+        its own rather than rejected.
         
         Args:
             item: The item to add to memory.
@@ -73,24 +143,136 @@ class ShortTermMemory(BaseMemory):
         Returns:
             A string identifier for the added item.
         """
+        start = time.perf_counter()
+        
+        if self.deduplicate:
+            digest = content_hash(item)
+            for identifier in content_identifiers(digest):
+                if self._add_content(identifier, digest, item):
+                    break
+        else:
+            # Generate a unique identifier
+            identifier = self._add_with_identifier(str(uuid.uuid4()), item)
+        
+        self.metrics.observe("add", start)
+        return identifier
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several items with a single prune and eviction pass.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        if self.deduplicate:
+            return [self.add(item) for item in items]
+        
+        start = time.perf_counter()
+        identifiers = self._add_many_with_identifiers([(str(uuid.uuid4()), item) for item in items])
+        self.metrics.observe("add", start)
+        return identifiers
+    
+    def _add_with_identifier(self, identifier: str, item: Dict[str, Any]) -> str:
+        """
+        Add an item under a caller-chosen identifier.
+        
+        Used by wrappers that need to know the identifier before the item is
+        stored, such as sharded memory routing identifiers to shards.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to add to memory.
+            
+        Returns:
+            The identifier of the added item.
+        """
+        return self._add_many_with_identifiers([(identifier, item)])[0]
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        The item is stored as newly created and most recently used, whatever
+        its previous state.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+        """
+        if identifier in self.items:
+            self._remove(identifier)
+        
+        self._add_with_identifier(identifier, item)
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store imported records with a single prune and eviction pass.
+        
+        Imported items start a fresh time to live, since exports from
+        long-term memory would otherwise arrive already expired.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        for record in records:
+            if record["id"] in self.items:
+                self._remove(record["id"])
+        
+        self._add_many_with_identifiers([(record["id"], record["item"]) for record in records])
+    
+    def _add_content(self, identifier: str, digest: str, item: Dict[str, Any]) -> bool:
+        """
+        Store an item under a content-derived identifier, or reference the existing copy.
+        
+        Args:
+            identifier: A candidate identifier for the content.
+            digest: The content hash of the item.
+            item: The item to add to memory.
+            
+        Returns:
+            True if the item is now stored under the identifier, False if the
+            identifier is taken by different content.
+        """
         # Prune expired items
         self._prune_expired()
         
-        # Generate a unique identifier
-        identifier = str(uuid.uuid4())
+        if identifier in self.items:
+            if self.content_hashes.get(identifier) != digest:
+                return False
+            
+            self.ref_counts[identifier] += 1
+            self._touch(identifier)
+            return True
+        
+        self._add_many_with_identifiers([(identifier, item)])
+        return True
+    
+    def _add_many_with_identifiers(self, entries: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Add items under caller-chosen identifiers.
+        
+        Expired items are pruned once and limits are enforced once after all
+        items have been inserted.
+        
+        Args:
+            entries: Pairs of (identifier, item) to add.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        # Prune expired items
+        self._prune_expired()
         
-        # Add the item
-        self.items[identifier] = item
         current_time = time.time()
-        self.access_times[identifier] = current_time
-        self.creation_times[identifier] = current_time
         
-        # Add to LRU queue
-        heapq.heappush(self.lru_queue, (current_time, identifier))
+        for identifier, item in entries:
+            self._insert(identifier, item, current_time, current_time)
         
         # Check capacity and evict if necessary
-        if len(self.items) > self.capacity:
-            self._evict_lru()
+        self._enforce_limits()
             
         # 5% chance to log a funny memory message
         if random.random() < 0.05:
@@ -101,7 +283,43 @@ class ShortTermMemory(BaseMemory):
         if capacity_pct > 90:
             logging.warning(f"ANUS short-term memory is {capacity_pct:.1f}% full. Starting to feel tight in here!")
         
-        return identifier
+        return [identifier for identifier, _ in entries]
+    
+    def _insert(
+        self,
+        identifier: str,
+        item: Dict[str, Any],
+        created_at: float,
+        accessed_at: float,
+        ref_count: int = 1
+    ) -> None:
+        """
+        Store an item as the most recently used one, without enforcing limits.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+            created_at: Creation time, which also determines expiry.
+            accessed_at: Last access time.
+            ref_count: Number of adds sharing the item when deduplicating.
+        """
+        # Add the item
+        self.items[identifier] = item
+        self.field_index.add(identifier, item)
+        self._account_size(identifier, item)
+        if self.vector_index is not None:
+            self.vector_index.index_item(identifier, item)
+        if self.text_index is not None:
+            self.text_index.add(identifier, item)
+        self.access_times[identifier] = accessed_at
+        self.creation_times[identifier] = created_at
+        if self.deduplicate:
+            self.content_hashes[identifier] = content_hash(item)
+            self.ref_counts[identifier] = ref_count
+        
+        # Add to the recency list and schedule expiry
+        self.lru_queue[identifier] = None
+        heapq.heappush(self.expiry_heap, (created_at + self.ttl, identifier))
     
     def get(self, identifier: str) -> Optional[Dict[str, Any]]:
         """
@@ -115,26 +333,82 @@ class ShortTermMemory(BaseMemory):
         Returns:
             The retrieved item, or None if not found.
         """
+        start = time.perf_counter()
+        
         # Prune expired items
         self._prune_expired()
         
         # Check if the item exists
         if identifier not in self.items:
             logging.debug(f"ANUS has no recollection of item {identifier[:8]}...")
+            self.metrics.record_lookup(0, 1)
+            self.metrics.observe("get", start)
             return None
         
         # Update access time
-        self.access_times[identifier] = time.time()
+        self._touch(identifier)
+        self.metrics.record_lookup(1)
+        self.metrics.record_bytes(read=self.item_sizes.get(identifier, 0))
+        self.metrics.observe("get", start)
         
         # Return the item
         logging.debug(f"ANUS recalls this item perfectly!")
         return self.items[identifier]
     
+    def __contains__(self, identifier: str) -> bool:
+        """
+        Check whether an unexpired item is stored, without touching it.
+        
+        Args:
+            identifier: The identifier of the item to look for.
+            
+        Returns:
+            True if the item is in memory, False otherwise.
+        """
+        return identifier in self.items and self.creation_times[identifier] + self.ttl >= time.time()
+    
+    def get_many(self, identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several items with a single prune pass.
+        
+        Args:
+            identifiers: The identifiers of the items to retrieve.
+            
+        Returns:
+            The retrieved items in input order, with None for missing ones.
+        """
+        start = time.perf_counter()
+        
+        # Prune expired items
+        self._prune_expired()
+        
+        results = []
+        bytes_read = 0
+        for identifier in identifiers:
+            if identifier in self.items:
+                self._touch(identifier)
+                results.append(self.items[identifier])
+                bytes_read += self.item_sizes.get(identifier, 0)
+            else:
+                results.append(None)
+        
+        hits = len(results) - results.count(None)
+        self.metrics.record_lookup(hits, len(results) - hits)
+        self.metrics.record_bytes(read=bytes_read)
+        self.metrics.observe("get", start)
+        return results
+    
     def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search memory for items matching the query.
         
-        Simple implementation that checks for exact matches on query fields.
+        Dotted keys address nested values. A plain value matches by equality;
+        an operator spec can use ``$eq``, ``$ne``, ``$in``, ``$nin``, the range
+        operators ``$gt``, ``$gte``, ``$lt`` and ``$lte``, ``$prefix``,
+        ``$exists`` and ``$not`` (see ``anus.core.memory.query``). Conditions
+        on ``_meta.created_at`` are checked against creation times. When some
+        ``$eq`` or ``$in`` conditions are on indexed fields, only the
+        intersection of their posting sets is scanned.
         
         Args:
             query: The search query.
@@ -143,6 +417,8 @@ class ShortTermMemory(BaseMemory):
         Returns:
             A list of matching items.
         """
+        start = time.perf_counter()
+        
         # Prune expired items
         self._prune_expired()
         
@@ -150,22 +426,23 @@ class ShortTermMemory(BaseMemory):
         
         results = []
         
-        for identifier, item in self.items.items():
-            # Check if all query fields match
-            is_match = True
-            for key, value in query.items():
-                if key not in item or item[key] != value:
-                    is_match = False
-                    break
-            
-            if is_match:
+        # Narrow the scan using secondary indexes when possible
+        candidates, residual, created = self._plan_query(query)
+        if candidates is None:
+            scan = self.items.keys()
+        else:
+            # Preserve insertion order so results match a full scan
+            scan = sorted(candidates, key=self.creation_times.__getitem__)
+        
+        for identifier in scan:
+            if self._matches_plan(identifier, residual, created):
                 # Update access time
-                self.access_times[identifier] = time.time()
+                self._touch(identifier)
                 
                 # Add to results
                 results.append({
                     "id": identifier,
-                    "item": item,
+                    "item": self.items[identifier],
                     "created_at": self.creation_times[identifier]
                 })
                 
@@ -181,6 +458,120 @@ class ShortTermMemory(BaseMemory):
         else:
             logging.debug(f"ANUS successfully extracted {len(results)} matching items!")
         
+        self.metrics.observe("search", start)
+        return results
+    
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream all items matching the query, oldest first.
+        
+        The set of candidate identifiers is captured when iteration starts;
+        items removed while the stream is consumed are skipped. Streaming does
+        not count as access, so it does not affect LRU order.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of candidates to check per step.
+            after: Cursor of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        # Prune expired items
+        self._prune_expired()
+        
+        candidates, residual, created = self._plan_query(query)
+        identifiers = self.items.keys() if candidates is None else candidates
+        
+        # Creation order is nearly insertion order, so this sort is close to linear
+        ordered = sorted((self.creation_times[identifier], identifier) for identifier in identifiers)
+        
+        start = 0
+        if after is not None:
+            created_at, _, identifier = after.partition("/")
+            start = bisect.bisect_right(ordered, (float(created_at), identifier))
+        
+        for offset in range(start, len(ordered), batch_size):
+            for created_at, identifier in ordered[offset:offset + batch_size]:
+                # Skip items removed since the stream started
+                if self.creation_times.get(identifier) != created_at:
+                    continue
+                
+                if self._matches_plan(identifier, residual, created):
+                    yield {
+                        "id": identifier,
+                        "item": self.items[identifier],
+                        "created_at": created_at,
+                        "cursor": f"{created_at!r}/{identifier}"
+                    }
+    
+    def search_similar(self, query: Union[str, List[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items most similar to a query embedding.
+        
+        Args:
+            query: A query vector, or text to embed with the configured embedding model.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with similarity scores, most similar first.
+        """
+        if self.vector_index is None:
+            raise NotImplementedError("ANUS short-term memory was created without vector_search")
+        
+        start = time.perf_counter()
+        
+        # Prune expired items
+        self._prune_expired()
+        
+        results = []
+        for identifier, score in self.vector_index.query(query, k):
+            self._touch(identifier)
+            results.append({
+                "id": identifier,
+                "item": self.items[identifier],
+                "created_at": self.creation_times[identifier],
+                "score": score
+            })
+        
+        self.metrics.observe("search", start)
+        return results
+    
+    def search_text(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for the items that best match a keyword query, ranked by BM25.
+        
+        Args:
+            query: The keyword query.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with relevance scores, best match first.
+        """
+        if self.text_index is None:
+            raise NotImplementedError("ANUS short-term memory was created without text_search")
+        
+        start = time.perf_counter()
+        
+        # Prune expired items
+        self._prune_expired()
+        
+        results = []
+        for identifier, score in self.text_index.search(query, k):
+            self._touch(identifier)
+            results.append({
+                "id": identifier,
+                "item": self.items[identifier],
+                "created_at": self.creation_times[identifier],
+                "score": score
+            })
+        
+        self.metrics.observe("search", start)
         return results
     
     def update(self, identifier: str, item: Dict[str, Any]) -> bool:
@@ -203,10 +594,23 @@ class ShortTermMemory(BaseMemory):
             return False
         
         # Update the item
+        self.field_index.remove(identifier, self.items[identifier])
         self.items[identifier] = item
+        self.field_index.add(identifier, item)
+        self._account_size(identifier, item)
+        if self.vector_index is not None:
+            self.vector_index.index_item(identifier, item)
+        if self.text_index is not None:
+            self.text_index.add(identifier, item)
+        if self.deduplicate:
+            # Every reference sees the new content
+            self.content_hashes[identifier] = content_hash(item)
         
         # Update access time
-        self.access_times[identifier] = time.time()
+        self._touch(identifier)
+        
+        # A larger payload may push memory over its byte budget
+        self._enforce_limits()
         
         logging.debug(f"ANUS memory successfully updated with fresh content")
         return True
@@ -215,6 +619,9 @@ class ShortTermMemory(BaseMemory):
         """
         Delete an item from memory.
         
+        With deduplication, this drops one reference and the item is only
+        removed once no references are left.
+        
         Args:
             identifier: The identifier of the item to delete.
             
@@ -225,16 +632,38 @@ class ShortTermMemory(BaseMemory):
         if identifier not in self.items:
             return False
         
-        # Delete the item
-        del self.items[identifier]
-        del self.access_times[identifier]
-        del self.creation_times[identifier]
+        if self.ref_counts.get(identifier, 1) > 1:
+            self.ref_counts[identifier] -= 1
+            return True
         
-        # Note: The item will remain in the LRU queue, but will be skipped when it's popped
+        self._remove(identifier)
         
         logging.debug(f"ANUS has purged this item from its memory")
         return True
     
+    def _remove(self, identifier: str) -> None:
+        """
+        Remove an item from all structures, regardless of remaining references.
+        
+        Args:
+            identifier: The identifier of a stored item.
+        """
+        self.field_index.remove(identifier, self.items[identifier])
+        del self.items[identifier]
+        del self.access_times[identifier]
+        del self.creation_times[identifier]
+        self.lru_queue.pop(identifier, None)
+        self.total_bytes -= self.item_sizes.pop(identifier, 0)
+        self.content_hashes.pop(identifier, None)
+        self.ref_counts.pop(identifier, None)
+        if self.vector_index is not None:
+            self.vector_index.remove(identifier)
+        if self.text_index is not None:
+            self.text_index.remove(identifier)
+        
+        # Note: The item will remain in the expiry heap, but will be skipped when it's popped
+        self._compact_expiry_heap()
+    
     def clear(self) -> None:
         """
         Clear all items from memory.
@@ -243,7 +672,17 @@ class ShortTermMemory(BaseMemory):
         self.items = {}
         self.access_times = {}
         self.creation_times = {}
-        self.lru_queue = []
+        self.lru_queue = OrderedDict()
+        self.expiry_heap = []
+        self.field_index.clear()
+        self.item_sizes = {}
+        self.total_bytes = 0
+        self.content_hashes = {}
+        self.ref_counts = {}
+        if self.vector_index is not None:
+            self.vector_index.clear()
+        if self.text_index is not None:
+            self.text_index.clear()
         
         logging.info(f"ANUS memory has been completely flushed of {old_count} items. Fresh and clean!")
     
@@ -272,39 +711,382 @@ class ShortTermMemory(BaseMemory):
             "ttl": self.ttl,
             "current_size": len(self.items),
             "utilization": utilization,
+            "indexes": list(self.field_index.fields),
+            "bytes_used": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "byte_utilization": self.total_bytes / self.max_bytes if self.max_bytes else None,
+            "deduplicate": self.deduplicate,
+            "shared_references": sum(self.ref_counts.values()) - len(self.ref_counts),
+            "metrics": self.metrics.snapshot(),
             "status": status
         }
     
+    def snapshot(self, path: str) -> int:
+        """
+        Write all live items to a binary snapshot file.
+        
+        Creation and access times and reference counts are stored with every
+        item, in LRU order, so a restored memory expires, evicts and releases
+        items exactly as this one would have. The file is written atomically. Items must be JSON
+        serializable; any that are not are skipped with a warning.
+        
+        Args:
+            path: Path of the snapshot file.
+            
+        Returns:
+            The number of items written.
+        """
+        # Prune expired items
+        self._prune_expired()
+        
+        count = write_snapshot(path, self._snapshot_records())
+        logging.info(f"ANUS short-term memory saved {count} items to {path}")
+        return count
+    
+    def restore(self, path: str) -> int:
+        """
+        Replace the contents of memory with the items in a snapshot file.
+        
+        Items that expired since the snapshot was taken are dropped, and
+        capacity and byte limits are applied to the rest, evicting the least
+        recently used first.
+        
+        Args:
+            path: Path of the snapshot file.
+            
+        Returns:
+            The number of items restored.
+            
+        Raises:
+            ValueError: If the file is not a short-term memory snapshot.
+        """
+        records = read_snapshot(path)
+        
+        self.clear()
+        count = self._restore_records(records)
+        
+        logging.info(f"ANUS short-term memory restored {count} items from {path}")
+        return count
+    
+    def _snapshot_records(self) -> Iterator[Tuple[str, float, float, int, Dict[str, Any]]]:
+        """
+        Iterate over live items in LRU order for a snapshot.
+        
+        Yields:
+            Tuples of (identifier, created_at, accessed_at, ref_count, item).
+        """
+        for identifier in self.lru_queue:
+            yield (
+                identifier,
+                self.creation_times[identifier],
+                self.access_times[identifier],
+                self.ref_counts.get(identifier, 1),
+                self.items[identifier]
+            )
+    
+    def _restore_records(self, records: List[Tuple[str, float, float, int, Dict[str, Any]]]) -> int:
+        """
+        Insert snapshot records, keeping their original times and reference counts.
+        
+        Args:
+            records: Tuples of (identifier, created_at, accessed_at, ref_count, item).
+            
+        Returns:
+            The number of items kept after expiry and limits are applied.
+        """
+        current_time = time.time()
+        
+        # Insert least recently used first so the recency list is rebuilt in order
+        for identifier, created_at, accessed_at, ref_count, item in sorted(records, key=lambda r: r[2]):
+            if created_at + self.ttl < current_time:
+                continue
+            
+            self._insert(identifier, item, created_at, accessed_at, ref_count)
+        
+        self._enforce_limits()
+        return len(self.items)
+    
+    def _plan_query(self, query: Dict[str, Any]) -> Tuple[Optional[set], CompiledQuery, List[Condition]]:
+        """
+        Compile a query and choose the indexes that can answer parts of it.
+        
+        Items in short-term memory carry no ``_meta`` field, so conditions on
+        ``_meta.created_at`` are checked against the recorded creation times.
+        
+        Args:
+            query: The search query.
+            
+        Returns:
+            A tuple of (candidate identifiers, or None if no condition is
+            indexed; the residual query to check per item; the conditions on
+            creation time).
+        """
+        compiled = compile_query(query)
+        candidates, answered = self.field_index.plan(compiled.conditions)
+        created = [c for c in compiled.conditions if c.key == "_meta.created_at"]
+        
+        return candidates, compiled.without(answered + created), created
+    
+    def _matches_plan(
+        self,
+        identifier: str,
+        residual: CompiledQuery,
+        created: List[Condition]
+    ) -> bool:
+        """
+        Check a stored item against the parts of a query plan not answered by indexes.
+        
+        Args:
+            identifier: The identifier of the item.
+            residual: The residual query.
+            created: The conditions on creation time.
+            
+        Returns:
+            True if the item matches, False otherwise.
+        """
+        created_at = self.creation_times[identifier]
+        for condition in created:
+            if not condition.test(created_at):
+                return False
+        
+        return residual.matches(self.items[identifier])
+    
+    def _touch(self, identifier: str) -> None:
+        """
+        Mark an item as most recently used.
+        
+        Args:
+            identifier: The identifier of the item that was accessed.
+        """
+        self.access_times[identifier] = time.time()
+        self.lru_queue.move_to_end(identifier)
+    
     def _prune_expired(self) -> None:
         """
         Remove items that have exceeded their time to live.
+        
+        Pops entries off the expiry heap until the earliest one is still alive,
+        so the cost is proportional to the number of expired items.
         """
         current_time = time.time()
-        expired_identifiers = []
+        expired_count = 0
         
-        for identifier, creation_time in self.creation_times.items():
-            if current_time - creation_time > self.ttl:
-                expired_identifiers.append(identifier)
-        
-        if expired_identifiers:
-            for identifier in expired_identifiers:
-                self.delete(identifier)
+        while self.expiry_heap and self.expiry_heap[0][0] < current_time:
+            expires_at, identifier = heapq.heappop(self.expiry_heap)
+            
+            # Skip stale heap entries for items that were already removed, or
+            # removed and stored again under the same content-derived identifier
+            if identifier not in self.items or self.creation_times[identifier] + self.ttl > expires_at:
+                continue
+            
+            item = self.items[identifier]
+            self._remove(identifier)
+            expired_count += 1
             
-            logging.debug(f"ANUS has expelled {len(expired_identifiers)} expired items from memory")
+            if self.on_evict is not None:
+                self.on_evict(identifier, item, "ttl")
+        
+        if expired_count:
+            self.metrics.record_eviction("ttl", expired_count)
+            logging.debug(f"ANUS has expelled {expired_count} expired items from memory")
+    
+    def _compact_expiry_heap(self) -> None:
+        """
+        Drop stale expiry entries once they outnumber the live items.
+        
+        Keeps the heap bounded when many items are deleted or evicted before
+        they get a chance to expire.
+        """
+        if len(self.expiry_heap) <= 2 * len(self.items) + 64:
+            return
+        
+        self.expiry_heap = [entry for entry in self.expiry_heap if entry[1] in self.items]
+        heapq.heapify(self.expiry_heap)
+    
+    def _account_size(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Record the estimated footprint of an item, replacing any previous estimate.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to measure.
+        """
+        size = _estimate_size(item)
+        self.total_bytes += size - self.item_sizes.get(identifier, 0)
+        self.item_sizes[identifier] = size
+        self.metrics.record_bytes(written=size)
+    
+    def _enforce_limits(self) -> None:
+        """
+        Evict least recently used items until both the item capacity and the
+        byte budget are respected. The most recently used item is never evicted.
+        """
+        while len(self.items) > 1 and (
+            len(self.items) > self.capacity
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            self._evict_lru()
     
     def _evict_lru(self) -> None:
         """
         Evict the least recently used item from memory.
         """
-        while self.lru_queue:
-            _, identifier = heapq.heappop(self.lru_queue)
-            
-            # Skip if the item has been deleted
-            if identifier not in self.items:
+        if not self.lru_queue:
+            return
+        
+        identifier = next(iter(self.lru_queue))
+        
+        # Delete the item, including any remaining references to it
+        item = self.items[identifier]
+        item_name = item.get("name", "unknown")
+        self._remove(identifier)
+        self.metrics.record_eviction("lru")
+        logging.debug(f"ANUS had to push out '{item_name}' to make room for new content")
+        
+        if self.on_evict is not None:
+            self.on_evict(identifier, item, "lru")
+
+
+def warn_about_capacity(capacity: int) -> None:
+    """
+    Log a warning if a short-term memory capacity is unusually small or large.
+    
+    Args:
+        capacity: The total number of items the memory can hold.
+    """
+    if capacity < 100:
+        logging.warning(f"ANUS short-term memory capacity of {capacity} is quite small. Performance may suffer.")
+    elif capacity > 10000:
+        logging.warning(f"ANUS short-term memory capacity of {capacity} is unusually large. Hope you have enough RAM!")
+
+
+# Snapshot file layout: a header, then one record per item. Each record is a
+# fixed-size prefix followed by the UTF-8 identifier and the compact JSON item.
+SNAPSHOT_MAGIC = b"ANUSSTM1"
+_SNAPSHOT_HEADER = struct.Struct("<8sdI")  # magic, snapshot time, record count
+_SNAPSHOT_RECORD = struct.Struct("<ddIHI")  # created_at, accessed_at, ref count, id length, item length
+
+
+def write_snapshot(path: str, records: Iterator[Tuple[str, float, float, int, Dict[str, Any]]]) -> int:
+    """
+    Write short-term memory records to a snapshot file atomically.
+    
+    Args:
+        path: Path of the snapshot file.
+        records: Tuples of (identifier, created_at, accessed_at, ref_count, item).
+        
+    Returns:
+        The number of records written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    
+    temp_path = f"{path}.tmp"
+    count = 0
+    skipped = 0
+    
+    with open(temp_path, "wb") as f:
+        # Reserve the header and fill in the count once it is known
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0.0, 0))
+        
+        for identifier, created_at, accessed_at, ref_count, item in records:
+            try:
+                payload = json.dumps(item, separators=(",", ":")).encode("utf-8")
+            except (TypeError, ValueError):
+                skipped += 1
                 continue
             
-            # Delete the item
-            item_name = self.items[identifier].get("name", "unknown")
-            self.delete(identifier)
-            logging.debug(f"ANUS had to push out '{item_name}' to make room for new content")
-            break 
\ No newline at end of file
+            key = identifier.encode("utf-8")
+            f.write(_SNAPSHOT_RECORD.pack(created_at, accessed_at, ref_count, len(key), len(payload)))
+            f.write(key)
+            f.write(payload)
+            count += 1
+        
+        f.seek(0)
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, time.time(), count))
+    
+    os.replace(temp_path, path)
+    
+    if skipped:
+        logging.warning(f"Skipped {skipped} items that are not JSON serializable in snapshot {path}")
+    
+    return count
+
+
+def read_snapshot(path: str) -> List[Tuple[str, float, float, int, Dict[str, Any]]]:
+    """
+    Read the records of a snapshot file.
+    
+    Args:
+        path: Path of the snapshot file.
+        
+    Returns:
+        Tuples of (identifier, created_at, accessed_at, ref_count, item), in file order.
+        
+    Raises:
+        ValueError: If the file is not a short-term memory snapshot or is truncated.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    if len(data) < _SNAPSHOT_HEADER.size:
+        raise ValueError(f"{path} is not a short-term memory snapshot")
+    
+    magic, _, count = _SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a short-term memory snapshot")
+    
+    records = []
+    offset = _SNAPSHOT_HEADER.size
+    
+    for _ in range(count):
+        if offset + _SNAPSHOT_RECORD.size > len(data):
+            raise ValueError(f"Snapshot {path} is truncated")
+        
+        created_at, accessed_at, ref_count, key_length, item_length = _SNAPSHOT_RECORD.unpack_from(data, offset)
+        offset += _SNAPSHOT_RECORD.size
+        
+        end = offset + key_length + item_length
+        if end > len(data):
+            raise ValueError(f"Snapshot {path} is truncated")
+        
+        identifier = data[offset:offset + key_length].decode("utf-8")
+        item = json.loads(data[offset + key_length:end])
+        offset = end
+        
+        records.append((identifier, created_at, accessed_at, ref_count, item))
+    
+    return records
+
+
+def _estimate_size(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Estimate the in-memory footprint of an item in bytes.
+    
+    Walks dicts, lists, tuples and sets recursively and sums ``sys.getsizeof``
+    of every reachable object, counting shared objects only once.
+    
+    Args:
+        obj: The object to measure.
+        seen: Identities of objects already counted.
+        
+    Returns:
+        The estimated size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _estimate_size(key, seen) + _estimate_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += _estimate_size(value, seen)
+    
+    return size
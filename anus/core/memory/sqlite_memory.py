@@ -0,0 +1,633 @@
+"""
+SQLite memory module for the ANUS framework.
+
+Provides a persistent memory store in a single SQLite database file, with
+indexed lookups on top-level and dotted item fields.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+import uuid
+import time
+import json
+import os
+import logging
+import sqlite3
+import threading
+import hashlib
+
+from anus.core.memory.base_memory import BaseMemory
+from anus.core.memory.query import CompiledQuery, Condition, compile_query
+
+class SQLiteMemory(BaseMemory):
+    """
+    SQLite-backed implementation of the BaseMemory interface.
+    
+    Items are stored as JSON text in a single table. Query keys, including
+    dotted paths, are translated into ``json_extract`` expressions, and the
+    paths listed in ``indexed_paths`` get matching expression indexes so that
+    equality lookups on them do not scan the table. Query values that SQLite
+    cannot compare directly (lists and dicts) are checked in Python on the
+    rows returned by the remaining conditions.
+    """
+    
+    # Maximum number of bound parameters per batched lookup
+    BATCH_SIZE = 500
+    
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        indexed_paths: Optional[List[str]] = None,
+        **kwargs
+    ):
+        """
+        Initialize a SQLiteMemory instance.
+        
+        Args:
+            storage_path: Path of the database file. If None, uses a default location.
+            indexed_paths: Top-level or dotted item fields to create expression indexes on.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(**kwargs)
+        
+        # Set storage path
+        if storage_path is None:
+            home_dir = os.path.expanduser("~")
+            storage_path = os.path.join(home_dir, ".anus", "memory.db")
+        
+        self.storage_path = storage_path
+        self.indexed_paths: List[str] = []
+        
+        directory = os.path.dirname(os.path.abspath(self.storage_path))
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(self.storage_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_items_created_at ON items(created_at)")
+        self.connection.commit()
+        
+        for path in indexed_paths or []:
+            self.add_index(path)
+    
+    def add_index(self, path: str) -> None:
+        """
+        Create an expression index on a top-level or dotted item field.
+        
+        Args:
+            path: The field path to index, e.g. ``type`` or ``result.status``.
+        """
+        if path in self.indexed_paths:
+            return
+        
+        # Sanitizing alone maps "a.b" and "a_b" to the same name, so add a path hash
+        index_name = (
+            "idx_path_"
+            + "".join(c if c.isalnum() else "_" for c in path)
+            + "_"
+            + hashlib.sha1(path.encode("utf-8")).hexdigest()[:8]
+        )
+        
+        with self._lock:
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON items({_json_expression(path)})"
+            )
+            self.connection.commit()
+        
+        self.indexed_paths.append(path)
+    
+    def add(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item to memory and return its identifier.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            A string identifier for the added item.
+        """
+        # Generate a unique identifier
+        identifier = str(uuid.uuid4())
+        now = time.time()
+        
+        # Add metadata
+        item_with_metadata = item.copy()
+        item_with_metadata["_meta"] = {
+            "id": identifier,
+            "created_at": now,
+            "updated_at": now
+        }
+        
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO items (id, data, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (identifier, json.dumps(item_with_metadata), now, now)
+            )
+            self.connection.commit()
+        
+        return identifier
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert several items in a single transaction.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The identifiers of the added items, in input order.
+        """
+        now = time.time()
+        rows = []
+        
+        for item in items:
+            identifier = str(uuid.uuid4())
+            item_with_metadata = item.copy()
+            item_with_metadata["_meta"] = {
+                "id": identifier,
+                "created_at": now,
+                "updated_at": now
+            }
+            rows.append((identifier, json.dumps(item_with_metadata), now, now))
+        
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO items (id, data, created_at, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.commit()
+        
+        return [row[0] for row in rows]
+    
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an item from memory by its identifier.
+        
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT data FROM items WHERE id = ?", (identifier,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        try:
+            return json.loads(row[0])
+        except Exception as e:
+            logging.error(f"Error loading item {identifier}: {e}")
+            return None
+    
+    def get_many(self, identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several items with batched ``IN`` queries.
+        
+        Args:
+            identifiers: The identifiers of the items to retrieve.
+            
+        Returns:
+            The retrieved items in input order, with None for missing ones.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        unique = list(dict.fromkeys(identifiers))
+        
+        with self._lock:
+            for start in range(0, len(unique), self.BATCH_SIZE):
+                chunk = unique[start:start + self.BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for identifier, data in self.connection.execute(
+                    f"SELECT id, data FROM items WHERE id IN ({placeholders})", chunk
+                ):
+                    found[identifier] = json.loads(data)
+        
+        return [found.get(identifier) for identifier in identifiers]
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search memory for items matching the query, newest first.
+        
+        Args:
+            query: The search query.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items.
+        """
+        where, params, residual = self._compile_query(query)
+        
+        sql = "SELECT id, data, created_at FROM items"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC"
+        
+        # Only push the limit down when every condition is evaluated by SQLite
+        if not residual:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        results = []
+        
+        with self._lock:
+            cursor = self.connection.execute(sql, params)
+            
+            for identifier, data, created_at in cursor:
+                item = json.loads(data)
+                if residual and not self._matches_query(item, residual):
+                    continue
+                
+                results.append({
+                    "id": identifier,
+                    "item": item,
+                    "created_at": created_at
+                })
+                
+                if len(results) >= limit:
+                    break
+            
+            cursor.close()
+        
+        return results
+    
+    def iter_search(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 100,
+        after: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily stream all items matching the query, oldest first.
+        
+        Uses keyset pagination on ``(created_at, id)``, so each batch is a
+        separate indexed query and no cursor is held open between batches.
+        
+        Args:
+            query: The search query.
+            batch_size: Number of rows to fetch per query.
+            after: Cursor of the last result already seen.
+            
+        Yields:
+            Matching items in the same shape as ``search`` results, plus ``cursor``.
+        """
+        where, params, residual = self._compile_query(query)
+        
+        position: Optional[Tuple[float, str]] = None
+        if after is not None:
+            created_at, _, identifier = after.partition("/")
+            position = (float(created_at), identifier)
+        
+        while True:
+            conditions = list(where)
+            batch_params = list(params)
+            
+            if position is not None:
+                conditions.append("(created_at > ? OR (created_at = ? AND id > ?))")
+                batch_params.extend([position[0], position[0], position[1]])
+            
+            sql = "SELECT id, data, created_at FROM items"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY created_at, id LIMIT ?"
+            batch_params.append(batch_size)
+            
+            with self._lock:
+                rows = self.connection.execute(sql, batch_params).fetchall()
+            
+            for identifier, data, created_at in rows:
+                position = (created_at, identifier)
+                
+                item = json.loads(data)
+                if residual and not self._matches_query(item, residual):
+                    continue
+                
+                yield {
+                    "id": identifier,
+                    "item": item,
+                    "created_at": created_at,
+                    "cursor": f"{created_at!r}/{identifier}"
+                }
+            
+            if len(rows) < batch_size:
+                return
+    
+    def put(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Store an item under a caller-chosen identifier, replacing any existing item.
+        
+        Args:
+            identifier: The identifier to store the item under.
+            item: The item to store.
+        """
+        self._put_many([(identifier, item)])
+    
+    def _import_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store a chunk of imported records in a single transaction.
+        
+        Args:
+            records: Records with ``id``, ``item`` and ``created_at``.
+        """
+        self._put_many([(record["id"], record["item"]) for record in records])
+    
+    def _put_many(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Insert or replace items under caller-chosen identifiers in one transaction.
+        
+        Metadata carried by the items is kept apart from their identifier and
+        update time.
+        
+        Args:
+            entries: Pairs of (identifier, item) to store.
+        """
+        now = time.time()
+        rows = []
+        
+        for identifier, item in entries:
+            item_with_metadata = item.copy()
+            item_with_metadata["_meta"] = dict(item.get("_meta") or {"created_at": now})
+            item_with_metadata["_meta"]["id"] = identifier
+            item_with_metadata["_meta"]["updated_at"] = now
+            created_at = item_with_metadata["_meta"].get("created_at", now)
+            rows.append((identifier, json.dumps(item_with_metadata), created_at, now))
+        
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO items (id, data, created_at, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.commit()
+    
+    def update(self, identifier: str, item: Dict[str, Any]) -> bool:
+        """
+        Update an item in memory.
+        
+        Args:
+            identifier: The identifier of the item to update.
+            item: The updated item.
+            
+        Returns:
+            True if the update was successful, False otherwise.
+        """
+        with self._lock:
+            existing_item = self.get(identifier)
+            if existing_item is None:
+                return False
+            
+            now = time.time()
+            
+            # Preserve metadata
+            item_with_metadata = item.copy()
+            item_with_metadata["_meta"] = dict(existing_item.get("_meta", {
+                "id": identifier,
+                "created_at": now
+            }))
+            item_with_metadata["_meta"]["updated_at"] = now
+            
+            self.connection.execute(
+                "UPDATE items SET data = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(item_with_metadata), now, identifier)
+            )
+            self.connection.commit()
+        
+        return True
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item from memory.
+        
+        Args:
+            identifier: The identifier of the item to delete.
+            
+        Returns:
+            True if the deletion was successful, False otherwise.
+        """
+        with self._lock:
+            cursor = self.connection.execute("DELETE FROM items WHERE id = ?", (identifier,))
+            self.connection.commit()
+        
+        return cursor.rowcount > 0
+    
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Delete several items in a single transaction.
+        
+        Args:
+            identifiers: The identifiers of the items to delete.
+            
+        Returns:
+            The number of items that were deleted.
+        """
+        with self._lock:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "DELETE FROM items WHERE id = ?", [(identifier,) for identifier in identifiers]
+            )
+            self.connection.commit()
+            return self.connection.total_changes - before
+    
+    def clear(self) -> None:
+        """
+        Clear all items from memory.
+        """
+        with self._lock:
+            self.connection.execute("DELETE FROM items")
+            self.connection.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the memory system.
+        
+        Returns:
+            A dictionary containing memory statistics.
+        """
+        with self._lock:
+            item_count = self.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            page_count = self.connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        
+        return {
+            "type": "sqlite",
+            "storage_path": self.storage_path,
+            "item_count": item_count,
+            "total_size_bytes": page_count * page_size,
+            "indexed_paths": list(self.indexed_paths)
+        }
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self.connection.close()
+    
+    def _compile_query(self, query: Dict[str, Any]) -> Tuple[List[str], List[Any], CompiledQuery]:
+        """
+        Translate a query into SQL conditions.
+        
+        Equality, range, ``$in``, ``$prefix`` and ``$exists`` conditions are
+        written against the same ``json_extract`` expressions as the indexes,
+        so SQLite can use an expression index for them. Negations and
+        comparisons SQLite cannot express exactly are left to Python.
+        
+        Args:
+            query: The search query.
+            
+        Returns:
+            A tuple of (SQL conditions, bound parameters, residual query to
+            evaluate in Python).
+        """
+        compiled = compile_query(query)
+        
+        where: List[str] = []
+        params: List[Any] = []
+        handled: List[Condition] = []
+        
+        for condition in compiled.conditions:
+            translated = _condition_sql(condition)
+            if translated is None:
+                continue
+            
+            clause, args, exact = translated
+            where.append(clause)
+            params.extend(args)
+            if exact:
+                handled.append(condition)
+        
+        return where, params, compiled.without(handled)
+
+
+def _condition_sql(condition: Condition) -> Optional[Tuple[str, List[Any], bool]]:
+    """
+    Translate a single query condition into SQL.
+    
+    Args:
+        condition: The compiled condition.
+        
+    Returns:
+        A tuple of (SQL clause, bound parameters, whether the clause is exact
+        so the condition needs no check in Python), or None if the condition
+        is only evaluated in Python.
+    """
+    path = _json_path(condition.key)
+    expression = _json_expression(condition.key)
+    operator, operand = condition.operator, condition.operand
+    
+    if operator == "$eq":
+        if operand is None:
+            return f"json_type(data, '{path}') = 'null'", [], True
+        if isinstance(operand, (str, int, float)):
+            return _typed_membership_sql(path, expression, [operand]), [operand], True
+        # Containers: require presence in SQL, compare in Python
+        return f"json_type(data, '{path}') IS NOT NULL", [], False
+    
+    if operator in ("$gt", "$gte", "$lt", "$lte"):
+        if isinstance(operand, bool):
+            return None
+        if isinstance(operand, (int, float)):
+            types = "('integer', 'real')"
+        elif isinstance(operand, str):
+            types = "('text')"
+        else:
+            return None
+        sql_operator = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}[operator]
+        return f"json_type(data, '{path}') IN {types} AND {expression} {sql_operator} ?", [operand], True
+    
+    if operator == "$in":
+        values = list(operand)
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            return None
+        if not values:
+            return "0", [], True
+        strings = [value for value in values if isinstance(value, str)]
+        numbers = [value for value in values if not isinstance(value, str)]
+        return _typed_membership_sql(path, expression, values), strings + numbers, True
+    
+    if operator == "$prefix":
+        if not operand:
+            return f"json_type(data, '{path}') = 'text'", [], True
+        if ord(operand[-1]) >= 0x10FFFF:
+            return None
+        # Every string starting with the prefix sorts in [prefix, next prefix)
+        upper = operand[:-1] + chr(ord(operand[-1]) + 1)
+        return f"json_type(data, '{path}') = 'text' AND {expression} >= ? AND {expression} < ?", [operand, upper], True
+    
+    if operator == "$exists":
+        return f"json_type(data, '{path}') IS {'NOT ' if operand else ''}NULL", [], True
+    
+    # Negations are rarely selective enough to benefit from an index
+    return None
+
+
+def _typed_membership_sql(path: str, expression: str, values: List[Any]) -> str:
+    """
+    Build a clause matching a field equal to one of several scalar values.
+    
+    ``json_extract`` returns arrays and objects as JSON text and booleans as
+    integers, so each comparison is paired with a ``json_type`` check: strings
+    only match text, and numbers match numbers and booleans, as ``==`` does in
+    Python. Parameters are bound strings first, then numbers.
+    
+    Args:
+        path: The quoted JSON path of the field.
+        expression: The ``json_extract`` expression of the field.
+        values: The strings and numbers to match.
+        
+    Returns:
+        The SQL clause.
+    """
+    clauses = []
+    
+    for types, count in (
+        ("('text')", sum(1 for value in values if isinstance(value, str))),
+        ("('integer', 'real', 'true', 'false')", sum(1 for value in values if not isinstance(value, str)))
+    ):
+        if not count:
+            continue
+        comparison = f"{expression} = ?" if count == 1 else f"{expression} IN ({','.join('?' * count)})"
+        clauses.append(f"(json_type(data, '{path}') IN {types} AND {comparison})")
+    
+    return clauses[0] if len(clauses) == 1 else "(" + " OR ".join(clauses) + ")"
+
+
+def _json_path(key: str) -> str:
+    """
+    Convert a top-level or dotted key into a quoted SQLite JSON path.
+    
+    Every component is quoted so keys containing spaces or punctuation work,
+    and single quotes are doubled so the path can be inlined as a SQL literal.
+    
+    Args:
+        key: The query key.
+        
+    Returns:
+        The JSON path, e.g. ``$."result"."status"``.
+    """
+    parts = [part.replace('"', '\\"') for part in key.split(".")]
+    path = "$." + ".".join(f'"{part}"' for part in parts)
+    return path.replace("'", "''")
+
+
+def _json_expression(key: str) -> str:
+    """
+    Build the ``json_extract`` expression for a key.
+    
+    The path is inlined rather than bound so that the same expression text is
+    used in both index definitions and queries, which is what lets SQLite use
+    the expression indexes.
+    
+    Args:
+        key: The query key.
+        
+    Returns:
+        The SQL expression.
+    """
+    return f"json_extract(data, '{_json_path(key)}')"
@@ -0,0 +1,330 @@
+"""
+Text index module for the ANUS framework.
+
+Provides keyword search over memory items with an inverted index and BM25
+ranking, scored with NumPy over per-term postings arrays.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+from array import array
+import logging
+import math
+import os
+import re
+
+from anus.core.memory.field_index import resolve_path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def default_tokenizer(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+    
+    Args:
+        text: The text to tokenize.
+        
+    Returns:
+        The tokens, in order.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class TextIndex:
+    """
+    Incrementally maintained inverted index with BM25 scoring.
+    
+    Every indexed item gets a document number. Each term maps to a pair of
+    growable typed arrays holding the document numbers containing it and the
+    term frequencies, so a query reads them as NumPy arrays without copying
+    and scores all documents of a term in one vectorized step. Removing or
+    replacing an item tombstones its document number; postings are compacted
+    once tombstones make up half of all documents.
+    """
+    
+    def __init__(
+        self,
+        text_fields: Iterable[str] = ("content",),
+        tokenizer: Optional[Callable[[str], List[str]]] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Initialize a TextIndex instance.
+        
+        Args:
+            text_fields: Top-level or dotted item fields whose text is indexed.
+                String values and lists of strings are indexed.
+            tokenizer: Function splitting text into terms. Defaults to lowercase
+                word tokens. Queries are tokenized with the same function.
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+        """
+        if not NUMPY_AVAILABLE:
+            logging.error("NumPy package not installed. Please install it with 'pip install numpy'.")
+            raise ImportError("NumPy package not installed")
+        
+        self.text_fields = {field: field.split(".") for field in text_fields}
+        self.tokenizer = tokenizer or default_tokenizer
+        self.k1 = k1
+        self.b = b
+        
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_lengths = array("f")
+        self.alive = bytearray()
+        self.docs: Dict[str, int] = {}
+        self.total_length = 0.0
+    
+    def add(self, identifier: str, item: Dict[str, Any]) -> None:
+        """
+        Index an item, replacing any previous version of it.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to index.
+        """
+        self.remove(identifier)
+        
+        terms = self.tokenizer(self._item_text(item))
+        if not terms:
+            return
+        
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        
+        doc = len(self.doc_ids)
+        self.doc_ids.append(identifier)
+        self.doc_lengths.append(len(terms))
+        self.alive.append(1)
+        self.docs[identifier] = doc
+        self.total_length += len(terms)
+        
+        for term, count in frequencies.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("i"), array("f"))
+            posting[0].append(doc)
+            posting[1].append(count)
+    
+    def remove(self, identifier: str) -> None:
+        """
+        Tombstone an item's document.
+        
+        Args:
+            identifier: The identifier of the item.
+        """
+        doc = self.docs.pop(identifier, None)
+        if doc is None:
+            return
+        
+        self.doc_ids[doc] = None
+        self.alive[doc] = 0
+        self.total_length -= self.doc_lengths[doc]
+        
+        if len(self.docs) < len(self.doc_ids) // 2:
+            self._compact()
+    
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank indexed items against a keyword query with BM25.
+        
+        Args:
+            query: The query text.
+            k: Maximum number of results to return.
+            
+        Returns:
+            Pairs of (identifier, score), highest score first.
+        """
+        terms = set(self.tokenizer(query))
+        if not terms or not self.docs or k <= 0:
+            return []
+        
+        doc_count = len(self.docs)
+        average_length = self.total_length / doc_count
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.float32)
+        alive = np.frombuffer(self.alive, dtype=bool)
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            
+            docs = np.frombuffer(posting[0], dtype=np.int32)
+            frequencies = np.frombuffer(posting[1], dtype=np.float32)
+            live = alive[docs]
+            docs, frequencies = docs[live], frequencies[live]
+            if docs.size == 0:
+                continue
+            
+            idf = math.log(1 + (doc_count - docs.size + 0.5) / (docs.size + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+            
+            # Documents appear at most once per term, so plain fancy-index add is safe
+            scores[docs] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+        
+        matched = np.flatnonzero(scores)
+        if matched.size == 0:
+            return []
+        
+        if matched.size > k:
+            top = np.argpartition(-scores[matched], k - 1)[:k]
+            matched = matched[top]
+        
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        
+        return [(self.doc_ids[doc], float(scores[doc])) for doc in matched]
+    
+    def clear(self) -> None:
+        """
+        Remove all documents.
+        """
+        self.postings = {}
+        self.doc_ids = []
+        self.doc_lengths = array("f")
+        self.alive = bytearray()
+        self.docs = {}
+        self.total_length = 0.0
+    
+    def save(self, path: str, fingerprints: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Persist the postings to a NumPy archive, written atomically.
+        
+        Args:
+            path: Path of the archive file.
+            fingerprints: Mapping of identifier to (mtime_ns, size) of the item's
+                source, used to detect stale documents on load. Documents
+                without a fingerprint are not saved.
+        """
+        self._compact()
+        
+        keep = np.array([doc_id in fingerprints for doc_id in self.doc_ids], dtype=bool)
+        terms = sorted(self.postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        flat_docs = []
+        flat_frequencies = []
+        
+        for position, term in enumerate(terms):
+            docs = np.frombuffer(self.postings[term][0], dtype=np.int32)
+            frequencies = np.frombuffer(self.postings[term][1], dtype=np.float32)
+            mask = keep[docs]
+            flat_docs.append(docs[mask])
+            flat_frequencies.append(frequencies[mask])
+            offsets[position + 1] = offsets[position] + int(mask.sum())
+        
+        doc_ids = [doc_id if keep[doc] else "" for doc, doc_id in enumerate(self.doc_ids)]
+        stamps = np.array([fingerprints.get(doc_id, (0, 0)) for doc_id in doc_ids], dtype=np.int64).reshape(-1, 2)
+        
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                terms=np.array(terms, dtype=str),
+                offsets=offsets,
+                docs=np.concatenate(flat_docs) if flat_docs else np.zeros(0, dtype=np.int32),
+                frequencies=np.concatenate(flat_frequencies) if flat_frequencies else np.zeros(0, dtype=np.float32),
+                doc_ids=np.array(doc_ids, dtype=str),
+                doc_lengths=np.frombuffer(self.doc_lengths, dtype=np.float32),
+                fingerprints=stamps
+            )
+        os.replace(temp_path, path)
+    
+    def load(self, path: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Replace the index contents with a persisted archive.
+        
+        Args:
+            path: Path of the archive file.
+            
+        Returns:
+            Mapping of identifier to the (mtime_ns, size) fingerprint it was saved with.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            terms = data["terms"].tolist()
+            offsets = data["offsets"]
+            docs = data["docs"].astype(np.int32)
+            frequencies = data["frequencies"].astype(np.float32)
+            doc_ids = data["doc_ids"].tolist()
+            doc_lengths = data["doc_lengths"].astype(np.float32)
+            stamps = data["fingerprints"]
+        
+        self.clear()
+        
+        self.doc_ids = [doc_id or None for doc_id in doc_ids]
+        self.doc_lengths = array("f", doc_lengths.tobytes())
+        self.alive = bytearray(doc_id is not None for doc_id in self.doc_ids)
+        self.docs = {doc_id: doc for doc, doc_id in enumerate(self.doc_ids) if doc_id is not None}
+        self.total_length = float(sum(self.doc_lengths[doc] for doc in self.docs.values()))
+        
+        for position, term in enumerate(terms):
+            start, end = int(offsets[position]), int(offsets[position + 1])
+            if start == end:
+                continue
+            self.postings[term] = (array("i", docs[start:end].tobytes()), array("f", frequencies[start:end].tobytes()))
+        
+        return {
+            doc_id: (int(stamps[doc][0]), int(stamps[doc][1]))
+            for doc_id, doc in self.docs.items()
+        }
+    
+    def __len__(self) -> int:
+        return len(self.docs)
+    
+    def _item_text(self, item: Dict[str, Any]) -> str:
+        """
+        Collect the indexed text of an item.
+        
+        Args:
+            item: The item to read.
+            
+        Returns:
+            The text of all indexed fields, separated by newlines.
+        """
+        if not isinstance(item, dict):
+            return ""
+        
+        parts = []
+        for field_parts in self.text_fields.values():
+            value = resolve_path(item, field_parts)
+            if isinstance(value, str):
+                parts.append(value)
+            elif isinstance(value, list):
+                parts.extend(entry for entry in value if isinstance(entry, str))
+        
+        return "\n".join(parts)
+    
+    def _compact(self) -> None:
+        """
+        Drop tombstoned documents and renumber the rest.
+        """
+        if len(self.docs) == len(self.doc_ids):
+            return
+        
+        remap = np.full(len(self.doc_ids), -1, dtype=np.int32)
+        live = [doc for doc, doc_id in enumerate(self.doc_ids) if doc_id is not None]
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        
+        postings = {}
+        for term, (docs, frequencies) in self.postings.items():
+            new_docs = remap[np.frombuffer(docs, dtype=np.int32)]
+            keep = new_docs >= 0
+            if not keep.any():
+                continue
+            postings[term] = (
+                array("i", new_docs[keep].tobytes()),
+                array("f", np.frombuffer(frequencies, dtype=np.float32)[keep].tobytes())
+            )
+        
+        self.postings = postings
+        self.doc_ids = [self.doc_ids[doc] for doc in live]
+        self.doc_lengths = array("f", (self.doc_lengths[doc] for doc in live))
+        self.alive = bytearray(b"\x01" * len(live))
+        self.docs = {doc_id: doc for doc, doc_id in enumerate(self.doc_ids)}
@@ -0,0 +1,468 @@
+"""
+Tiered memory module for the ANUS framework.
+
+Combines a fast short-term memory with a persistent long-term memory behind a
+single interface, moving items between them by access frequency.
+"""
+
+from typing import Dict, List, Any, Optional, Union, Callable, Iterator
+import logging
+import threading
+import time
+import uuid
+
+from anus.core.memory.base_memory import BaseMemory
+
+class TieredMemory(BaseMemory):
+    """
+    Two-tier memory facade over a hot and a cold memory system.
+    
+    New items and updates go to the hot tier only and reach the cold tier
+    when the hot tier evicts them (write-back), or on ``flush``. Reads that
+    miss the hot tier are served from the cold tier and, once an item has
+    been read often enough, promoted into the hot tier (read-through). Items
+    keep the same identifier in both tiers.
+    
+    The hot tier must report evictions through an ``on_evict`` callback and
+    answer ``identifier in hot`` without touching the item, as
+    ShortTermMemory and ShardedShortTermMemory do, and the cold tier must
+    support ``put``. Items promoted from the cold tier and not changed since
+    are not written back again.
+    
+    Access frequency is counted per item and halved every ``frequency_window``
+    seconds, so counts reflect recent use.
+    """
+    
+    def __init__(
+        self,
+        hot: BaseMemory,
+        cold: BaseMemory,
+        promote_after: int = 1,
+        demote_below: int = 0,
+        frequency_window: float = 300.0,
+        **kwargs
+    ):
+        """
+        Initialize a TieredMemory instance.
+        
+        Args:
+            hot: The fast tier, usually short-term memory.
+            cold: The persistent tier, usually long-term memory.
+            promote_after: Recent access count, counting adds and reads, at which
+                a cold-tier read promotes the item into the hot tier. 1 promotes
+                on every cold read.
+            demote_below: Recent access count below which ``rebalance`` moves a
+                hot item to the cold tier. 0 leaves demotion to hot-tier eviction.
+            frequency_window: Seconds after which access counts are halved.
+            **kwargs: Additional configuration options.
+        """
+        super().__init__(**kwargs)
+        
+        if not hasattr(hot, "on_evict"):
+            raise ValueError(f"{type(hot).__name__} does not report evictions and cannot be a hot tier")
+        
+        self.hot = hot
+        self.cold = cold
+        self.promote_after = max(1, promote_after)
+        self.demote_below = demote_below
+        self.frequency_window = frequency_window
+        
+        self._lock = threading.RLock()
+        self.frequencies: Dict[str, int] = {}
+        self.window_started = time.time()
+        
+        # Hot items whose cold copy is current, so eviction can skip the write.
+        # Evictions can run on other threads without the facade lock, so this
+        # set and the write-back counters have their own lock.
+        self.clean: set = set()
+        self._clean_lock = threading.Lock()
+        
+        self.hot_hits = 0
+        self.cold_hits = 0
+        self.misses = 0
+        self.promotions = 0
+        self.demotions = 0
+        self.write_backs = 0
+        self.evictions_written_back = 0
+        
+        self._previous_on_evict: Optional[Callable[[str, Dict[str, Any], str], None]] = hot.on_evict
+        hot.on_evict = self._on_evict
+        
+        logging.info(f"ANUS tiered memory initialized over {type(hot).__name__} and {type(cold).__name__}")
+    
+    def add(self, item: Dict[str, Any]) -> str:
+        """
+        Add an item to the hot tier and return its identifier.
+        
+        Args:
+            item: The item to add to memory.
+            
+        Returns:
+            A string identifier for the added item.
+        """
+        identifier = str(uuid.uuid4())
+        
+        with self._lock:
+            self.hot.put(identifier, item)
+            self._record_access(identifier)
+        
+        return identifier
+    
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an item, reading through to the cold tier on a hot miss.
+        
+        Args:
+            identifier: The identifier of the item to retrieve.
+            
+        Returns:
+            The retrieved item, or None if not found.
+        """
+        with self._lock:
+            frequency = self._record_access(identifier)
+            
+            item = self.hot.get(identifier)
+            if item is not None:
+                self.hot_hits += 1
+                return item
+            
+            item = self.cold.get(identifier)
+            if item is None:
+                self.misses += 1
+                self.frequencies.pop(identifier, None)
+                return None
+            
+            self.cold_hits += 1
+            
+            if frequency >= self.promote_after:
+                self.hot.put(identifier, item)
+                with self._clean_lock:
+                    self.clean.add(identifier)
+                self.promotions += 1
+            
+            return item
+    
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search both tiers, preferring hot copies of items present in both.
+        
+        Searching does not count as access and never promotes items.
+        
+        Args:
+            query: The search query.
+            limit: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items, newest first.
+        """
+        with self._lock:
+            results = self.hot.search(query, limit=limit)
+            
+            # Cold copies of hot items may be stale, so skip them and fetch
+            # more only while skipped copies leave the page short
+            fetch = 2 * limit
+            while True:
+                cold_results = self.cold.search(query, limit=fetch)
+                fresh = [result for result in cold_results if result["id"] not in self.hot]
+                if len(fresh) >= limit or len(cold_results) < fetch:
+                    break
+                fetch *= 2
+            
+            results.extend(fresh[:limit])
+        
+        results.sort(key=lambda x: x.get("created_at", 0), reverse=True)
+        
+        return results[:limit]
+    
+    def search_similar(self, query: Union[str, List[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search both tiers for the items most similar to a query embedding.
+        
+        Args:
+            query: A query vector, or text to embed with the tiers' embedding models.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with their cosine similarity as ``score``,
+            most similar first.
+            
+        Raises:
+            NotImplementedError: If neither tier has a vector index.
+        """
+        return self._ranked_search("search_similar", query, k)
+    
+    def search_text(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search both tiers for the items best matching a keyword query.
+        
+        Args:
+            query: The query text.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of matching items with their BM25 relevance as ``score``,
+            best match first.
+            
+        Raises:
+            NotImplementedError: If neither tier has a text index.
+        """
+        return self._ranked_search("search_text", query, k)
+    
+    def update(self, identifier: str, item: Dict[str, Any]) -> bool:
+        """
+        Update an item in whichever tier holds it.
+        
+        Updates to hot items are written back to the cold tier on eviction.
+        
+        Args:
+            identifier: The identifier of the item to update.
+            item: The updated item.
+            
+        Returns:
+            True if the update was successful, False otherwise.
+        """
+        with self._lock:
+            if self.hot.update(identifier, item):
+                with self._clean_lock:
+                    self.clean.discard(identifier)
+                return True
+            
+            return self.cold.update(identifier, item)
+    
+    def delete(self, identifier: str) -> bool:
+        """
+        Delete an item from both tiers.
+        
+        Args:
+            identifier: The identifier of the item to delete.
+            
+        Returns:
+            True if the item was deleted from either tier, False otherwise.
+        """
+        with self._lock:
+            deleted_hot = self.hot.delete(identifier)
+            deleted_cold = self.cold.delete(identifier)
+            with self._clean_lock:
+                self.clean.discard(identifier)
+            self.frequencies.pop(identifier, None)
+        
+        return deleted_hot or deleted_cold
+    
+    def clear(self) -> None:
+        """
+        Clear all items from both tiers and reset the statistics.
+        """
+        with self._lock:
+            self.hot.clear()
+            self.cold.clear()
+            self.frequencies.clear()
+            self.hot_hits = self.cold_hits = self.misses = 0
+            self.promotions = self.demotions = 0
+            with self._clean_lock:
+                self.clean.clear()
+                self.write_backs = self.evictions_written_back = 0
+    
+    def rebalance(self) -> int:
+        """
+        Move rarely accessed items from the hot tier to the cold tier.
+        
+        Items whose recent access count is below ``demote_below`` are written
+        back if needed and removed from the hot tier.
+        
+        Returns:
+            The number of demoted items.
+        """
+        if self.demote_below <= 0:
+            return 0
+        
+        demoted = 0
+        
+        with self._lock:
+            self._age_frequencies()
+            
+            for identifier in list(self._hot_identifiers()):
+                if self.frequencies.get(identifier, 0) >= self.demote_below:
+                    continue
+                
+                item = self.hot.get(identifier)
+                if item is None:
+                    continue
+                
+                self._write_back(identifier, item)
+                self.hot.delete(identifier)
+                self.demotions += 1
+                demoted += 1
+        
+        if demoted:
+            logging.debug(f"ANUS demoted {demoted} rarely used items to long-term memory")
+        
+        return demoted
+    
+    def flush(self) -> None:
+        """
+        Write every changed hot item back to the cold tier without evicting it.
+        """
+        with self._lock:
+            for result in list(self.hot.iter_search({})):
+                self._write_back(result["id"], result["item"])
+                with self._clean_lock:
+                    self.clean.add(result["id"])
+            
+            self.hot.flush()
+            self.cold.flush()
+    
+    def close(self) -> None:
+        """
+        Write back changed hot items and close both tiers.
+        """
+        self.flush()
+        self.hot.close()
+        self.cold.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the memory system, including per-tier hit ratios.
+        
+        Returns:
+            A dictionary containing memory statistics.
+        """
+        lookups = self.hot_hits + self.cold_hits + self.misses
+        
+        return {
+            "type": "tiered",
+            "hot": self.hot.get_stats(),
+            "cold": self.cold.get_stats(),
+            "lookups": lookups,
+            "hot_hits": self.hot_hits,
+            "cold_hits": self.cold_hits,
+            "misses": self.misses,
+            "hot_hit_ratio": self.hot_hits / lookups if lookups else 0.0,
+            "cold_hit_ratio": self.cold_hits / lookups if lookups else 0.0,
+            "hit_ratio": (self.hot_hits + self.cold_hits) / lookups if lookups else 0.0,
+            "promotions": self.promotions,
+            "demotions": self.demotions,
+            "write_backs": self.write_backs,
+            "evictions_written_back": self.evictions_written_back,
+            "promote_after": self.promote_after,
+            "demote_below": self.demote_below
+        }
+    
+    def _on_evict(self, identifier: str, item: Dict[str, Any], cause: str) -> None:
+        """
+        Write an item evicted by the hot tier back to the cold tier.
+        
+        Runs inside the hot tier, possibly under its locks, so it only touches
+        the cold tier and does not take the facade lock.
+        
+        Args:
+            identifier: The identifier of the evicted item.
+            item: The evicted item.
+            cause: Why the item was evicted, ``"lru"`` or ``"ttl"``.
+        """
+        self._write_back(identifier, item, eviction=True)
+        
+        if self._previous_on_evict is not None:
+            self._previous_on_evict(identifier, item, cause)
+    
+    def _write_back(self, identifier: str, item: Dict[str, Any], eviction: bool = False) -> None:
+        """
+        Store a hot item in the cold tier unless its cold copy is current.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The hot copy of the item.
+            eviction: Whether the hot tier is evicting the item.
+        """
+        with self._clean_lock:
+            if identifier in self.clean:
+                self.clean.discard(identifier)
+                return
+        
+        self.cold.put(identifier, item)
+        
+        with self._clean_lock:
+            self.write_backs += 1
+            if eviction:
+                self.evictions_written_back += 1
+    
+    def _record_access(self, identifier: str) -> int:
+        """
+        Count an access to an item.
+        
+        Args:
+            identifier: The identifier of the accessed item.
+            
+        Returns:
+            The item's recent access count, including this access.
+        """
+        self._age_frequencies()
+        frequency = self.frequencies.get(identifier, 0) + 1
+        self.frequencies[identifier] = frequency
+        return frequency
+    
+    def _age_frequencies(self) -> None:
+        """
+        Halve all access counts once per elapsed frequency window, dropping zeros.
+        """
+        now = time.time()
+        windows = int((now - self.window_started) // self.frequency_window) if self.frequency_window > 0 else 0
+        if windows <= 0:
+            return
+        
+        self.window_started += windows * self.frequency_window
+        self.frequencies = {
+            identifier: count >> windows
+            for identifier, count in self.frequencies.items()
+            if count >> windows
+        }
+    
+    def _hot_identifiers(self) -> Iterator[str]:
+        """
+        List the identifiers of the items in the hot tier without touching them.
+        
+        Yields:
+            Identifiers of hot items.
+        """
+        for result in self.hot.iter_search({}):
+            yield result["id"]
+    
+    def _ranked_search(self, method: str, query: Any, k: int) -> List[Dict[str, Any]]:
+        """
+        Run a scored search on both tiers and merge the results by score.
+        
+        Args:
+            method: Name of the search method, ``search_text`` or ``search_similar``.
+            query: The query passed to each tier.
+            k: Maximum number of results to return.
+            
+        Returns:
+            The merged results, best first, with hot copies preferred.
+            
+        Raises:
+            NotImplementedError: If neither tier supports the search.
+        """
+        results = []
+        supported = False
+        
+        with self._lock:
+            try:
+                results.extend(getattr(self.hot, method)(query, k=k))
+                supported = True
+            except NotImplementedError:
+                pass
+            
+            try:
+                cold_results = getattr(self.cold, method)(query, k=k)
+                supported = True
+            except NotImplementedError:
+                cold_results = []
+            
+            # Cold copies of hot items may be stale
+            results.extend(result for result in cold_results if result["id"] not in self.hot)
+        
+        if not supported:
+            raise NotImplementedError(f"Neither memory tier supports {method}")
+        
+        results.sort(key=lambda x: x["score"], reverse=True)
+        
+        return results[:k]
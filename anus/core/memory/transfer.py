@@ -0,0 +1,193 @@
+"""
+Transfer module for the ANUS framework.
+
+Reads and writes the JSON-lines format used to export memory from one store
+and import it into another, optionally gzip compressed.
+
+The first line is a header naming the format, version and source store.
+Every following line is one item record with its ``id``, ``item`` and
+``created_at``.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Callable, BinaryIO
+import gzip
+import io
+import json
+import time
+
+EXPORT_FORMAT = "anus-memory"
+EXPORT_VERSION = 1
+EXPORT_COMPRESSION = (None, "gzip")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def write_export(
+    fp: BinaryIO,
+    records: Iterable[Dict[str, Any]],
+    source: str,
+    compression: Optional[str] = None,
+    chunk_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Stream item records to a binary file object.
+    
+    Lines are encoded and written one chunk at a time, so memory use is
+    bounded by the chunk size whatever the number of records.
+    
+    Args:
+        fp: A binary file object opened for writing.
+        records: Records with ``id``, ``item`` and ``created_at``, e.g. from ``iter_search``.
+        source: Name of the exporting store, recorded in the header.
+        compression: None for plain JSON lines, or ``gzip``.
+        chunk_size: Number of records encoded per write.
+        progress: Optional callback invoked with the running record count after each chunk.
+        
+    Returns:
+        The number of records written.
+    """
+    if compression not in EXPORT_COMPRESSION:
+        raise ValueError(f"Unknown export compression '{compression}'. Expected one of {EXPORT_COMPRESSION}")
+    
+    stream = gzip.GzipFile(fileobj=fp, mode="wb") if compression == "gzip" else fp
+    header = {"format": EXPORT_FORMAT, "version": EXPORT_VERSION, "source": source, "exported_at": time.time()}
+    stream.write(json.dumps(header).encode("utf-8") + b"\n")
+    
+    count = 0
+    chunk: List[bytes] = []
+    
+    for record in records:
+        chunk.append(json.dumps({
+            "id": record["id"],
+            "item": record["item"],
+            "created_at": record.get("created_at")
+        }, separators=(",", ":")).encode("utf-8"))
+        
+        if len(chunk) >= chunk_size:
+            count += _write_chunk(stream, chunk, count, progress)
+            chunk = []
+    
+    if chunk:
+        count += _write_chunk(stream, chunk, count, progress)
+    
+    if stream is not fp:
+        stream.close()
+    fp.flush()
+    
+    return count
+
+
+def read_export(fp: BinaryIO, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream item records from an export, detecting gzip compression.
+    
+    Args:
+        fp: A binary file object opened for reading.
+        chunk_size: Number of records per yielded chunk.
+        
+    Yields:
+        Lists of records with ``id``, ``item`` and ``created_at``.
+        
+    Raises:
+        ValueError: If the stream is not a supported export.
+    """
+    prefix = fp.read(len(_GZIP_MAGIC))
+    stream = io.BufferedReader(_PrefixedReader(prefix, fp))
+    if prefix == _GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    
+    header = _parse_line(stream.readline(), 1)
+    if header.get("format") != EXPORT_FORMAT:
+        raise ValueError("Not an ANUS memory export")
+    if header.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Unsupported memory export version {header.get('version')}")
+    
+    chunk: List[Dict[str, Any]] = []
+    
+    for line_number, line in enumerate(stream, start=2):
+        if not line.strip():
+            continue
+        
+        record = _parse_line(line, line_number)
+        if "id" not in record or not isinstance(record.get("item"), dict):
+            raise ValueError(f"Malformed memory export record on line {line_number}")
+        
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    
+    if chunk:
+        yield chunk
+
+
+def _write_chunk(stream: BinaryIO, chunk: List[bytes], written: int, progress: Optional[Callable[[int], None]]) -> int:
+    """
+    Write encoded lines and report progress.
+    
+    Args:
+        stream: The output stream.
+        chunk: Encoded records without line endings.
+        written: Records written before this chunk.
+        progress: Optional progress callback.
+        
+    Returns:
+        The number of records in the chunk.
+    """
+    stream.write(b"\n".join(chunk) + b"\n")
+    if progress is not None:
+        progress(written + len(chunk))
+    return len(chunk)
+
+
+def _parse_line(line: bytes, line_number: int) -> Dict[str, Any]:
+    """
+    Decode one JSON line.
+    
+    Args:
+        line: The raw line.
+        line_number: Its 1-based position, for error messages.
+        
+    Returns:
+        The decoded object.
+        
+    Raises:
+        ValueError: If the line is not a JSON object.
+    """
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON on line {line_number} of memory export: {e}") from e
+    
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a JSON object on line {line_number} of memory export")
+    
+    return value
+
+
+class _PrefixedReader(io.RawIOBase):
+    """
+    Raw stream that replays already consumed bytes before the rest of a file.
+    
+    Lets compression be detected from the first bytes of streams that cannot
+    seek or peek.
+    """
+    
+    def __init__(self, prefix: bytes, fp: BinaryIO):
+        self.prefix = prefix
+        self.fp = fp
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer: Any) -> int:
+        if self.prefix:
+            size = min(len(buffer), len(self.prefix))
+            buffer[:size] = self.prefix[:size]
+            self.prefix = self.prefix[size:]
+            return size
+        
+        data = self.fp.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
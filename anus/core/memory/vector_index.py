@@ -0,0 +1,257 @@
+"""
+Vector index module for the ANUS framework.
+
+Provides embedding-based similarity search over memory items, backed by a
+contiguous float32 NumPy matrix.
+"""
+
+from typing import Dict, List, Any, Optional, Union, Tuple
+import logging
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+class VectorIndex:
+    """
+    Cosine-similarity index over item embeddings.
+    
+    Vectors are L2-normalized and appended as rows of a preallocated float32
+    matrix that grows geometrically. Deleting or replacing an item tombstones
+    its row; rows are compacted once tombstones make up half the matrix.
+    Queries score every live row with a single matrix-vector product and
+    select the top k with ``argpartition``.
+    
+    An item's vector is taken from ``embedding_field`` if present, then from
+    ``_meta.embedding``, and otherwise computed from ``text_field`` with the
+    configured embedding model.
+    """
+    
+    def __init__(
+        self,
+        embedding_model: Optional[Any] = None,
+        embedding_field: str = "embedding",
+        text_field: str = "content",
+        initial_rows: int = 256
+    ):
+        """
+        Initialize a VectorIndex instance.
+        
+        Args:
+            embedding_model: Optional BaseModel used to embed text fields and text queries.
+            embedding_field: Item key holding a precomputed embedding vector.
+            text_field: Item key holding the text to embed when no vector is present.
+            initial_rows: Number of rows to preallocate once the dimension is known.
+        """
+        if not NUMPY_AVAILABLE:
+            logging.error("NumPy package not installed. Please install it with 'pip install numpy'.")
+            raise ImportError("NumPy package not installed")
+        
+        self.embedding_model = embedding_model
+        self.embedding_field = embedding_field
+        self.text_field = text_field
+        self.initial_rows = initial_rows
+        
+        self.dimension: Optional[int] = None
+        self.matrix = None
+        self.alive = None
+        self.row_count = 0
+        self.row_ids: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+    
+    def embed_item(self, item: Dict[str, Any]) -> Optional[List[float]]:
+        """
+        Find or compute the embedding vector for an item.
+        
+        Args:
+            item: The item to embed.
+            
+        Returns:
+            The embedding vector, or None if the item cannot be embedded.
+        """
+        if not isinstance(item, dict):
+            return None
+        
+        vector = item.get(self.embedding_field)
+        if vector is None:
+            vector = item.get("_meta", {}).get("embedding")
+        
+        if vector is None and self.embedding_model is not None and self.text_field in item:
+            vector = self.embedding_model.get_embedding(str(item[self.text_field]))
+        
+        if vector is None or len(vector) == 0:
+            return None
+        
+        return vector
+    
+    def add(self, identifier: str, vector: List[float]) -> None:
+        """
+        Append a vector for an identifier, tombstoning any previous row.
+        
+        Args:
+            identifier: The identifier of the item.
+            vector: The embedding vector.
+        """
+        row = np.asarray(vector, dtype=np.float32).reshape(-1)
+        
+        if self.dimension is None:
+            self.dimension = row.shape[0]
+            self.matrix = np.zeros((self.initial_rows, self.dimension), dtype=np.float32)
+            self.alive = np.zeros(self.initial_rows, dtype=bool)
+        elif row.shape[0] != self.dimension:
+            logging.warning(
+                f"Ignoring embedding for {identifier[:8]} with dimension {row.shape[0]} "
+                f"(index dimension is {self.dimension})"
+            )
+            return
+        
+        self.remove(identifier)
+        
+        if self.row_count == self.matrix.shape[0]:
+            self._grow()
+        
+        norm = np.linalg.norm(row)
+        if norm > 0:
+            row = row / norm
+        
+        position = self.row_count
+        self.matrix[position] = row
+        self.alive[position] = True
+        self.row_ids.append(identifier)
+        self.rows[identifier] = position
+        self.row_count += 1
+    
+    def index_item(self, identifier: str, item: Dict[str, Any]) -> Optional[List[float]]:
+        """
+        Embed an item and add it to the index.
+        
+        Args:
+            identifier: The identifier of the item.
+            item: The item to index.
+            
+        Returns:
+            The vector that was indexed, or None if the item has no embedding.
+        """
+        vector = self.embed_item(item)
+        if vector is None:
+            self.remove(identifier)
+            return None
+        
+        self.add(identifier, vector)
+        return vector
+    
+    def remove(self, identifier: str) -> None:
+        """
+        Tombstone the row of an identifier.
+        
+        Args:
+            identifier: The identifier of the item.
+        """
+        position = self.rows.pop(identifier, None)
+        if position is None:
+            return
+        
+        self.alive[position] = False
+        self.row_ids[position] = None
+        
+        if len(self.rows) < self.row_count // 2:
+            self._compact()
+    
+    def embed_query(self, query: Union[str, List[float]]) -> List[float]:
+        """
+        Embed a text query with the embedding model.
+        
+        Args:
+            query: A query vector, which is returned unchanged, or text to embed.
+            
+        Returns:
+            The query vector, or an empty list if the model could not embed the text.
+            
+        Raises:
+            ValueError: If the query is text and there is no embedding model.
+        """
+        if not isinstance(query, str):
+            return query
+        
+        if self.embedding_model is None:
+            raise ValueError("A text query requires an embedding model")
+        return self.embedding_model.get_embedding(query) or []
+    
+    def query(self, query: Union[str, List[float]], k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the identifiers most similar to a query.
+        
+        Args:
+            query: A query vector, or text to embed with the embedding model.
+            k: Maximum number of results to return.
+            
+        Returns:
+            A list of (identifier, cosine similarity) pairs, most similar first.
+        """
+        if not self.rows or k <= 0:
+            return []
+        
+        query = self.embed_query(query)
+        if len(query) == 0:
+            return []
+        
+        vector = np.asarray(query, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(f"Query dimension {vector.shape[0]} does not match index dimension {self.dimension}")
+        
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        
+        scores = self.matrix[:self.row_count] @ vector
+        scores[~self.alive[:self.row_count]] = -np.inf
+        
+        k = min(k, len(self.rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [(self.row_ids[i], float(scores[i])) for i in top]
+    
+    def clear(self) -> None:
+        """
+        Remove all vectors while keeping the embedding configuration.
+        """
+        self.dimension = None
+        self.matrix = None
+        self.alive = None
+        self.row_count = 0
+        self.row_ids = []
+        self.rows = {}
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def _grow(self) -> None:
+        """
+        Double the preallocated matrix.
+        """
+        new_rows = max(self.initial_rows, self.matrix.shape[0] * 2)
+        
+        matrix = np.zeros((new_rows, self.dimension), dtype=np.float32)
+        matrix[:self.row_count] = self.matrix[:self.row_count]
+        alive = np.zeros(new_rows, dtype=bool)
+        alive[:self.row_count] = self.alive[:self.row_count]
+        
+        self.matrix = matrix
+        self.alive = alive
+    
+    def _compact(self) -> None:
+        """
+        Drop tombstoned rows and renumber the live ones.
+        """
+        live = np.flatnonzero(self.alive[:self.row_count])
+        count = len(live)
+        
+        self.matrix[:count] = self.matrix[live]
+        self.alive[:count] = True
+        self.alive[count:] = False
+        self.row_ids = [self.row_ids[i] for i in live]
+        self.rows = {identifier: position for position, identifier in enumerate(self.row_ids)}
+        self.row_count = count
@@ -15,7 +15,9 @@ import time
 import random
 
 from anus.core.agent import BaseAgent, HybridAgent
-from anus.core.memory import ShortTermMemory, LongTermMemory
+from anus.core.memory import BaseMemory, ShortTermMemory, ShardedShortTermMemory, SharedShortTermMemory, LongTermMemory, TieredMemory, SegmentMemory, SQLiteMemory, MemoryConsolidator
+from anus.models.base.base_model import BaseModel
+from anus.models.model_router import ModelRouter
 
 # Create a custom logger for ANUS-specific wisdom
 class ANUSLogger(logging.Logger):
@@ -43,6 +45,21 @@ class ANUSLogger(logging.Logger):
 logging.setLoggerClass(ANUSLogger)
 logger = logging.getLogger("anus.orchestrator")
 
+# Long-term memory options implemented only by the files backend, with their defaults
+FILES_BACKEND_OPTIONS = {
+    "index_in_memory": True,
+    "index_snapshot": True,
+    "lazy_index": False,
+    "write_behind": False,
+    "durability": "none",
+    "read_cache_size": 0,
+    "bloom_filter": False,
+    "vector_search": False,
+    "deduplicate": False,
+    "text_search": False,
+    "compression": "none"
+}
+
 class AgentOrchestrator:
     """
     Coordinates multiple agents and manages their lifecycle.
@@ -66,6 +83,11 @@ class AgentOrchestrator:
         """
         self.config = self._load_config(config_path)
         self.agents: Dict[str, BaseAgent] = {}
+        self.short_term_memory: Optional[BaseMemory] = None
+        self.long_term_memory: Optional[BaseMemory] = None
+        self.tiered_memory: Optional[TieredMemory] = None
+        self.consolidator: Optional[MemoryConsolidator] = None
+        self._embedding_model: Optional[BaseModel] = None
         self.primary_agent = self._create_primary_agent()
         self.last_result: Dict[str, Any] = {}
         self.task_history: List[Dict[str, Any]] = []
@@ -198,6 +220,48 @@ class AgentOrchestrator:
         """
         return self.last_result
     
+    def shutdown(self) -> None:
+        """
+        Flush and close the memory systems.
+        
+        Should be called once when the orchestrator is no longer needed, so
+        that buffered memory writes reach disk. When a short-term memory
+        snapshot path is configured, short-term memory is saved there first.
+        """
+        memory_config = self.config.get("memory", {}).get("short_term", {})
+        snapshot_path = memory_config.get("snapshot_path")
+        
+        if (
+            snapshot_path
+            and memory_config.get("snapshot_on_shutdown", True)
+            and hasattr(self.short_term_memory, "snapshot")
+        ):
+            try:
+                self.short_term_memory.snapshot(os.path.expanduser(snapshot_path))
+            except Exception as e:
+                logger.error(f"Error saving short-term memory snapshot: {e}")
+        
+        if self.consolidator is not None:
+            self.consolidator.stop()
+        
+        # Evicted items are written back as they go; persist the rest before closing
+        if self.tiered_memory is not None:
+            try:
+                self.tiered_memory.flush()
+            except Exception as e:
+                logger.error(f"Error writing back tiered memory: {e}")
+        
+        for memory in (self.short_term_memory, self.long_term_memory):
+            if memory is None:
+                continue
+            
+            try:
+                memory.close()
+            except Exception as e:
+                logger.error(f"Error closing {type(memory).__name__}: {e}")
+        
+        logger.info("ANUS Orchestrator shut down cleanly")
+    
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """
         Load configuration from a YAML file.
@@ -218,13 +282,62 @@ class AgentOrchestrator:
             },
             "memory": {
                 "short_term": {
+                    "backend": "local",
                     "capacity": 1000,
-                    "ttl": 3600
+                    "ttl": 3600,
+                    "indexes": [],
+                    "max_bytes": None,
+                    "shards": 1,
+                    "vector_search": False,
+                    "deduplicate": False,
+                    "text_search": False,
+                    "text_fields": ["content"],
+                    "snapshot_path": None,
+                    "restore_on_startup": True,
+                    "snapshot_on_shutdown": True,
+                    "shared": {
+                        "path": None,
+                        "slot_size": 4096,
+                        "max_probe": 16
+                    }
                 },
                 "long_term": {
                     "enabled": True,
                     "storage_path": None,
-                    "index_in_memory": True
+                    "backend": "files",
+                    "index_in_memory": True,
+                    "index_snapshot": True,
+                    "lazy_index": False,
+                    "write_behind": False,
+                    "durability": "none",
+                    "flush_interval": 1.0,
+                    "read_cache_size": 0,
+                    "bloom_filter": False,
+                    "vector_search": False,
+                    "deduplicate": False,
+                    "text_search": False,
+                    "text_fields": ["content"],
+                    "compression": "none",
+                    "compression_level": None,
+                    "compression_min_size": 256,
+                    "compression_dictionary": False
+                },
+                "tiering": {
+                    "enabled": False,
+                    "promote_after": 2,
+                    "demote_below": 0,
+                    "frequency_window": 300
+                },
+                "consolidation": {
+                    "enabled": False,
+                    "model": None,
+                    "group_by": ["task_id", "session_id"],
+                    "min_age": 7 * 24 * 3600,
+                    "min_group_size": 5,
+                    "max_group_size": 50,
+                    "max_groups_per_run": 10,
+                    "calls_per_minute": 10,
+                    "interval": 3600
                 }
             },
             "models": {
@@ -232,7 +345,8 @@ class AgentOrchestrator:
                     "provider": "openai",
                     "model": "gpt-4",
                     "temperature": 0.0
-                }
+                },
+                "embedding": None
             },
             "tools": {
                 "enabled": []
@@ -305,6 +419,10 @@ class AgentOrchestrator:
         # Create memories
         short_term_memory = self._create_short_term_memory()
         long_term_memory = self._create_long_term_memory()
+        self.short_term_memory = short_term_memory
+        self.long_term_memory = long_term_memory
+        self.tiered_memory = self._create_tiered_memory(short_term_memory, long_term_memory)
+        self.consolidator = self._create_consolidator(long_term_memory)
         
         # Create the agent
         agent = HybridAgent(
@@ -314,7 +432,8 @@ class AgentOrchestrator:
             mode=mode,
             complexity_threshold=complexity_threshold,
             short_term_memory=short_term_memory,
-            long_term_memory=long_term_memory
+            long_term_memory=long_term_memory,
+            memory=self.tiered_memory
         )
         
         logger.info(f"Primary agent created. ANUS is ready with {len(enabled_tools)} tools available")
@@ -329,26 +448,180 @@ class AgentOrchestrator:
         
         return agent
     
-    def _create_short_term_memory(self) -> ShortTermMemory:
+    def _create_short_term_memory(self) -> BaseMemory:
         """
         Create a short-term memory instance based on configuration.
         
+        If a snapshot path is configured and the file exists, the memory is
+        warm-started from it.
+        
         Returns:
-            A ShortTermMemory instance.
+            A ShortTermMemory instance, a ShardedShortTermMemory when more
+            than one shard is configured, or a SharedShortTermMemory when the
+            shared backend is configured.
         """
         memory_config = self.config.get("memory", {}).get("short_term", {})
         capacity = memory_config.get("capacity", 1000)
         ttl = memory_config.get("ttl", 3600)
+        indexes = memory_config.get("indexes", [])
+        max_bytes = memory_config.get("max_bytes")
+        shards = memory_config.get("shards", 1)
+        vector_search = memory_config.get("vector_search", False)
+        deduplicate = memory_config.get("deduplicate", False)
+        text_search = memory_config.get("text_search", False)
+        text_fields = memory_config.get("text_fields", ["content"])
+        embedding_model = self._get_embedding_model() if vector_search else None
+        if vector_search and embedding_model is None:
+            logger.warning("Short-term vector search needs an embedding model. Vector search disabled.")
+            vector_search = False
+        
+        snapshot_path = memory_config.get("snapshot_path")
+        
+        if memory_config.get("backend", "local") == "shared":
+            # Shared tables outlive each process and are never snapshotted
+            shared_config = memory_config.get("shared", {})
+            path = shared_config.get("path")
+            logger.debug(f"Attaching ANUS short-term memory to shared table {path or '(default)'}")
+            return SharedShortTermMemory(
+                path=os.path.expanduser(path) if path else None, capacity=capacity, ttl=ttl,
+                slot_size=shared_config.get("slot_size", 4096),
+                max_probe=shared_config.get("max_probe", 16)
+            )
+        
+        if shards > 1:
+            logger.debug(f"Initializing ANUS short-term memory with capacity {capacity} across {shards} shards")
+            memory = ShardedShortTermMemory(
+                capacity=capacity, ttl=ttl, shards=shards, indexes=indexes,
+                max_bytes=max_bytes, vector_search=vector_search, deduplicate=deduplicate,
+                text_search=text_search, text_fields=text_fields, embedding_model=embedding_model
+            )
+        else:
+            logger.debug(f"Initializing ANUS short-term memory with capacity {capacity}")
+            memory = ShortTermMemory(
+                capacity=capacity, ttl=ttl, indexes=indexes,
+                max_bytes=max_bytes, vector_search=vector_search, deduplicate=deduplicate,
+                text_search=text_search, text_fields=text_fields, embedding_model=embedding_model
+            )
+        
+        if snapshot_path and memory_config.get("restore_on_startup", True):
+            snapshot_path = os.path.expanduser(snapshot_path)
+            if os.path.exists(snapshot_path):
+                try:
+                    memory.restore(snapshot_path)
+                except Exception as e:
+                    logger.error(f"Error restoring short-term memory snapshot: {e}")
+        
+        return memory
+    
+    def _get_embedding_model(self) -> Optional[BaseModel]:
+        """
+        Get the model used to embed memory items and text queries.
+        
+        The model is configured under ``models.embedding``, falling back to the
+        default model, and is created once and shared by all memories.
+        
+        Returns:
+            The embedding model, or None if it cannot be created.
+        """
+        if self._embedding_model is None:
+            models_config = self.config.get("models", {})
+            model_config = dict(models_config.get("embedding") or models_config.get("default", {}))
+            if "model" in model_config:
+                model_config["model_name"] = model_config.pop("model")
+            
+            try:
+                self._embedding_model = ModelRouter(model_config).get_default_model()
+            except Exception as e:
+                logger.warning(f"Could not create an embedding model for memory: {e}")
+        
+        return self._embedding_model
+    
+    def _create_tiered_memory(
+        self,
+        short_term_memory: BaseMemory,
+        long_term_memory: Optional[BaseMemory]
+    ) -> Optional[TieredMemory]:
+        """
+        Create a tiered memory over the short-term and long-term memories if configured.
+        
+        Args:
+            short_term_memory: The hot tier.
+            long_term_memory: The cold tier, or None if long-term memory is disabled.
+            
+        Returns:
+            A TieredMemory instance, or None if tiering is disabled or unsupported
+            by the configured memories.
+        """
+        tiering_config = self.config.get("memory", {}).get("tiering", {})
+        if not tiering_config.get("enabled", False):
+            return None
+        
+        if long_term_memory is None or not hasattr(short_term_memory, "on_evict"):
+            logger.warning("Memory tiering needs local short-term memory and enabled long-term memory. Tiering disabled.")
+            return None
+        
+        logger.debug("Initializing ANUS tiered memory")
+        return TieredMemory(
+            hot=short_term_memory,
+            cold=long_term_memory,
+            promote_after=tiering_config.get("promote_after", 2),
+            demote_below=tiering_config.get("demote_below", 0),
+            frequency_window=tiering_config.get("frequency_window", 300)
+        )
+    
+    def _create_consolidator(self, long_term_memory: Optional[BaseMemory]) -> Optional[MemoryConsolidator]:
+        """
+        Create and start a consolidator for long-term memory if configured.
+        
+        Summaries are written by the model configured under ``model`` in the
+        consolidation settings, or by the default model.
+        
+        Args:
+            long_term_memory: The memory to consolidate, or None if long-term memory is disabled.
+            
+        Returns:
+            A running MemoryConsolidator, or None if consolidation is disabled
+            or its model cannot be created.
+        """
+        consolidation_config = self.config.get("memory", {}).get("consolidation", {})
+        if not consolidation_config.get("enabled", False) or long_term_memory is None:
+            return None
+        
+        model_config = dict(consolidation_config.get("model") or self.config.get("models", {}).get("default", {}))
+        if "model" in model_config:
+            model_config["model_name"] = model_config.pop("model")
         
-        logger.debug(f"Initializing ANUS short-term memory with capacity {capacity}")
-        return ShortTermMemory(capacity=capacity, ttl=ttl)
+        try:
+            model = ModelRouter(model_config).get_default_model()
+        except Exception as e:
+            logger.warning(f"Could not create a model for memory consolidation: {e}. Consolidation disabled.")
+            return None
+        
+        logger.debug("Initializing ANUS memory consolidation. Old episodes will be squeezed into summaries")
+        consolidator = MemoryConsolidator(
+            memory=long_term_memory,
+            model=model,
+            group_by=consolidation_config.get("group_by", ["task_id", "session_id"]),
+            min_age=consolidation_config.get("min_age", 7 * 24 * 3600),
+            min_group_size=consolidation_config.get("min_group_size", 5),
+            max_group_size=consolidation_config.get("max_group_size", 50),
+            max_groups_per_run=consolidation_config.get("max_groups_per_run", 10),
+            calls_per_minute=consolidation_config.get("calls_per_minute", 10),
+            interval=consolidation_config.get("interval", 3600)
+        )
+        consolidator.start()
+        return consolidator
     
-    def _create_long_term_memory(self) -> Optional[LongTermMemory]:
+    def _create_long_term_memory(self) -> Optional[BaseMemory]:
         """
         Create a long-term memory instance based on configuration.
         
+        The ``backend`` setting selects the storage engine: ``files`` (one JSON
+        file per item), ``segments`` (append-only segment files) or ``sqlite``
+        (a single SQLite database).
+        
         Returns:
-            A LongTermMemory instance, or None if disabled.
+            A LongTermMemory, SegmentMemory or SQLiteMemory instance, or None if disabled.
         """
         memory_config = self.config.get("memory", {}).get("long_term", {})
         enabled = memory_config.get("enabled", True)
@@ -359,13 +632,76 @@ class AgentOrchestrator:
         
         storage_path = memory_config.get("storage_path")
         index_in_memory = memory_config.get("index_in_memory", True)
+        vector_search = memory_config.get("vector_search", False)
+        backend = memory_config.get("backend", "files")
         
         if storage_path:
             logger.debug(f"ANUS will store long-term memories at: {storage_path}")
         else:
             logger.debug("ANUS will store long-term memories in the default location")
         
-        return LongTermMemory(storage_path=storage_path, index_in_memory=index_in_memory)
+        if backend == "segments":
+            self._warn_unsupported_options(backend, memory_config)
+            segment_config = memory_config.get("segments", {})
+            return SegmentMemory(
+                storage_path=storage_path,
+                segment_size=segment_config.get("segment_size", 64 * 1024 * 1024),
+                fsync=segment_config.get("fsync", False),
+                compaction_threshold=segment_config.get("compaction_threshold", 0.5),
+                compaction_interval=segment_config.get("compaction_interval", 300)
+            )
+        elif backend == "sqlite":
+            self._warn_unsupported_options(backend, memory_config)
+            return SQLiteMemory(
+                storage_path=storage_path,
+                indexed_paths=memory_config.get("indexed_paths", [])
+            )
+        elif backend != "files":
+            logger.warning(f"Unknown long-term memory backend '{backend}'. Falling back to files.")
+        
+        embedding_model = self._get_embedding_model() if vector_search else None
+        if vector_search and embedding_model is None:
+            logger.warning("Long-term vector search needs an embedding model. Vector search disabled.")
+            vector_search = False
+        
+        return LongTermMemory(
+            storage_path=storage_path,
+            index_in_memory=index_in_memory,
+            vector_search=vector_search,
+            embedding_model=embedding_model,
+            index_snapshot=memory_config.get("index_snapshot", True),
+            lazy_index=memory_config.get("lazy_index", False),
+            write_behind=memory_config.get("write_behind", False),
+            durability=memory_config.get("durability", "none"),
+            flush_interval=memory_config.get("flush_interval", 1.0),
+            read_cache_size=memory_config.get("read_cache_size", 0),
+            bloom_filter=memory_config.get("bloom_filter", False),
+            deduplicate=memory_config.get("deduplicate", False),
+            text_search=memory_config.get("text_search", False),
+            text_fields=memory_config.get("text_fields", ["content"]),
+            compression=memory_config.get("compression", "none"),
+            compression_level=memory_config.get("compression_level"),
+            compression_min_size=memory_config.get("compression_min_size", 256),
+            compression_dictionary=memory_config.get("compression_dictionary", False)
+        )
+    
+    def _warn_unsupported_options(self, backend: str, memory_config: Dict[str, Any]) -> None:
+        """
+        Warn about long-term memory options that a backend ignores.
+        
+        Args:
+            backend: The configured long-term memory backend.
+            memory_config: The long-term memory configuration.
+        """
+        ignored = [
+            option for option, default in FILES_BACKEND_OPTIONS.items()
+            if memory_config.get(option, default) != default
+        ]
+        if ignored:
+            logger.warning(
+                f"The {backend} long-term memory backend does not support {', '.join(ignored)}. "
+                "These options are ignored."
+            )
     
     def _create_specialized_agents(self, primary_agent: HybridAgent) -> None:
         """
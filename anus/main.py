@@ -55,20 +55,24 @@ def main():
     orchestrator = AgentOrchestrator(config_path=config_path)
     
     # Handle commands
-    if args.command == "interactive" or (not args.command and not getattr(args, 'task', None)):
-        # Start interactive mode
-        cli.start_interactive_mode(orchestrator)
-    elif args.command == "run":
-        # Execute the specified task
-        result = orchestrator.execute_task(args.task, mode=getattr(args, 'mode', 'single'))
-        cli.display_result(result)
-    elif getattr(args, 'task', None):
-        # Backward compatibility for --task argument
-        result = orchestrator.execute_task(args.task, mode=args.mode)
-        cli.display_result(result)
-    else:
-        # No command specified, show help
-        parser.print_help()
+    try:
+        if args.command == "interactive" or (not args.command and not getattr(args, 'task', None)):
+            # Start interactive mode
+            cli.start_interactive_mode(orchestrator)
+        elif args.command == "run":
+            # Execute the specified task
+            result = orchestrator.execute_task(args.task, mode=getattr(args, 'mode', 'single'))
+            cli.display_result(result)
+        elif getattr(args, 'task', None):
+            # Backward compatibility for --task argument
+            result = orchestrator.execute_task(args.task, mode=args.mode)
+            cli.display_result(result)
+        else:
+            # No command specified, show help
+            parser.print_help()
+    finally:
+        # Flush buffered memory writes before exiting
+        orchestrator.shutdown()
 
 if __name__ == "__main__":
     main()
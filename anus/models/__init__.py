@@ -5,10 +5,12 @@ This module contains language model implementations and utilities:
 - BaseModel: Abstract base class for all language models
 - OpenAIModel: Implementation for the OpenAI API
 - ModelRouter: Dynamic model selection based on task requirements
+- CachedModel: Response cache for deterministic calls to any model
 """
 
 from anus.models.base import BaseModel
 from anus.models.openai_model import OpenAIModel
 from anus.models.model_router import ModelRouter
+from anus.models.cached_model import CachedModel
 
-__all__ = ["BaseModel", "OpenAIModel", "ModelRouter"] 
\ No newline at end of file
+__all__ = ["BaseModel", "OpenAIModel", "ModelRouter", "CachedModel"] 
\ No newline at end of file
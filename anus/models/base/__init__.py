@@ -3,8 +3,9 @@ Base Models module for the ANUS framework.
 
 This module contains the base model interfaces:
 - BaseModel: Abstract base class for all language models
+- is_error_response: Check for errors models return instead of raising
 """
 
-from anus.models.base.base_model import BaseModel
+from anus.models.base.base_model import BaseModel, is_error_response
 
-__all__ = ["BaseModel"] 
\ No newline at end of file
+__all__ = ["BaseModel", "is_error_response"] 
\ No newline at end of file
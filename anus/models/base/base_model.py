@@ -4,12 +4,18 @@ Base Model module that defines the common interface for all language models.
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Union, Callable
+import asyncio
+import functools
 
 class BaseModel(ABC):
     """
     Abstract base class for language model implementations.
     
     Provides a common interface for interacting with different LLM providers.
+    
+    Every call has an async counterpart prefixed with ``a``. By default these
+    run the synchronous call in a worker thread; providers with a native
+    async client override them so calls do not hold a thread while waiting.
     """
     
     def __init__(
@@ -123,6 +129,116 @@ class BaseModel(ABC):
         """
         pass
     
+    async def agenerate(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text based on a prompt.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        return await self._run_in_thread(
+            self.generate, prompt, system_message=system_message,
+            temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+    
+    async def agenerate_with_tools(
+        self, 
+        prompt: str, 
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling capabilities.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        return await self._run_in_thread(
+            self.generate_with_tools, prompt, tools, system_message=system_message,
+            temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+    
+    async def aextract_json(
+        self, 
+        prompt: str, 
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data based on a prompt.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        return await self._run_in_thread(
+            self.extract_json, prompt, schema, system_message=system_message,
+            temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector for the given text.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        return await self._run_in_thread(self.get_embedding, text, **kwargs)
+    
+    async def _run_in_thread(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call in the event loop's default executor.
+        
+        Args:
+            function: The synchronous call.
+            *args: Positional arguments for it.
+            **kwargs: Keyword arguments for it.
+            
+        Returns:
+            The call's result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+    
     def get_token_count(self, text: str) -> int:
         """
         Estimate the number of tokens in the given text.
@@ -148,4 +264,29 @@ class BaseModel(ABC):
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
             "config": self.config
-        } 
\ No newline at end of file
+        } 
+
+
+def is_error_response(value: Any) -> bool:
+    """
+    Check whether a model response is an error reported in place of a result.
+    
+    Models return ``Error: ...`` text, or an ``error`` key from ``extract_json``,
+    instead of raising. Empty responses are treated as errors too, since no
+    caller can use them.
+    
+    Args:
+        value: A response from ``generate``, ``generate_with_tools``,
+            ``extract_json`` or ``get_embedding``.
+        
+    Returns:
+        True if the response reports an error or is empty.
+    """
+    if isinstance(value, str):
+        return not value.strip() or value.startswith("Error: ")
+    if isinstance(value, dict):
+        content = value.get("content")
+        return "error" in value or (isinstance(content, str) and content.startswith("Error: "))
+    if isinstance(value, list):
+        return not value
+    return value is None
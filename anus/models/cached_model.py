@@ -0,0 +1,564 @@
+"""
+Cached Model module for the ANUS framework.
+
+Wraps any model so that repeated deterministic calls are answered from a
+cache instead of the provider.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from anus.core.memory.cache import LRUCache
+from anus.models.base.base_model import BaseModel, is_error_response
+
+# Arguments that make a response vary between otherwise identical calls, with
+# the values that keep a call deterministic
+_NONDETERMINISTIC_ARGUMENTS = {"stream": (None, False), "n": (None, 1)}
+
+class CachedModel(BaseModel):
+    """
+    Response cache in front of another BaseModel.
+    
+    Calls are keyed by a SHA-256 hash of the wrapped model's class and name,
+    the call type, the prompt and system message, the schema or tools, and
+    all sampling parameters. Lookups go to an in-memory LRU first and then,
+    if a ``path`` is given, to an on-disk tier that survives restarts and can
+    be shared by processes; disk hits are promoted to memory.
+    
+    Only deterministic calls are cached: text, tool and JSON calls whose
+    effective temperature is 0, and embeddings. Other calls, and responses
+    the wrapped model reports as errors, pass straight through.
+    """
+    
+    def __init__(
+        self,
+        model: BaseModel,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        path: Optional[str] = None,
+        disk_ttl: Optional[float] = None
+    ):
+        """
+        Initialize a CachedModel instance.
+        
+        Args:
+            model: The model to wrap.
+            max_entries: Maximum number of responses kept in memory.
+            ttl: Seconds a cached response stays valid, or None for no expiry.
+            path: Optional directory for the on-disk tier.
+            disk_ttl: Seconds a response stays valid on disk. Defaults to ``ttl``.
+        """
+        super().__init__(model.model_name, model.temperature, model.max_tokens, **model.config)
+        self.model = model
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl if disk_ttl is not None else ttl
+        self.path = os.path.expanduser(path) if path else None
+        self.memory_cache = LRUCache(max_entries)
+        
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+        
+        self._stats_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+    
+    def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text, answering repeated deterministic prompts from the cache.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        key = self._key("generate", temperature, kwargs, prompt=prompt, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = self.model.generate(prompt, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Asynchronously generate text, answering repeated deterministic prompts from the cache.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        key = self._key("generate", temperature, kwargs, prompt=prompt, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = await self.model.agenerate(prompt, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    def generate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with tool calling, answering repeated deterministic calls from the cache.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        key = self._key("generate_with_tools", temperature, kwargs, prompt=prompt, tools=tools, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = self.model.generate_with_tools(prompt, tools, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    async def agenerate_with_tools(
+        self,
+        prompt: str,
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate text with tool calling, answering repeated deterministic calls from the cache.
+        
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        key = self._key("generate_with_tools", temperature, kwargs, prompt=prompt, tools=tools, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = await self.model.agenerate_with_tools(prompt, tools, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    def extract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Extract structured JSON data, answering repeated deterministic calls from the cache.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        key = self._key("extract_json", temperature, kwargs, prompt=prompt, schema=schema, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = self.model.extract_json(prompt, schema, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured JSON data, answering repeated deterministic calls from the cache.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for models that support it.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The extracted JSON data.
+        """
+        key = self._key("extract_json", temperature, kwargs, prompt=prompt, schema=schema, system_message=system_message, max_tokens=max_tokens)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = await self.model.aextract_json(prompt, schema, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        self._store(key, value)
+        return value
+    
+    def get_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Generate an embedding vector, answering repeated texts from the cache.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        key = self._embedding_key(text, kwargs)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = self.model.get_embedding(text, **kwargs)
+        self._store(key, value)
+        return value
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Asynchronously generate an embedding vector, answering repeated texts from the cache.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional model-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        key = self._embedding_key(text, kwargs)
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        
+        value = await self.model.aget_embedding(text, **kwargs)
+        self._store(key, value)
+        return value
+    
+    def get_token_count(self, text: str) -> int:
+        """
+        Estimate the number of tokens in the given text with the wrapped model.
+        
+        Args:
+            text: The text to count tokens for.
+            
+        Returns:
+            The approximate token count.
+        """
+        return self.model.get_token_count(text)
+    
+    def get_model_details(self) -> Dict[str, Any]:
+        """
+        Get details about the wrapped model and the cache.
+        
+        Returns:
+            A dictionary containing model information and cache statistics.
+        """
+        details = self.model.get_model_details()
+        details["cache"] = self.get_stats()
+        return details
+    
+    def clear(self) -> None:
+        """
+        Remove all cached responses from memory and disk. Counters are kept.
+        """
+        self.memory_cache.clear()
+        
+        if not self.path:
+            return
+        
+        for directory, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError as e:
+                        logging.error(f"Error deleting cached response {name}: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+        
+        Returns:
+            A dictionary with hits per tier, misses, bypassed calls, expired
+            entries and the in-memory LRU statistics.
+        """
+        with self._stats_lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "bypassed": self.bypassed,
+                "expired": self.expired,
+                "memory": self.memory_cache.get_stats(),
+                "disk": self.path is not None
+            }
+    
+    def __getattr__(self, name: str) -> Any:
+        # Expose provider-specific attributes such as ``client`` of the wrapped model
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+    
+    def _key(self, call: str, temperature: Optional[float], kwargs: Dict[str, Any], **arguments) -> Optional[str]:
+        """
+        Compute the cache key of a chat call, or None if the call is not deterministic.
+        
+        Args:
+            call: The call type.
+            temperature: The temperature override passed to the call.
+            kwargs: Additional model-specific parameters passed to the call.
+            **arguments: The prompt, system message, schema or tools and token limit.
+            
+        Returns:
+            The hex digest key, or None to bypass the cache.
+        """
+        effective_temperature = temperature if temperature is not None else self.model.temperature
+        if effective_temperature != 0 or any(kwargs.get(name) not in values for name, values in _NONDETERMINISTIC_ARGUMENTS.items()):
+            with self._stats_lock:
+                self.bypassed += 1
+            return None
+        
+        if arguments.get("max_tokens") is None:
+            arguments["max_tokens"] = self.model.max_tokens
+        
+        return self._digest({
+            "call": call,
+            "model": self.model.model_name,
+            "provider": type(self.model).__name__,
+            "temperature": 0,
+            "kwargs": kwargs,
+            **arguments
+        })
+    
+    def _embedding_key(self, text: str, kwargs: Dict[str, Any]) -> str:
+        """
+        Compute the cache key of an embedding call.
+        
+        Args:
+            text: The text to embed.
+            kwargs: Additional model-specific parameters passed to the call.
+            
+        Returns:
+            The hex digest key.
+        """
+        return self._digest({
+            "call": "get_embedding",
+            "model": getattr(self.model, "embedding_model", self.model.model_name),
+            "provider": type(self.model).__name__,
+            "text": text,
+            "kwargs": kwargs
+        })
+    
+    def _digest(self, payload: Dict[str, Any]) -> str:
+        """
+        Hash a call description canonically.
+        
+        Args:
+            payload: The call description.
+            
+        Returns:
+            The SHA-256 hex digest of its sorted-key JSON.
+        """
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def _lookup(self, key: Optional[str]) -> Tuple[bool, Any]:
+        """
+        Look a response up in memory, then on disk.
+        
+        Args:
+            key: The cache key, or None for uncacheable calls.
+            
+        Returns:
+            Whether the response was found, and the response.
+        """
+        if key is None:
+            return False, None
+        
+        now = time.time()
+        entry = self.memory_cache.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > now:
+                with self._stats_lock:
+                    self.memory_hits += 1
+                # Callers may modify responses, so never hand out the cached object
+                return True, copy.deepcopy(value)
+            
+            self.memory_cache.pop(key)
+            with self._stats_lock:
+                self.expired += 1
+        
+        if self.path:
+            entry = self._read_disk(key, now)
+            if entry is not None:
+                expires_at, value = entry
+                memory_expires_at = now + self.ttl if self.ttl is not None else None
+                if expires_at is not None:
+                    memory_expires_at = min(expires_at, memory_expires_at or expires_at)
+                self.memory_cache.put(key, (memory_expires_at, copy.deepcopy(value)))
+                with self._stats_lock:
+                    self.disk_hits += 1
+                return True, value
+        
+        with self._stats_lock:
+            self.misses += 1
+        return False, None
+    
+    def _store(self, key: Optional[str], value: Any) -> None:
+        """
+        Cache a response in memory and on disk, unless it reports an error.
+        
+        Args:
+            key: The cache key, or None for uncacheable calls.
+            value: The response.
+        """
+        if key is None or is_error_response(value):
+            return
+        
+        now = time.time()
+        self.memory_cache.put(key, (now + self.ttl if self.ttl is not None else None, copy.deepcopy(value)))
+        
+        if self.path:
+            self._write_disk(key, value, now + self.disk_ttl if self.disk_ttl is not None else None)
+    
+    def _get_entry_path(self, key: str) -> str:
+        """
+        Get the file path of an on-disk entry.
+        
+        Entries are spread over 256 subdirectories by the first byte of their key.
+        
+        Args:
+            key: The cache key.
+            
+        Returns:
+            The entry's file path.
+        """
+        return os.path.join(self.path, key[:2], f"{key}.json")
+    
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[Optional[float], Any]]:
+        """
+        Read an on-disk entry, deleting it if it has expired.
+        
+        Args:
+            key: The cache key.
+            now: The current time.
+            
+        Returns:
+            The expiry time and response, or None if missing, expired or unreadable.
+        """
+        entry_path = self._get_entry_path(key)
+        
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable cached response {key}: {e}")
+            return None
+        
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= now:
+            with self._stats_lock:
+                self.expired += 1
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            return None
+        
+        return expires_at, entry.get("value")
+    
+    def _write_disk(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Write an on-disk entry atomically.
+        
+        Args:
+            key: The cache key.
+            value: The response.
+            expires_at: The expiry time, or None for no expiry.
+        """
+        entry_path = self._get_entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f)
+            os.replace(temp_path, entry_path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.error(f"Error caching response {key}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
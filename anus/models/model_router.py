@@ -6,8 +6,18 @@ from typing import Dict, List, Any, Optional, Union, Type
 import logging
 
 from anus.models.base.base_model import BaseModel
+from anus.models.cached_model import CachedModel
 from anus.models.openai_model import OpenAIModel
 
+# Response caching applied to deterministic models unless configured otherwise
+DEFAULT_CACHE_CONFIG = {
+    "enabled": True,
+    "max_entries": 1024,
+    "ttl": 3600,
+    "path": None,
+    "disk_ttl": None
+}
+
 class ModelRouter:
     """
     Router for dynamically selecting and managing language models.
@@ -121,6 +131,11 @@ class ModelRouter:
         """
         Create a model instance from a configuration dictionary.
         
+        Models configured with temperature 0 are wrapped in a CachedModel, so
+        repeated identical calls are served from cache. The optional ``cache``
+        entry overrides ``DEFAULT_CACHE_CONFIG``; set ``enabled`` to False to
+        turn caching off.
+        
         Args:
             config: The model configuration.
             
@@ -142,9 +157,21 @@ class ModelRouter:
             # Extract kwargs for the model
             kwargs = config.copy()
             kwargs.pop("provider", None)
+            cache_config = {**DEFAULT_CACHE_CONFIG, **(kwargs.pop("cache", None) or {})}
             
             # Create the model
-            return model_class(**kwargs)
+            model = model_class(**kwargs)
+            
+            if cache_config["enabled"] and model.temperature == 0:
+                model = CachedModel(
+                    model,
+                    max_entries=cache_config["max_entries"],
+                    ttl=cache_config["ttl"],
+                    path=cache_config["path"],
+                    disk_ttl=cache_config["disk_ttl"]
+                )
+            
+            return model
             
         except Exception as e:
             logging.error(f"Error creating model for provider {provider}: {e}")
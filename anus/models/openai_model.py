@@ -2,20 +2,94 @@
 OpenAI Model implementation for the ANUS framework.
 """
 
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Union, Callable, Tuple
+import asyncio
 import json
 import logging
 import os
+import threading
+import weakref
 
 try:
     import openai
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
 from anus.models.base.base_model import BaseModel
 
+# Pooled async clients, one per event loop and connection settings. An httpx
+# connection pool is bound to the loop it was created on, so clients are never
+# shared across loops; the loop keys are weak so pools go away with their loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def get_async_client(
+    api_key: str,
+    base_url: Optional[str] = None,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    timeout: Optional[float] = 600.0
+) -> "AsyncOpenAI":
+    """
+    Get the shared async OpenAI client for the running event loop.
+    
+    Models with the same credentials and connection settings share one client
+    and so one connection pool, which keeps warm connections for reuse and
+    caps the number of requests in flight.
+    
+    Args:
+        api_key: OpenAI API key.
+        base_url: Base URL for the OpenAI API, or None for the default.
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept open.
+        keepalive_expiry: Seconds an idle connection is kept open.
+        timeout: Request timeout in seconds, or None for no timeout.
+        
+    Returns:
+        An AsyncOpenAI client.
+    """
+    if not OPENAI_AVAILABLE:
+        raise ImportError("OpenAI package not installed")
+    
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url, max_connections, max_keepalive_connections, keepalive_expiry, timeout)
+    
+    with _async_clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry
+                ),
+                timeout=timeout
+            )
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            clients[key] = client
+    
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Close the shared async clients of the running event loop and their connections.
+    
+    Call before the loop shuts down, e.g. at the end of the coroutine passed
+    to ``asyncio.run``.
+    """
+    with _async_clients_lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    
+    for client in clients.values():
+        await client.close()
+
 class OpenAIModel(BaseModel):
     """
     OpenAI language model implementation.
@@ -30,6 +104,10 @@ class OpenAIModel(BaseModel):
         max_tokens: Optional[int] = None,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: Optional[float] = 600.0,
         **kwargs
     ):
         """
@@ -41,6 +119,10 @@ class OpenAIModel(BaseModel):
             max_tokens: Maximum number of tokens to generate.
             api_key: OpenAI API key. If None, it will be read from the OPENAI_API_KEY environment variable.
             base_url: Base URL for the OpenAI API. Useful for proxies or non-standard endpoints.
+            max_connections: Maximum concurrent connections of the shared async client.
+            max_keepalive_connections: Maximum idle connections the async client keeps open.
+            keepalive_expiry: Seconds an idle async connection is kept open.
+            timeout: Request timeout in seconds for async calls, or None for no timeout.
             **kwargs: Additional model-specific parameters.
         """
         super().__init__(model_name, temperature, max_tokens, **kwargs)
@@ -56,8 +138,12 @@ class OpenAIModel(BaseModel):
             raise ValueError("OpenAI API key required")
         
         self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
         
-        # Initialize client
+        # Initialize client; the async client is pooled and created on first use
         self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
         
         # Set default embedding model
@@ -84,29 +170,11 @@ class OpenAIModel(BaseModel):
         Returns:
             The generated text response.
         """
-        # Prepare messages
-        messages = []
-        
-        # Add system message if provided
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-        
-        # Add user message
-        messages.append({"role": "user", "content": prompt})
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        request = self._chat_request(prompt, system_message, temperature, max_tokens, **kwargs)
         
         try:
             # Make the API call
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=temp,
-                max_tokens=tokens,
-                **kwargs
-            )
+            response = self.client.chat.completions.create(**request)
             
             # Extract and return the response text
             return response.choices[0].message.content
@@ -115,6 +183,37 @@ class OpenAIModel(BaseModel):
             logging.error(f"Error generating with OpenAI: {e}")
             return f"Error: {str(e)}"
     
+    async def agenerate(
+        self, 
+        prompt: str, 
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text based on a prompt using the pooled async OpenAI client.
+        
+        Args:
+            prompt: The text prompt for generation.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The generated text response.
+        """
+        request = self._chat_request(prompt, system_message, temperature, max_tokens, **kwargs)
+        
+        try:
+            response = await self._async_client().chat.completions.create(**request)
+            return response.choices[0].message.content
+        
+        except Exception as e:
+            logging.error(f"Error generating with OpenAI: {e}")
+            return f"Error: {str(e)}"
+    
     def generate_with_tools(
         self, 
         prompt: str, 
@@ -138,76 +237,50 @@ class OpenAIModel(BaseModel):
         Returns:
             A dictionary with the response and any tool calls.
         """
-        # Prepare messages
-        messages = []
+        request = self._chat_request(prompt, system_message, temperature, max_tokens, **kwargs)
+        request["tools"] = self._convert_tools(tools)
         
-        # Add system message if provided
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-        
-        # Add user message
-        messages.append({"role": "user", "content": prompt})
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        try:
+            # Make the API call
+            response = self.client.chat.completions.create(**request)
+            return self._parse_tool_response(response)
         
-        # Convert tools to OpenAI format
-        openai_tools = []
-        for tool in tools:
-            openai_tool = {
-                "type": "function",
-                "function": {
-                    "name": tool.get("name", ""),
-                    "description": tool.get("description", ""),
-                    "parameters": tool.get("parameters", {})
-                }
+        except Exception as e:
+            logging.error(f"Error generating with tools using OpenAI: {e}")
+            return {
+                "content": f"Error: {str(e)}",
+                "tool_calls": []
             }
-            openai_tools.append(openai_tool)
+    
+    async def agenerate_with_tools(
+        self, 
+        prompt: str, 
+        tools: List[Dict[str, Any]],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with tool calling capabilities using the pooled async OpenAI client.
         
-        try:
-            # Make the API call
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=temp,
-                max_tokens=tokens,
-                tools=openai_tools,
-                **kwargs
-            )
-            
-            # Extract response
-            choice = response.choices[0]
-            message = choice.message
+        Args:
+            prompt: The text prompt for generation.
+            tools: List of tool schemas available for use.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
             
-            # Check for tool calls
-            if hasattr(message, "tool_calls") and message.tool_calls:
-                tool_calls = []
-                for tool_call in message.tool_calls:
-                    # Parse arguments as JSON
-                    try:
-                        arguments = json.loads(tool_call.function.arguments)
-                    except:
-                        arguments = tool_call.function.arguments
-                    
-                    # Create a normalized tool call
-                    normalized_tool_call = {
-                        "id": tool_call.id,
-                        "name": tool_call.function.name,
-                        "arguments": arguments
-                    }
-                    tool_calls.append(normalized_tool_call)
-                
-                return {
-                    "content": message.content,
-                    "tool_calls": tool_calls
-                }
-            else:
-                # No tool calls, just text
-                return {
-                    "content": message.content,
-                    "tool_calls": []
-                }
+        Returns:
+            A dictionary with the response and any tool calls.
+        """
+        request = self._chat_request(prompt, system_message, temperature, max_tokens, **kwargs)
+        request["tools"] = self._convert_tools(tools)
+        
+        try:
+            response = await self._async_client().chat.completions.create(**request)
+            return self._parse_tool_response(response)
         
         except Exception as e:
             logging.error(f"Error generating with tools using OpenAI: {e}")
@@ -239,36 +312,45 @@ class OpenAIModel(BaseModel):
         Returns:
             The extracted JSON data.
         """
-        # Set default system message if not provided
-        if not system_message:
-            system_message = "Extract the requested information and respond only with a valid JSON object according to the specified schema. Do not include any other text."
-        
-        # Set parameters
-        temp = temperature if temperature is not None else self.temperature
-        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        request = self._json_request(prompt, schema, system_message, temperature, max_tokens, **kwargs)
         
         # Make the API call with response format JSON
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": f"Schema: {json.dumps(schema)}\n\nPrompt: {prompt}"}
-                ],
-                temperature=temp,
-                max_tokens=tokens,
-                response_format={"type": "json_object"},
-                **kwargs
-            )
-            
-            # Extract and parse the response
-            content = response.choices[0].message.content
+            response = self.client.chat.completions.create(**request)
+            return self._parse_json_content(response.choices[0].message.content)
+        
+        except Exception as e:
+            logging.error(f"Error extracting JSON with OpenAI: {e}")
+            return {"error": str(e)}
+    
+    async def aextract_json(
+        self, 
+        prompt: str, 
+        schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Extract structured JSON data based on a prompt using the pooled async OpenAI client.
+        
+        Args:
+            prompt: The text prompt for extraction.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message for the model.
+            temperature: Controls randomness in outputs. Overrides instance value if provided.
+            max_tokens: Maximum number of tokens to generate. Overrides instance value if provided.
+            **kwargs: Additional OpenAI-specific parameters.
             
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                logging.error(f"Failed to parse JSON from response: {content}")
-                return {"error": "Failed to parse JSON response"}
+        Returns:
+            The extracted JSON data.
+        """
+        request = self._json_request(prompt, schema, system_message, temperature, max_tokens, **kwargs)
+        
+        try:
+            response = await self._async_client().chat.completions.create(**request)
+            return self._parse_json_content(response.choices[0].message.content)
         
         except Exception as e:
             logging.error(f"Error extracting JSON with OpenAI: {e}")
@@ -296,4 +378,192 @@ class OpenAIModel(BaseModel):
         
         except Exception as e:
             logging.error(f"Error generating embedding with OpenAI: {e}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def aget_embedding(self, text: str, **kwargs) -> List[float]:
+        """
+        Generate an embedding vector for the given text using the pooled async OpenAI client.
+        
+        Args:
+            text: The text to embed.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            The embedding vector as a list of floats.
+        """
+        try:
+            response = await self._async_client().embeddings.create(
+                model=self.embedding_model,
+                input=text,
+                **kwargs
+            )
+            
+            return response.data[0].embedding
+        
+        except Exception as e:
+            logging.error(f"Error generating embedding with OpenAI: {e}")
+            return []
+    
+    def _async_client(self) -> "AsyncOpenAI":
+        """
+        Get the shared async client for this model's settings and the running event loop.
+        
+        Returns:
+            An AsyncOpenAI client.
+        """
+        return get_async_client(
+            self.api_key,
+            base_url=self.base_url,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+            timeout=self.timeout
+        )
+    
+    def _chat_request(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build the arguments of a chat completion call.
+        
+        Args:
+            prompt: The user prompt.
+            system_message: Optional system message.
+            temperature: Temperature override, or None for the instance value.
+            max_tokens: Token limit override, or None for the instance value.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            Keyword arguments for ``chat.completions.create``.
+        """
+        # Prepare messages
+        messages = []
+        
+        # Add system message if provided
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        
+        # Add user message
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
+            **kwargs
+        }
+    
+    def _json_request(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        system_message: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build the arguments of a JSON-mode chat completion call.
+        
+        Args:
+            prompt: The extraction prompt.
+            schema: JSON schema describing the expected structure.
+            system_message: Optional system message; a JSON-only instruction by default.
+            temperature: Temperature override, or None for the instance value.
+            max_tokens: Token limit override, or None for the instance value.
+            **kwargs: Additional OpenAI-specific parameters.
+            
+        Returns:
+            Keyword arguments for ``chat.completions.create``.
+        """
+        # Set default system message if not provided
+        if not system_message:
+            system_message = "Extract the requested information and respond only with a valid JSON object according to the specified schema. Do not include any other text."
+        
+        request = self._chat_request(
+            f"Schema: {json.dumps(schema)}\n\nPrompt: {prompt}",
+            system_message,
+            temperature,
+            max_tokens,
+            **kwargs
+        )
+        request["response_format"] = {"type": "json_object"}
+        return request
+    
+    def _convert_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert tool schemas to OpenAI's function tool format.
+        
+        Args:
+            tools: Tool schemas with ``name``, ``description`` and ``parameters``.
+            
+        Returns:
+            The tools in OpenAI format.
+        """
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": tool.get("name", ""),
+                    "description": tool.get("description", ""),
+                    "parameters": tool.get("parameters", {})
+                }
+            }
+            for tool in tools
+        ]
+    
+    def _parse_tool_response(self, response: Any) -> Dict[str, Any]:
+        """
+        Normalize a chat completion that may contain tool calls.
+        
+        Args:
+            response: The chat completion.
+            
+        Returns:
+            A dictionary with the response ``content`` and normalized ``tool_calls``.
+        """
+        message = response.choices[0].message
+        
+        # Check for tool calls
+        tool_calls = []
+        if hasattr(message, "tool_calls") and message.tool_calls:
+            for tool_call in message.tool_calls:
+                # Parse arguments as JSON
+                try:
+                    arguments = json.loads(tool_call.function.arguments)
+                except:
+                    arguments = tool_call.function.arguments
+                
+                # Create a normalized tool call
+                tool_calls.append({
+                    "id": tool_call.id,
+                    "name": tool_call.function.name,
+                    "arguments": arguments
+                })
+        
+        return {
+            "content": message.content,
+            "tool_calls": tool_calls
+        }
+    
+    def _parse_json_content(self, content: str) -> Dict[str, Any]:
+        """
+        Parse the content of a JSON-mode response.
+        
+        Args:
+            content: The response text.
+            
+        Returns:
+            The parsed JSON, or an ``error`` dictionary if it is not valid JSON.
+        """
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            logging.error(f"Failed to parse JSON from response: {content}")
+            return {"error": "Failed to parse JSON response"}
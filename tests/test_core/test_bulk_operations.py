@@ -0,0 +1,65 @@
+"""
+Tests for bulk memory operations and streaming search across memory stores.
+"""
+
+import pytest
+
+from anus.core.memory import (
+    LongTermMemory, SegmentMemory, ShardedShortTermMemory, SharedShortTermMemory, ShortTermMemory, SQLiteMemory
+)
+
+STORES = {
+    "short_term": lambda path: ShortTermMemory(),
+    "sharded": lambda path: ShardedShortTermMemory(shards=3),
+    "shared": lambda path: SharedShortTermMemory(path=str(path / "shared.table"), capacity=256),
+    "long_term": lambda path: LongTermMemory(storage_path=str(path / "long_term")),
+    "long_term_write_behind": lambda path: LongTermMemory(
+        storage_path=str(path / "long_term"), write_behind=True, flush_interval=3600
+    ),
+    "segments": lambda path: SegmentMemory(storage_path=str(path / "segments")),
+    "sqlite": lambda path: SQLiteMemory(storage_path=str(path / "memory.db")),
+}
+
+
+@pytest.fixture(params=sorted(STORES))
+def memory(request, tmp_path):
+    memory = STORES[request.param](tmp_path)
+    yield memory
+    memory.close()
+
+
+def test_add_many_get_many_delete_many(memory):
+    items = [{"content": f"item {i}", "n": i} for i in range(10)]
+    
+    ids = memory.add_many(items)
+    
+    assert len(set(ids)) == 10
+    fetched = memory.get_many(ids[:3] + ["missing"] + ids[3:4])
+    assert [item["n"] if item else None for item in fetched] == [0, 1, 2, None, 3]
+    assert memory.delete_many(ids[:5] + ["missing"]) == 5
+    assert memory.get_many(ids[:5]) == [None] * 5
+    assert [item["n"] for item in memory.get_many(ids[5:])] == [5, 6, 7, 8, 9]
+
+
+def test_iter_search_pages_with_cursors(memory):
+    ids = memory.add_many([{"content": f"item {i}", "even": i % 2 == 0} for i in range(23)])
+    
+    streamed = [result["id"] for result in memory.iter_search({}, batch_size=4)]
+    assert sorted(streamed) == sorted(ids)
+    
+    # Resume after every fifth result and check that nothing is lost or repeated
+    pages, after = [], None
+    while True:
+        page = []
+        for result in memory.iter_search({"even": True}, batch_size=3, after=after):
+            page.append(result)
+            if len(page) == 5:
+                break
+        if not page:
+            break
+        pages.extend(result["id"] for result in page)
+        after = page[-1]["cursor"]
+    
+    assert pages == [result["id"] for result in memory.iter_search({"even": True})]
+    assert len(pages) == 12
+
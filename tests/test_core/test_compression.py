@@ -0,0 +1,83 @@
+"""
+Tests for payload compression in LongTermMemory.
+"""
+
+import json
+import os
+
+import pytest
+
+from anus.core.memory import LongTermMemory
+from anus.core.memory.compression import PayloadCodec, train_dictionary
+
+LARGE_ITEM = {"content": "the quick brown fox jumps over the lazy dog " * 40, "type": "observation"}
+SMALL_ITEM = {"content": "short", "type": "observation"}
+
+
+@pytest.mark.parametrize("method", ["none", "zlib", "lzma"])
+def test_codec_round_trip(method):
+    codec = PayloadCodec(method=method)
+    
+    for item in (LARGE_ITEM, SMALL_ITEM):
+        assert codec.decode(codec.encode(item)) == item
+
+
+def test_small_and_incompressible_items_are_stored_as_json():
+    codec = PayloadCodec(method="zlib", min_size=256)
+    noise = {"content": os.urandom(600).hex()}
+    
+    assert json.loads(codec.encode(SMALL_ITEM)) == SMALL_ITEM
+    assert len(codec.encode(LARGE_ITEM)) < len(json.dumps(LARGE_ITEM))
+    assert codec.decode(codec.encode(noise)) == noise
+
+
+def test_dictionary_payloads_need_their_dictionary():
+    samples = [json.dumps({"content": f"status report {i}", "type": "observation", "task_id": f"t{i}"}).encode() for i in range(50)]
+    codec = PayloadCodec(method="zlib", min_size=0)
+    codec.add_dictionary(train_dictionary(samples))
+    item = {"content": "status report 99", "type": "observation", "task_id": "t99"}
+    
+    payload = codec.encode(item)
+    
+    assert codec.decode(payload) == item
+    with pytest.raises(ValueError):
+        PayloadCodec(method="zlib").decode(payload)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        PayloadCodec(method="brotli")
+
+
+def test_files_written_with_any_setting_stay_readable(tmp_path):
+    path = str(tmp_path)
+    ids = {}
+    for method in ("none", "zlib", "lzma"):
+        memory = LongTermMemory(storage_path=path, compression=method, index_snapshot=False)
+        ids[method] = memory.add(dict(LARGE_ITEM, method=method))
+        memory.close()
+    
+    memory = LongTermMemory(storage_path=path, index_in_memory=False)
+    
+    for method, identifier in ids.items():
+        assert memory.get(identifier)["method"] == method
+    memory.close()
+
+
+def test_trained_dictionary_is_persisted(tmp_path):
+    path = str(tmp_path)
+    memory = LongTermMemory(storage_path=path, compression="zlib", compression_min_size=0, compression_dictionary=True)
+    for i in range(20):
+        memory.add({"content": f"status report {i}", "type": "observation", "task_id": f"t{i}"})
+    
+    assert memory.train_compression_dictionary() is not None
+    identifier = memory.add({"content": "status report 99", "type": "observation", "task_id": "t99"})
+    memory.close()
+    
+    with open(os.path.join(path, f"{identifier}.json"), "rb") as f:
+        assert f.read(4) == b"\x00ANZ"
+    
+    memory = LongTermMemory(storage_path=path, index_in_memory=False)
+    assert memory.get(identifier)["task_id"] == "t99"
+    assert memory.get_stats()["compression"]["dictionaries"] == 1
+    memory.close()
@@ -0,0 +1,132 @@
+"""
+Tests for MemoryConsolidator.
+"""
+
+import time
+
+import pytest
+
+from anus.core.memory import LongTermMemory, SQLiteMemory, MemoryConsolidator
+from anus.core.memory.consolidation import SUMMARY_TYPE
+from anus.models.base.base_model import BaseModel
+
+
+class StubModel(BaseModel):
+    """Model that answers every prompt with a fixed response."""
+    
+    def __init__(self, response="summary"):
+        super().__init__("stub")
+        self.response = response
+        self.prompts = []
+    
+    def generate(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self.prompts.append(prompt)
+        return self.response
+    
+    def generate_with_tools(self, prompt, tools, **kwargs):
+        return {"content": self.response, "tool_calls": []}
+    
+    def extract_json(self, prompt, schema, **kwargs):
+        return {}
+    
+    def get_embedding(self, text, **kwargs):
+        return []
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def memory(request, tmp_path):
+    if request.param == "sqlite":
+        memory = SQLiteMemory(storage_path=str(tmp_path / "memory.db"))
+    else:
+        memory = LongTermMemory(storage_path=str(tmp_path))
+    yield memory
+    memory.close()
+
+
+def add_episodes(memory, task_id, count):
+    return [memory.add({"content": f"{task_id} step {i}", "task_id": task_id}) for i in range(count)]
+
+
+def consolidator(memory, model, **kwargs):
+    options = {"min_age": 0, "min_group_size": 3, "calls_per_minute": 60000}
+    options.update(kwargs)
+    return MemoryConsolidator(memory, model, **options)
+
+
+def all_items(memory):
+    return [result["item"] for result in memory.iter_search({})]
+
+
+def test_group_is_replaced_by_summary_with_backlinks(memory):
+    ids = add_episodes(memory, "t1", 4)
+    memory.add({"content": "no group"})
+    
+    result = consolidator(memory, StubModel("the gist")).run_once(now=time.time() + 1)
+    
+    assert result == {"groups": 1, "items": 4, "failures": 0}
+    summaries = [item for item in all_items(memory) if item.get("type") == SUMMARY_TYPE]
+    assert len(summaries) == 1
+    assert summaries[0]["content"] == "the gist"
+    assert summaries[0]["task_id"] == "t1"
+    assert sorted(summaries[0]["source_ids"]) == sorted(ids)
+    assert all(memory.get(identifier) is None for identifier in ids)
+    assert len(all_items(memory)) == 2
+
+
+def test_small_and_recent_groups_are_left_alone(memory):
+    add_episodes(memory, "small", 2)
+    add_episodes(memory, "recent", 5)
+    
+    result = consolidator(memory, StubModel(), min_age=3600).run_once()
+    
+    assert result["groups"] == 0
+    assert len(all_items(memory)) == 7
+
+
+@pytest.mark.parametrize("response", ["Error: rate limit exceeded", "", "   ", None])
+def test_error_response_keeps_episodes(memory, response):
+    ids = add_episodes(memory, "t1", 6)
+    job = consolidator(memory, StubModel(response))
+    
+    result = job.run_once(now=time.time() + 1)
+    
+    assert result == {"groups": 0, "items": 0, "failures": 1}
+    assert all(memory.get(identifier) is not None for identifier in ids)
+    assert not [item for item in all_items(memory) if item.get("type") == SUMMARY_TYPE]
+    assert job.get_stats()["failures"] == 1
+
+
+def test_existing_summary_is_folded_into_next_one(memory):
+    first = add_episodes(memory, "t1", 3)
+    job = consolidator(memory, StubModel())
+    job.run_once(now=time.time() + 1)
+    
+    second = add_episodes(memory, "t1", 1)
+    result = job.run_once(now=time.time() + 1)
+    
+    assert result["items"] == 1
+    summaries = [item for item in all_items(memory) if item.get("type") == SUMMARY_TYPE]
+    assert len(summaries) == 1
+    assert sorted(summaries[0]["source_ids"]) == sorted(first + second)
+    assert summaries[0]["source_count"] == 4
+
+
+def test_archive_receives_replaced_episodes(memory, tmp_path):
+    archive = LongTermMemory(storage_path=str(tmp_path / "archive"))
+    ids = add_episodes(memory, "t1", 3)
+    
+    consolidator(memory, StubModel(), archive=archive).run_once(now=time.time() + 1)
+    
+    assert all(archive.get(identifier)["task_id"] == "t1" for identifier in ids)
+    archive.close()
+
+
+def test_max_groups_per_run_limits_work(memory):
+    for task_id in ("a", "b", "c"):
+        add_episodes(memory, task_id, 3)
+    model = StubModel()
+    
+    result = consolidator(memory, model, max_groups_per_run=2).run_once(now=time.time() + 1)
+    
+    assert result["groups"] == 2
+    assert len(model.prompts) == 2
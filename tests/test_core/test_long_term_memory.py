@@ -0,0 +1,235 @@
+"""
+Tests for LongTermMemory storage options.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from anus.core.memory import LongTermMemory
+from anus.core.memory.compression import PayloadCodec
+
+
+@pytest.fixture
+def storage_path(tmp_path):
+    return str(tmp_path / "long_term")
+
+
+def count_decodes(monkeypatch):
+    calls = []
+    decode = PayloadCodec.decode
+    
+    def counting(self, data):
+        calls.append(data)
+        return decode(self, data)
+    
+    monkeypatch.setattr(PayloadCodec, "decode", counting)
+    return calls
+
+
+def test_index_snapshot_skips_unchanged_files(storage_path, monkeypatch):
+    memory = LongTermMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(5)]
+    memory.close()
+    
+    # Rewrite one file behind the snapshot's back
+    changed = ids[2]
+    with open(os.path.join(storage_path, f"{changed}.json"), "w") as f:
+        json.dump({"content": "edited on disk", "_meta": {"id": changed, "created_at": 0, "updated_at": 0}}, f)
+    
+    decodes = count_decodes(monkeypatch)
+    memory = LongTermMemory(storage_path=storage_path)
+    
+    assert len(decodes) == 1
+    assert memory.get(changed)["content"] == "edited on disk"
+    assert memory.get(ids[0])["content"] == "item 0"
+    assert memory.get_stats()["snapshot_generation"] >= 1
+    memory.close()
+
+
+def test_deleted_files_drop_out_of_the_index(storage_path):
+    memory = LongTermMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(3)]
+    memory.close()
+    os.remove(os.path.join(storage_path, f"{ids[1]}.json"))
+    
+    memory = LongTermMemory(storage_path=storage_path)
+    
+    assert memory.get(ids[1]) is None
+    assert len(memory.search({}, limit=10)) == 2
+    memory.close()
+
+
+def test_lazy_index_serves_reads_while_loading(storage_path):
+    memory = LongTermMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}", "n": i}) for i in range(20)]
+    memory.close()
+    
+    memory = LongTermMemory(storage_path=storage_path, lazy_index=True)
+    
+    assert memory.get(ids[3])["n"] == 3
+    added = memory.add({"content": "added while loading", "n": 99})
+    assert memory._index_ready.wait(5)
+    assert memory.search({"n": 99}, limit=10)[0]["id"] == added
+    assert len(memory.search({}, limit=100)) == 21
+    memory.close()
+
+
+def test_write_behind_serves_queued_writes_and_flushes_on_close(storage_path):
+    memory = LongTermMemory(storage_path=storage_path, write_behind=True, flush_interval=3600, flush_batch_size=1000)
+    kept = memory.add({"content": "kept"})
+    dropped = memory.add({"content": "dropped"})
+    memory.update(kept, {"content": "kept and updated"})
+    memory.delete(dropped)
+    
+    assert memory.get(kept)["content"] == "kept and updated"
+    assert memory.get(dropped) is None
+    assert not os.path.exists(os.path.join(storage_path, f"{kept}.json"))
+    memory.close()
+    
+    memory = LongTermMemory(storage_path=storage_path)
+    assert memory.get(kept)["content"] == "kept and updated"
+    assert memory.get(dropped) is None
+    memory.close()
+
+
+def test_full_batch_triggers_an_early_flush(storage_path):
+    memory = LongTermMemory(storage_path=storage_path, write_behind=True, flush_interval=3600, flush_batch_size=5)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(5)]
+    
+    path = os.path.join(storage_path, f"{ids[-1]}.json")
+    for _ in range(500):
+        if os.path.exists(path):
+            break
+        time.sleep(0.01)
+    
+    assert all(os.path.exists(os.path.join(storage_path, f"{identifier}.json")) for identifier in ids)
+    memory.close()
+
+
+@pytest.mark.parametrize("durability", ["batch", "every-write"])
+def test_durability_levels_fsync(storage_path, monkeypatch, durability):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+    memory = LongTermMemory(storage_path=storage_path, write_behind=True, durability=durability, flush_interval=3600)
+    memory.add_many([{"content": "a"}, {"content": "b"}])
+    
+    memory.flush()
+    
+    # One fsync per file, plus the directory once per batch or once per file
+    assert len(synced) == (3 if durability == "batch" else 4)
+    memory.close()
+
+
+def test_unknown_durability_is_rejected(storage_path):
+    with pytest.raises(ValueError):
+        LongTermMemory(storage_path=storage_path, durability="sometimes")
+
+
+def test_read_cache_avoids_repeated_disk_reads(storage_path, monkeypatch):
+    memory = LongTermMemory(storage_path=storage_path, index_in_memory=False, read_cache_size=2)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(3)]
+    decodes = count_decodes(monkeypatch)
+    
+    for _ in range(3):
+        assert memory.get(ids[0])["content"] == "item 0"
+    assert len(decodes) == 1
+    
+    memory.update(ids[0], {"content": "changed"})
+    assert memory.get(ids[0])["content"] == "changed"
+    
+    memory.get(ids[1])
+    memory.get(ids[2])
+    assert memory.get_stats()["read_cache"]["size"] == 2
+    memory.close()
+
+
+def test_bloom_filter_skips_disk_for_unknown_identifiers(storage_path, monkeypatch):
+    memory = LongTermMemory(storage_path=storage_path)
+    known = memory.add({"content": "on disk before startup"})
+    memory.close()
+    
+    memory = LongTermMemory(storage_path=storage_path, index_in_memory=False, bloom_filter=True)
+    added = memory.add({"content": "added after startup"})
+    monkeypatch.setattr(memory, "_read_item_file", lambda identifier: pytest.fail(f"disk lookup for {identifier}"))
+    
+    assert memory.get("missing-identifier") is None
+    assert memory.get_stats()["bloom_filter"]["negative_lookups"] == 1
+    monkeypatch.undo()
+    assert memory.get(known)["content"] == "on disk before startup"
+    assert memory.get(added)["content"] == "added after startup"
+    memory.close()
+
+
+def test_concurrent_deduplicated_add_during_delete_keeps_its_reference(storage_path, monkeypatch):
+    memory = LongTermMemory(storage_path=storage_path, deduplicate=True)
+    identifier = memory.add({"content": "shared"})
+    
+    added = []
+    adder = threading.Thread(target=lambda: added.append(memory.add({"content": "shared"})))
+    item_exists = memory._item_exists
+    
+    def add_during_delete(checked):
+        # Give the add a chance to slip in between the ref count check and the removal
+        adder.start()
+        adder.join(0.2)
+        return item_exists(checked)
+    
+    monkeypatch.setattr(memory, "_item_exists", add_during_delete)
+    assert memory.delete(identifier)
+    monkeypatch.undo()
+    adder.join(5)
+    
+    assert added == [identifier]
+    assert memory.get(identifier)["content"] == "shared"
+    assert memory.get(identifier)["_meta"]["ref_count"] == 1
+    memory.close()
+
+
+def test_duplicate_content_is_stored_once_and_reference_counted(storage_path):
+    memory = LongTermMemory(storage_path=storage_path, deduplicate=True)
+    first = memory.add({"content": "shared"})
+    second = memory.add({"content": "shared"})
+    other = memory.add({"content": "different"})
+    
+    assert first == second
+    assert other != first
+    assert len(memory.search({}, limit=10)) == 2
+    assert memory.get(first)["_meta"]["ref_count"] == 2
+    
+    assert memory.delete(first)
+    assert memory.get(first)["_meta"]["ref_count"] == 1
+    assert memory.delete(first)
+    assert memory.get(first) is None
+    assert not os.path.exists(os.path.join(storage_path, f"{first}.json"))
+    memory.close()
+
+
+def test_search_while_items_are_added_and_deleted(storage_path):
+    memory = LongTermMemory(storage_path=storage_path)
+    for i in range(200):
+        memory.add({"content": f"seed {i}"})
+    stop = threading.Event()
+    errors = []
+    
+    def writer():
+        while not stop.is_set():
+            memory.delete(memory.add({"content": "churn"}))
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            memory.search({"content": "missing"}, limit=1000)
+    except RuntimeError as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+    
+    assert errors == []
+    memory.close()
@@ -0,0 +1,99 @@
+"""
+Tests for memory metrics and how memory systems report them.
+"""
+
+import time
+
+from anus.core.memory import ShortTermMemory, LongTermMemory, ShardedShortTermMemory
+from anus.core.memory.metrics import LATENCY_BUCKETS_MS, LatencyHistogram, MemoryMetrics
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = LatencyHistogram()
+    for elapsed_ms in [0.3] * 90 + [7.0] * 10:
+        histogram.record(elapsed_ms)
+    
+    snapshot = histogram.snapshot()
+    
+    assert snapshot["count"] == 100
+    assert snapshot["p50_ms"] == 0.5
+    assert snapshot["p99_ms"] == 7.0
+    assert snapshot["buckets"] == {"0.5": 90, "10.0": 10}
+
+
+def test_histogram_open_bucket_reports_maximum():
+    histogram = LatencyHistogram()
+    histogram.record(LATENCY_BUCKETS_MS[-1] * 3)
+    
+    assert histogram.percentile(0.5) == LATENCY_BUCKETS_MS[-1] * 3
+    assert histogram.snapshot()["buckets"] == {"+inf": 1}
+    assert LatencyHistogram().percentile(0.5) == 0.0
+
+
+def test_combine_adds_counters():
+    first, second = MemoryMetrics(), MemoryMetrics()
+    first.record_lookup(2, 1)
+    second.record_lookup(1, 1)
+    second.record_eviction("lru", 3)
+    second.record_bytes(read=10, written=20)
+    first.observe("get", time.perf_counter())
+    
+    snapshot = MemoryMetrics.combine([first, second]).snapshot()
+    
+    assert (snapshot["hits"], snapshot["misses"], snapshot["hit_ratio"]) == (3, 2, 0.6)
+    assert snapshot["evictions"] == {"ttl": 0, "lru": 3}
+    assert (snapshot["bytes_read"], snapshot["bytes_written"]) == (10, 20)
+    assert snapshot["latency"]["get"]["count"] == 1
+
+
+def test_short_term_counts_lookups_evictions_and_bytes():
+    memory = ShortTermMemory(capacity=2)
+    first = memory.add({"content": "one"})
+    memory.add({"content": "two"})
+    memory.get(first)
+    memory.get("missing")
+    memory.add({"content": "three"})
+    
+    metrics = memory.get_stats()["metrics"]
+    
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+    assert metrics["evictions"]["lru"] == 1
+    assert metrics["bytes_written"] > 0 and metrics["bytes_read"] > 0
+    assert metrics["latency"]["add"]["count"] == 3
+    assert metrics["latency"]["get"]["count"] == 2
+
+
+def test_short_term_counts_ttl_evictions():
+    memory = ShortTermMemory(ttl=0)
+    memory.add({"content": "one"})
+    time.sleep(0.01)
+    memory.search({})
+    
+    assert memory.get_stats()["metrics"]["evictions"]["ttl"] == 1
+
+
+def test_long_term_counts_lookups_and_bytes(tmp_path):
+    memory = LongTermMemory(storage_path=str(tmp_path))
+    identifier = memory.add({"content": "one"})
+    memory.get(identifier)
+    memory.get("missing")
+    memory.search({"content": "one"})
+    
+    metrics = memory.get_stats()["metrics"]
+    
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+    assert metrics["bytes_written"] > 0
+    assert metrics["latency"]["search"]["count"] == 1
+    memory.close()
+
+
+def test_sharded_memory_merges_shard_counters():
+    memory = ShardedShortTermMemory(shards=4, capacity=100)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(8)]
+    for identifier in ids:
+        memory.get(identifier)
+    
+    metrics = memory.get_stats()["metrics"]
+    
+    assert metrics["hits"] == 8
+    assert metrics["latency"]["get"]["count"] == 8
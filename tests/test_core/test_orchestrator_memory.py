@@ -0,0 +1,104 @@
+"""
+Tests for how AgentOrchestrator builds memories from configuration.
+"""
+
+import yaml
+import pytest
+
+from anus.core import orchestrator as orchestrator_module
+from anus.core.orchestrator import AgentOrchestrator
+
+
+class StubEmbeddingModel:
+    """Embeds text as a two-dimensional vector and counts calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_embedding(self, text, **kwargs):
+        self.calls += 1
+        return [float(len(text)), 1.0]
+
+
+class StubRouter:
+    """ModelRouter replacement that hands out one shared stub model."""
+    
+    model = None
+    
+    def __init__(self, config=None):
+        self.config = config
+    
+    def get_default_model(self):
+        return StubRouter.model
+
+
+def make_orchestrator(tmp_path, memory_config):
+    memory_config.setdefault("long_term", {}).setdefault("storage_path", str(tmp_path / "long_term"))
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"agent": {"mode": "single"}, "memory": memory_config}))
+    return AgentOrchestrator(str(path))
+
+
+@pytest.fixture
+def stub_router(monkeypatch):
+    StubRouter.model = StubEmbeddingModel()
+    monkeypatch.setattr(orchestrator_module, "ModelRouter", StubRouter)
+    yield StubRouter
+    StubRouter.model = None
+
+
+def test_vector_search_gets_a_shared_embedding_model(tmp_path, stub_router):
+    orchestrator = make_orchestrator(tmp_path, {
+        "short_term": {"vector_search": True},
+        "long_term": {"vector_search": True}
+    })
+    
+    assert orchestrator.short_term_memory.vector_index.embedding_model is stub_router.model
+    assert orchestrator.long_term_memory.vector_index.embedding_model is stub_router.model
+    
+    orchestrator.short_term_memory.add({"content": "abc"})
+    assert orchestrator.short_term_memory.search_similar("xyz", k=1)[0]["item"]["content"] == "abc"
+    orchestrator.shutdown()
+
+
+def test_vector_search_is_disabled_without_an_embedding_model(tmp_path, monkeypatch, caplog):
+    class FailingRouter(StubRouter):
+        def get_default_model(self):
+            raise ValueError("no provider")
+    
+    monkeypatch.setattr(orchestrator_module, "ModelRouter", FailingRouter)
+    
+    orchestrator = make_orchestrator(tmp_path, {
+        "short_term": {"vector_search": True},
+        "long_term": {"vector_search": True}
+    })
+    
+    assert orchestrator.short_term_memory.vector_index is None
+    assert orchestrator.long_term_memory.vector_index is None
+    assert "vector search disabled" in caplog.text.lower()
+    orchestrator.shutdown()
+
+
+def test_segments_backend_warns_about_ignored_options(tmp_path, caplog):
+    orchestrator = make_orchestrator(tmp_path, {
+        "long_term": {"backend": "segments", "write_behind": True, "compression": "zlib"}
+    })
+    
+    assert "does not support write_behind, compression" in caplog.text
+    orchestrator.shutdown()
+
+
+def test_default_options_do_not_warn(tmp_path, caplog):
+    orchestrator = make_orchestrator(tmp_path, {"long_term": {"backend": "segments"}})
+    
+    assert "does not support" not in caplog.text
+    orchestrator.shutdown()
+
+
+def test_sqlite_backend_warns_about_ignored_options(tmp_path, caplog):
+    orchestrator = make_orchestrator(tmp_path, {
+        "long_term": {"backend": "sqlite", "storage_path": str(tmp_path / "memory.db"), "text_search": True}
+    })
+    
+    assert "sqlite long-term memory backend does not support text_search" in caplog.text
+    orchestrator.shutdown()
@@ -0,0 +1,85 @@
+"""
+Tests for the memory query compiler and its use in ShortTermMemory.
+"""
+
+import time
+
+import pytest
+
+from anus.core.memory import ShortTermMemory
+from anus.core.memory.query import compile_query
+
+ITEM = {"type": "result", "score": 7, "done": True, "tags": ["a", "b"], "result": {"status": "ok"}, "note": None}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ({}, True),
+    ({"type": "result"}, True),
+    ({"type": "observation"}, False),
+    ({"result.status": "ok"}, True),
+    ({"result": {"status": "ok"}}, True),
+    ({"tags": ["a", "b"]}, True),
+    ({"missing": None}, False),
+    ({"note": None}, True),
+    ({"type": {"$eq": "result"}}, True),
+    ({"type": {"$ne": "result"}}, False),
+    ({"missing": {"$ne": "x"}}, True),
+    ({"score": {"$gt": 5, "$lte": 7}}, True),
+    ({"score": {"$lt": 7}}, False),
+    ({"score": {"$gt": "5"}}, False),
+    ({"done": {"$gt": 0}}, False),
+    ({"note": {"$gte": 0}}, False),
+    ({"type": {"$in": ["observation", "result"]}}, True),
+    ({"tags": {"$in": [["a", "b"]]}}, True),
+    ({"type": {"$nin": ["result"]}}, False),
+    ({"missing": {"$nin": ["x"]}}, True),
+    ({"type": {"$prefix": "res"}}, True),
+    ({"score": {"$prefix": "7"}}, False),
+    ({"note": {"$exists": True}}, True),
+    ({"missing": {"$exists": False}}, True),
+    ({"score": {"$not": {"$gt": 10}}}, True),
+    ({"score": {"$not": {"$gte": 5, "$lte": 10}}}, False),
+    ({"type": "result", "score": {"$gt": 10}}, False),
+])
+def test_operators(query, expected):
+    assert compile_query(query)(ITEM) is expected
+
+
+@pytest.mark.parametrize("query", [
+    {"type": {"$regex": "r.*"}},
+    {"type": {"$eq": "result", "plain": 1}},
+    {"type": {"$in": "result"}},
+    {"type": {"$prefix": 1}},
+    {"type": {"$not": "result"}},
+])
+def test_invalid_queries_raise(query):
+    with pytest.raises(ValueError):
+        compile_query(query)
+
+
+def test_compiled_queries_are_reused():
+    compiled = compile_query({"type": "result"})
+    
+    assert compile_query(compiled) is compiled
+    assert not compiled.without(compiled.conditions)
+
+
+def test_short_term_search_uses_operators_and_indexes():
+    memory = ShortTermMemory(indexes=["type"])
+    ids = [memory.add({"type": kind, "score": score}) for kind, score in [("a", 1), ("b", 5), ("a", 9), ("c", 9)]]
+    
+    indexed = memory.search({"type": {"$in": ["a", "b"]}, "score": {"$gte": 5}}, limit=10)
+    
+    assert {result["id"] for result in indexed} == {ids[1], ids[2]}
+    assert {result["id"] for result in memory.search({"type": {"$not": {"$eq": "a"}}}, limit=10)} == {ids[1], ids[3]}
+
+
+def test_short_term_search_checks_creation_time():
+    memory = ShortTermMemory()
+    old = memory.add({"content": "old"})
+    memory.creation_times[old] -= 60
+    new = memory.add({"content": "new"})
+    
+    results = memory.search({"_meta.created_at": {"$gte": time.time() - 30}}, limit=10)
+    
+    assert [result["id"] for result in results] == [new]
@@ -0,0 +1,67 @@
+"""
+Tests for HybridRetriever.
+"""
+
+import time
+
+from anus.core.memory import HybridRetriever, LongTermMemory, ShortTermMemory
+
+
+class CountingEmbeddingModel:
+    """Embeds text as a two-dimensional vector and counts calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_embedding(self, text, **kwargs):
+        self.calls += 1
+        return [float(len(text)), 1.0]
+
+
+def test_query_is_embedded_once_per_model(tmp_path):
+    model = CountingEmbeddingModel()
+    short_term = ShortTermMemory(vector_search=True, embedding_model=model)
+    long_term = LongTermMemory(storage_path=str(tmp_path), vector_search=True, embedding_model=model)
+    short_term.add({"content": "recent note"})
+    long_term.add({"content": "older note"})
+    model.calls = 0
+    
+    result = HybridRetriever([short_term, long_term]).retrieve("note", token_budget=100)
+    
+    assert model.calls == 1
+    assert {item["item"]["content"] for item in result["items"]} == {"recent note", "older note"}
+    long_term.close()
+
+
+def test_query_vector_skips_embedding(tmp_path):
+    model = CountingEmbeddingModel()
+    short_term = ShortTermMemory(vector_search=True, embedding_model=model)
+    short_term.add({"content": "note"})
+    model.calls = 0
+    
+    result = HybridRetriever([short_term]).retrieve("note", token_budget=100, query_vector=[4.0, 1.0])
+    
+    assert model.calls == 0
+    assert [item["item"]["content"] for item in result["items"]] == ["note"]
+
+
+
+
+
+def test_meta_filters_keep_short_term_keyword_scores(tmp_path):
+    short_term = ShortTermMemory(text_search=True)
+    long_term = LongTermMemory(storage_path=str(tmp_path), text_search=True)
+    long_term.add({"content": "old deploy note"})
+    time.sleep(0.01)
+    cutoff = time.time()
+    recent_long = long_term.add({"content": "new deploy note"})
+    recent_short = short_term.add({"content": "fresh deploy note"})
+    
+    retriever = HybridRetriever([short_term, long_term], recency_weight=0.0)
+    result = retriever.retrieve("deploy", token_budget=100, filters={"_meta.created_at": {"$gte": cutoff}})
+    
+    scores = {item["id"]: item["score"] for item in result["items"]}
+    assert set(scores) == {recent_long, recent_short}
+    # Without recency, only a keyword match scores above zero
+    assert all(score > 0 for score in scores.values())
+    long_term.close()
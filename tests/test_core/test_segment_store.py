@@ -0,0 +1,144 @@
+"""
+Tests for SegmentMemory.
+"""
+
+import os
+import threading
+
+import pytest
+
+from anus.core.memory import SegmentMemory
+
+
+@pytest.fixture
+def storage_path(tmp_path):
+    return str(tmp_path / "segments")
+
+
+def segment_files(storage_path):
+    return sorted(name for name in os.listdir(storage_path) if name.endswith(SegmentMemory.SEGMENT_SUFFIX))
+
+
+def test_items_survive_reopen(storage_path):
+    memory = SegmentMemory(storage_path=storage_path)
+    first = memory.add({"content": "one"})
+    second = memory.add({"content": "two"})
+    memory.update(first, {"content": "one again"})
+    memory.delete(second)
+    memory.close()
+    
+    memory = SegmentMemory(storage_path=storage_path)
+    assert memory.get(first)["content"] == "one again"
+    assert memory.get(second) is None
+    memory.close()
+
+
+def test_corrupt_record_in_the_middle_keeps_later_records(storage_path):
+    memory = SegmentMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(5)]
+    memory.close()
+    
+    path = os.path.join(storage_path, segment_files(storage_path)[0])
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    lines[1] = b"{not json" + b"x" * (len(lines[1]) - 10) + b"\n"
+    with open(path, "wb") as f:
+        f.writelines(lines)
+    size = os.path.getsize(path)
+    
+    memory = SegmentMemory(storage_path=storage_path)
+    assert memory.get(ids[1]) is None
+    assert [memory.get(identifier)["content"] for identifier in ids[:1] + ids[2:]] == [
+        "item 0", "item 2", "item 3", "item 4"
+    ]
+    assert os.path.getsize(path) == size
+    assert memory.get_stats()["dead_bytes"] == len(lines[1])
+    memory.close()
+
+
+def test_partial_record_at_the_end_is_truncated(storage_path):
+    memory = SegmentMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(3)]
+    memory.close()
+    
+    path = os.path.join(storage_path, segment_files(storage_path)[0])
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b'{"op":"put","id":"half')
+    
+    memory = SegmentMemory(storage_path=storage_path)
+    assert os.path.getsize(path) == size
+    assert all(memory.get(identifier) is not None for identifier in ids)
+    new_id = memory.add({"content": "after recovery"})
+    memory.close()
+    
+    memory = SegmentMemory(storage_path=storage_path)
+    assert memory.get(new_id)["content"] == "after recovery"
+    memory.close()
+
+
+def test_compaction_keeps_live_records_and_reclaims_space(storage_path):
+    memory = SegmentMemory(storage_path=storage_path, segment_size=512)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(20)]
+    for identifier in ids[:10]:
+        memory.delete(identifier)
+    for identifier in ids[10:15]:
+        memory.update(identifier, {"content": "updated"})
+    
+    memory.compact()
+    
+    stats = memory.get_stats()
+    assert stats["item_count"] == 10
+    assert stats["dead_bytes"] == 0
+    assert [memory.get(identifier)["content"] for identifier in ids[10:15]] == ["updated"] * 5
+    memory.close()
+    
+    memory = SegmentMemory(storage_path=storage_path, segment_size=512)
+    assert memory.get_stats()["item_count"] == 10
+    assert all(memory.get(identifier) is None for identifier in ids[:10])
+    assert memory.get(ids[19])["content"] == "item 19"
+    memory.close()
+
+
+def test_reads_and_writes_proceed_during_compaction(storage_path, monkeypatch):
+    memory = SegmentMemory(storage_path=storage_path)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(10)]
+    memory.delete(ids[0])
+    
+    copying = threading.Event()
+    release = threading.Event()
+    copy_records = memory._copy_records
+    
+    def slow_copy(*args, **kwargs):
+        copying.set()
+        assert release.wait(5)
+        return copy_records(*args, **kwargs)
+    
+    monkeypatch.setattr(memory, "_copy_records", slow_copy)
+    compactor = threading.Thread(target=memory.compact)
+    compactor.start()
+    assert copying.wait(5)
+    
+    # The store lock is free while records are copied
+    assert memory.get(ids[5])["content"] == "item 5"
+    memory.update(ids[1], {"content": "changed during compaction"})
+    memory.delete(ids[2])
+    added = memory.add({"content": "added during compaction"})
+    
+    release.set()
+    compactor.join(5)
+    assert not compactor.is_alive()
+    
+    def check(current):
+        assert current.get(ids[1])["content"] == "changed during compaction"
+        assert current.get(ids[2]) is None
+        assert current.get(added)["content"] == "added during compaction"
+        assert current.get(ids[9])["content"] == "item 9"
+        assert current.get_stats()["item_count"] == 9
+    
+    check(memory)
+    memory.close()
+    
+    memory = SegmentMemory(storage_path=storage_path)
+    check(memory)
+    memory.close()
@@ -0,0 +1,80 @@
+"""
+Tests for ShardedShortTermMemory.
+"""
+
+import threading
+
+from anus.core.memory import ShardedShortTermMemory
+
+
+class CountingEmbeddingModel:
+    """Embeds text as a two-dimensional vector and counts calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_embedding(self, text, **kwargs):
+        self.calls += 1
+        return [float(len(text)), 1.0]
+
+
+def test_text_query_is_embedded_once_for_all_shards():
+    model = CountingEmbeddingModel()
+    memory = ShardedShortTermMemory(shards=4, vector_search=True, embedding_model=model)
+    for i in range(8):
+        memory.add({"content": "x" * (i + 1)})
+    model.calls = 0
+    
+    results = memory.search_similar("xxx", k=3)
+    
+    assert model.calls == 1
+    assert len(results) == 3
+    assert results == sorted(results, key=lambda result: result["score"], reverse=True)
+
+
+def test_empty_query_embedding_returns_no_results():
+    model = CountingEmbeddingModel()
+    memory = ShardedShortTermMemory(shards=2, vector_search=True, embedding_model=model)
+    memory.add({"content": "abc"})
+    model.get_embedding = lambda text, **kwargs: []
+    
+    assert memory.search_similar("abc") == []
+
+
+def test_capacity_is_checked_once_for_the_total(caplog):
+    ShardedShortTermMemory(capacity=1000, shards=16)
+    
+    assert "quite small" not in caplog.text
+    
+    caplog.clear()
+    ShardedShortTermMemory(capacity=50, shards=4)
+    
+    assert caplog.text.count("quite small") == 1
+    assert "capacity of 50 " in caplog.text
+
+
+def test_concurrent_workers_add_get_delete_and_search():
+    memory = ShardedShortTermMemory(capacity=10000, shards=8)
+    errors = []
+    
+    def worker(worker_id):
+        try:
+            ids = [memory.add({"content": f"{worker_id}-{i}", "worker": worker_id}) for i in range(200)]
+            for i, identifier in enumerate(ids):
+                assert memory.get(identifier)["content"] == f"{worker_id}-{i}"
+                memory.search({"worker": worker_id}, limit=5)
+            for identifier in ids[::2]:
+                assert memory.delete(identifier)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert memory.get_stats()["current_size"] == 8 * 100
+    for worker_id in range(8):
+        assert len(memory.search({"worker": worker_id}, limit=1000)) == 100
@@ -0,0 +1,120 @@
+"""
+Tests for SharedShortTermMemory.
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from anus.core.memory import SharedShortTermMemory
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "table")
+
+
+@pytest.fixture
+def memory(path):
+    memory = SharedShortTermMemory(path=path, capacity=64, slot_size=512, max_probe=8)
+    yield memory
+    memory.unlink()
+
+
+def add_in_child(path, count):
+    memory = SharedShortTermMemory(path=path)
+    for i in range(count):
+        memory.put(f"child-{i}", {"content": f"child {i}"})
+    memory.close()
+
+
+def test_put_get_update_delete(memory):
+    identifier = memory.add({"content": "one", "tags": ["a"]})
+    
+    assert memory.get(identifier) == {"content": "one", "tags": ["a"]}
+    assert memory.update(identifier, {"content": "two"})
+    assert memory.get(identifier) == {"content": "two"}
+    assert memory.delete(identifier)
+    assert memory.get(identifier) is None
+    assert not memory.delete(identifier)
+    assert not memory.update(identifier, {"content": "three"})
+
+
+def test_put_replaces_existing_item(memory):
+    memory.put("key", {"content": "old"})
+    memory.put("key", {"content": "new"})
+    
+    assert memory.get("key") == {"content": "new"}
+    assert memory.get_stats()["current_size"] == 1
+
+
+def test_items_larger_than_a_slot_are_rejected(memory):
+    with pytest.raises(ValueError):
+        memory.add({"content": "x" * memory.slot_size})
+
+
+def test_search_returns_newest_first(memory):
+    for i in range(5):
+        memory.put(f"item-{i}", {"content": f"item {i}", "kind": "even" if i % 2 == 0 else "odd"})
+        time.sleep(0.001)
+    
+    results = memory.search({"kind": "even"}, limit=2)
+    
+    assert [result["id"] for result in results] == ["item-4", "item-2"]
+
+
+def test_expired_items_are_not_returned(path):
+    memory = SharedShortTermMemory(path=path, capacity=16, ttl=0, slot_size=512)
+    memory.put("key", {"content": "gone"})
+    time.sleep(0.01)
+    
+    assert memory.get("key") is None
+    assert memory.search({}) == []
+    memory.unlink()
+
+
+def test_full_window_evicts_least_recently_accessed(path):
+    memory = SharedShortTermMemory(path=path, capacity=2, slot_size=256, max_probe=2)
+    memory.put("a", {"content": "a"})
+    time.sleep(0.001)
+    memory.put("b", {"content": "b"})
+    time.sleep(0.001)
+    memory.get("a")
+    
+    memory.put("c", {"content": "c"})
+    
+    assert memory.get("a") is not None
+    assert memory.get("b") is None
+    assert memory.get("c") is not None
+    memory.unlink()
+
+
+def test_second_instance_attaches_with_existing_geometry(memory, path):
+    memory.put("key", {"content": "shared"})
+    
+    other = SharedShortTermMemory(path=path, capacity=8, slot_size=128)
+    
+    assert (other.capacity, other.slot_size, other.max_probe) == (64, 512, 8)
+    assert other.get("key") == {"content": "shared"}
+    other.clear()
+    assert memory.get("key") is None
+    other.close()
+
+
+def test_other_processes_see_the_same_items(memory, path):
+    process = multiprocessing.get_context("fork").Process(target=add_in_child, args=(path, 10))
+    process.start()
+    process.join(10)
+    
+    assert process.exitcode == 0
+    assert memory.get("child-3") == {"content": "child 3"}
+    assert memory.get_stats()["current_size"] == 10
+
+
+def test_rejects_files_that_are_not_tables(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"x" * 128)
+    
+    with pytest.raises(ValueError):
+        SharedShortTermMemory(path=str(path))
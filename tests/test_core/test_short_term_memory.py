@@ -0,0 +1,112 @@
+"""
+Tests for ShortTermMemory eviction, expiry and indexes.
+"""
+
+import time
+
+from anus.core.memory import ShortTermMemory
+
+
+def test_least_recently_used_item_is_evicted():
+    evicted = []
+    memory = ShortTermMemory(capacity=3, on_evict=lambda identifier, item, cause: evicted.append((identifier, cause)))
+    ids = [memory.add({"content": f"item {i}"}) for i in range(3)]
+    memory.get(ids[0])
+    
+    memory.add({"content": "item 3"})
+    
+    assert memory.get(ids[1]) is None
+    assert memory.get(ids[0]) is not None
+    assert evicted == [(ids[1], "lru")]
+
+
+def test_expired_items_are_pruned(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    evicted = []
+    memory = ShortTermMemory(ttl=60, on_evict=lambda identifier, item, cause: evicted.append((identifier, cause)))
+    first = memory.add({"content": "first"})
+    clock[0] += 30
+    second = memory.add({"content": "second"})
+    memory.get(first)
+    
+    clock[0] += 31
+    
+    assert [result["id"] for result in memory.search({}, limit=10)] == [second]
+    assert evicted == [(first, "ttl")]
+    assert list(memory.lru_queue) == [second]
+
+
+def test_indexed_search_matches_a_full_scan():
+    indexed = ShortTermMemory(indexes=["type", "result.status"])
+    plain = ShortTermMemory()
+    for i in range(30):
+        item = {"type": ["a", "b", "c"][i % 3], "result": {"status": "ok" if i % 2 else "failed"}, "n": i}
+        identifier = indexed.add(item)
+        plain.put(identifier, dict(item))
+    
+    for query in ({"type": "a"}, {"type": "b", "result.status": "ok"}, {"type": "z"}, {"type": "c", "n": 5}):
+        assert {r["id"] for r in indexed.search(query, limit=100)} == {r["id"] for r in plain.search(query, limit=100)}
+
+
+def test_indexes_follow_updates_and_deletes():
+    memory = ShortTermMemory(indexes=["type"])
+    first = memory.add({"type": "a"})
+    second = memory.add({"type": "a"})
+    
+    memory.update(first, {"type": "b"})
+    memory.delete(second)
+    
+    assert [result["id"] for result in memory.search({"type": "b"})] == [first]
+    assert memory.search({"type": "a"}) == []
+    assert "a" not in memory.field_index.postings["type"]
+
+
+def test_byte_budget_evicts_least_recently_used():
+    memory = ShortTermMemory(max_bytes=4000)
+    ids = [memory.add({"content": "x" * 500, "n": i}) for i in range(20)]
+    
+    stats = memory.get_stats()
+    assert stats["bytes_used"] <= 4000
+    assert 0 < stats["current_size"] < 20
+    assert memory.get(ids[-1]) is not None
+    assert memory.get(ids[0]) is None
+    assert stats["bytes_used"] == sum(memory.item_sizes.values())
+
+
+def test_item_larger_than_budget_is_kept_alone():
+    memory = ShortTermMemory(max_bytes=1000)
+    memory.add({"content": "small"})
+    
+    large = memory.add({"content": "x" * 5000})
+    
+    assert list(memory.items) == [large]
+
+
+def test_byte_accounting_follows_updates_and_deletes():
+    memory = ShortTermMemory(max_bytes=10 ** 6)
+    identifier = memory.add({"content": "x" * 100})
+    small = memory.get_stats()["bytes_used"]
+    
+    memory.update(identifier, {"content": "x" * 10000})
+    assert memory.get_stats()["bytes_used"] > small
+    
+    memory.delete(identifier)
+    assert memory.get_stats()["bytes_used"] == 0
+
+
+def test_duplicate_content_is_stored_once_and_reference_counted():
+    memory = ShortTermMemory(deduplicate=True)
+    first = memory.add({"content": "shared"})
+    second = memory.add({"content": "shared"})
+    other = memory.add({"content": "different"})
+    
+    assert first == second
+    assert other != first
+    assert memory.get_stats()["current_size"] == 2
+    
+    assert memory.delete(first)
+    assert memory.get(first) == {"content": "shared"}
+    assert memory.delete(first)
+    assert memory.get(first) is None
+    assert memory.get_stats()["current_size"] == 1
@@ -0,0 +1,78 @@
+"""
+Tests for short-term memory snapshots and warm restore.
+"""
+
+import pytest
+
+from anus.core.memory import ShortTermMemory, ShardedShortTermMemory
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "short_term.snap")
+
+
+def test_restore_keeps_items_times_and_recency(snapshot_path):
+    memory = ShortTermMemory(capacity=10)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(3)]
+    memory.get(ids[0])
+    
+    assert memory.snapshot(snapshot_path) == 3
+    
+    restored = ShortTermMemory(capacity=10)
+    assert restored.restore(snapshot_path) == 3
+    assert restored.creation_times == memory.creation_times
+    assert restored.access_times == memory.access_times
+    assert list(restored.lru_queue) == [ids[1], ids[2], ids[0]]
+    assert restored.get(ids[2]) == {"content": "item 2"}
+
+
+def test_restore_drops_expired_items_and_applies_capacity(snapshot_path):
+    memory = ShortTermMemory(capacity=10, ttl=3600)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(4)]
+    memory.creation_times[ids[0]] -= 7200
+    memory.snapshot(snapshot_path)
+    
+    restored = ShortTermMemory(capacity=2, ttl=3600)
+    
+    assert restored.restore(snapshot_path) == 2
+    assert set(restored.items) == {ids[2], ids[3]}
+
+
+def test_restore_keeps_reference_counts(snapshot_path):
+    memory = ShortTermMemory(deduplicate=True)
+    identifier = memory.add({"content": "shared"})
+    assert memory.add({"content": "shared"}) == identifier
+    memory.snapshot(snapshot_path)
+    
+    restored = ShortTermMemory(deduplicate=True)
+    restored.restore(snapshot_path)
+    
+    assert restored.ref_counts[identifier] == 2
+    assert restored.delete(identifier)
+    assert restored.get(identifier) == {"content": "shared"}
+    assert restored.delete(identifier)
+    assert restored.get(identifier) is None
+
+
+@pytest.mark.parametrize("contents", [b"", b"not a snapshot at all", b"ANUSSTM1" + b"\0" * 8 + b"\1\0\0\0"])
+def test_invalid_or_truncated_files_are_rejected(snapshot_path, contents):
+    with open(snapshot_path, "wb") as f:
+        f.write(contents)
+    
+    with pytest.raises(ValueError):
+        ShortTermMemory().restore(snapshot_path)
+
+
+def test_sharded_snapshot_restores_with_a_different_shard_count(snapshot_path):
+    memory = ShardedShortTermMemory(capacity=100, shards=4, deduplicate=True)
+    ids = [memory.add({"content": f"item {i}"}) for i in range(10)]
+    memory.add({"content": "item 0"})
+    memory.snapshot(snapshot_path)
+    
+    restored = ShardedShortTermMemory(capacity=100, shards=3, deduplicate=True)
+    
+    assert restored.restore(snapshot_path) == 10
+    assert all(restored.get(identifier) is not None for identifier in ids)
+    restored.delete(ids[0])
+    assert restored.get(ids[0]) == {"content": "item 0"}
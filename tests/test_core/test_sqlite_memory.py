@@ -0,0 +1,100 @@
+"""
+Tests for SQLiteMemory and its SQL translation of queries.
+"""
+
+import pytest
+
+from anus.core.memory import SQLiteMemory
+from anus.core.memory.query import compile_query
+
+ITEMS = [
+    {"tag": '["a"]'},
+    {"tag": ["a"]},
+    {"tag": "a"},
+    {"tag": {"a": 1}},
+    {"tag": '{"a": 1}'},
+    {"tag": 1},
+    {"tag": 1.0},
+    {"tag": "1"},
+    {"tag": True},
+    {"tag": False},
+    {"tag": 0},
+    {"tag": None},
+    {"other": "no tag"},
+    {"result": {"status": "done", "score": 3}},
+    {"result": {"status": "failed", "score": 1}},
+]
+
+QUERIES = [
+    {"tag": '["a"]'},
+    {"tag": ["a"]},
+    {"tag": "a"},
+    {"tag": '{"a": 1}'},
+    {"tag": 1},
+    {"tag": "1"},
+    {"tag": True},
+    {"tag": 0},
+    {"tag": None},
+    {"tag": {"$in": ["a", '["a"]', 1]}},
+    {"tag": {"$in": ["1"]}},
+    {"tag": {"$in": []}},
+    {"tag": {"$gte": 1}},
+    {"tag": {"$prefix": "["}},
+    {"tag": {"$exists": False}},
+    {"tag": {"$ne": "a"}},
+    {"result.status": "done"},
+    {"result.score": {"$gt": 1}},
+]
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = SQLiteMemory(storage_path=str(tmp_path / "memory.db"), indexed_paths=["tag", "result.status"])
+    for item in ITEMS:
+        memory.add(item)
+    yield memory
+    memory.close()
+
+
+def ids_by_python(memory, query):
+    compiled = compile_query(query)
+    return sorted(result["id"] for result in memory.iter_search({}) if compiled.matches(result["item"]))
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=repr)
+def test_sql_matches_python_semantics(memory, query):
+    assert sorted(result["id"] for result in memory.search(query, limit=100)) == ids_by_python(memory, query)
+    assert sorted(result["id"] for result in memory.iter_search(query)) == ids_by_python(memory, query)
+
+
+def test_json_text_does_not_match_containers(memory):
+    results = memory.search({"tag": '["a"]'}, limit=100)
+    
+    assert [result["item"]["tag"] for result in results] == ['["a"]']
+
+
+def test_exact_conditions_push_limit_down(memory):
+    where, params, residual = memory._compile_query({"tag": "a", "result.status": "done"})
+    
+    assert not residual.conditions
+    assert len(memory.search({"tag": {"$in": ["a", 1]}}, limit=2)) == 2
+
+
+def test_equality_uses_expression_index(memory):
+    where, params, _ = memory._compile_query({"tag": "a"})
+    plan = memory.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM items WHERE " + " AND ".join(where), params
+    ).fetchall()
+    
+    assert any("idx_path_tag" in row[-1] for row in plan)
+
+
+def test_similar_paths_get_distinct_indexes(tmp_path):
+    memory = SQLiteMemory(storage_path=str(tmp_path / "memory.db"), indexed_paths=["a.b", "a_b"])
+    
+    names = [row[0] for row in memory.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_path_%'"
+    )]
+    
+    assert len(names) == 2
+    memory.close()
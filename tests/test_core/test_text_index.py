@@ -0,0 +1,89 @@
+"""
+Tests for the BM25 text index and search_text.
+"""
+
+import math
+
+import pytest
+
+from anus.core.memory import LongTermMemory, ShortTermMemory
+from anus.core.memory.text_index import TextIndex, default_tokenizer
+
+DOCS = {
+    "a": {"content": "deploy the web service to staging"},
+    "b": {"content": "rollback the web service"},
+    "c": {"content": "write the release notes for the deploy deploy deploy"},
+    "d": {"content": "unrelated grocery list", "tags": ["deploy"]},
+    "e": {"content": "", "meta": {"title": "Staging checklist"}},
+}
+
+
+def reference_bm25(docs, query, k1=1.5, b=0.75):
+    tokens = {identifier: default_tokenizer(text) for identifier, text in docs.items()}
+    tokens = {identifier: terms for identifier, terms in tokens.items() if terms}
+    average = sum(len(terms) for terms in tokens.values()) / len(tokens)
+    scores = {}
+    for term in set(default_tokenizer(query)):
+        containing = [identifier for identifier, terms in tokens.items() if term in terms]
+        idf = math.log(1 + (len(tokens) - len(containing) + 0.5) / (len(containing) + 0.5))
+        for identifier in containing:
+            frequency = tokens[identifier].count(term)
+            norm = k1 * (1 - b + b * len(tokens[identifier]) / average)
+            scores[identifier] = scores.get(identifier, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+    return scores
+
+
+@pytest.mark.parametrize("query", ["deploy", "web service", "staging deploy", "nothing matches"])
+def test_scores_match_reference_bm25(query):
+    index = TextIndex()
+    for identifier, item in DOCS.items():
+        index.add(identifier, item)
+    texts = {identifier: item["content"] for identifier, item in DOCS.items()}
+    
+    expected = reference_bm25(texts, query)
+    results = index.search(query, k=10)
+    
+    assert [identifier for identifier, _ in results] == sorted(expected, key=lambda i: -expected[i])
+    for identifier, score in results:
+        assert score == pytest.approx(expected[identifier], rel=1e-5)
+
+
+def test_dotted_fields_and_string_lists_are_indexed():
+    index = TextIndex(text_fields=["tags", "meta.title"])
+    for identifier, item in DOCS.items():
+        index.add(identifier, item)
+    
+    assert [identifier for identifier, _ in index.search("deploy")] == ["d"]
+    assert [identifier for identifier, _ in index.search("checklist")] == ["e"]
+
+
+def test_removed_and_replaced_documents_survive_compaction():
+    index = TextIndex()
+    for i in range(10):
+        index.add(str(i), {"content": f"note {i}"})
+    for i in range(7):
+        index.remove(str(i))
+    index.add("9", {"content": "replaced text"})
+    
+    assert sorted(identifier for identifier, _ in index.search("note")) == ["7", "8"]
+    assert [identifier for identifier, _ in index.search("replaced")] == ["9"]
+    assert len(index) == 3
+
+
+def test_search_text_requires_the_index():
+    with pytest.raises(NotImplementedError):
+        ShortTermMemory().search_text("anything")
+
+
+def test_long_term_postings_are_reused_after_reopen(tmp_path, monkeypatch):
+    memory = LongTermMemory(storage_path=str(tmp_path), text_search=True)
+    ids = {memory.add({"content": text}): text for text in ("alpha beta", "beta gamma", "gamma delta")}
+    memory.close()
+    
+    added = []
+    monkeypatch.setattr(TextIndex, "add", lambda self, identifier, item: added.append(identifier))
+    memory = LongTermMemory(storage_path=str(tmp_path), text_search=True, index_in_memory=False)
+    
+    assert added == []
+    assert {ids[result["id"]] for result in memory.search_text("gamma")} == {"beta gamma", "gamma delta"}
+    memory.close()
@@ -0,0 +1,92 @@
+"""
+Tests for TieredMemory.
+"""
+
+import threading
+
+import pytest
+
+from anus.core.memory import LongTermMemory, ShardedShortTermMemory, ShortTermMemory, TieredMemory
+
+
+@pytest.fixture
+def cold(tmp_path):
+    memory = LongTermMemory(storage_path=str(tmp_path))
+    yield memory
+    memory.close()
+
+
+def test_evicted_items_are_written_back(cold):
+    tiered = TieredMemory(ShortTermMemory(capacity=2), cold)
+    ids = [tiered.add({"content": f"item {i}"}) for i in range(3)]
+    
+    assert cold.get(ids[0])["content"] == "item 0"
+    assert tiered.get(ids[0])["content"] == "item 0"
+    stats = tiered.get_stats()
+    assert stats["evictions_written_back"] >= 1
+    assert stats["demotions"] == 0
+
+
+def test_promoted_items_are_not_written_back_unchanged(cold):
+    identifier = cold.add({"content": "cold item"})
+    tiered = TieredMemory(ShortTermMemory(capacity=1), cold, promote_after=1)
+    
+    assert tiered.get(identifier)["content"] == "cold item"
+    assert tiered.get_stats()["promotions"] == 1
+    tiered.add({"content": "pushes the promoted item out"})
+    
+    assert tiered.get_stats()["write_backs"] == 0
+
+
+def test_rebalance_counts_demotions_separately(cold):
+    tiered = TieredMemory(ShortTermMemory(capacity=10), cold, demote_below=2)
+    rare = tiered.add({"content": "rare"})
+    frequent = tiered.add({"content": "frequent"})
+    tiered.get(frequent)
+    
+    assert tiered.rebalance() == 1
+    
+    stats = tiered.get_stats()
+    assert stats["demotions"] == 1
+    assert stats["evictions_written_back"] == 0
+    assert stats["write_backs"] == 1
+    assert cold.get(rare)["content"] == "rare"
+
+
+def test_concurrent_evictions_are_all_counted(cold):
+    hot = ShardedShortTermMemory(capacity=8, shards=4)
+    tiered = TieredMemory(hot, cold)
+    
+    def writer(worker):
+        for i in range(50):
+            identifier = f"{worker}-{i}"
+            # Writes straight to the hot tier evict without taking the facade lock
+            hot.put(identifier, {"content": identifier})
+    
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    stats = tiered.get_stats()
+    evicted = 200 - stats["hot"]["current_size"]
+    assert stats["evictions_written_back"] == evicted
+    assert stats["write_backs"] == evicted
+    assert len(cold.search({}, limit=1000)) == evicted
+
+
+def test_search_prefers_hot_copies_over_stale_cold_ones(cold):
+    hot = ShortTermMemory(capacity=10)
+    tiered = TieredMemory(hot, cold)
+    identifier = tiered.add({"content": "fresh", "kind": "note"})
+    tiered.flush()
+    tiered.update(identifier, {"content": "updated", "kind": "note"})
+    cold_only = cold.add({"content": "cold", "kind": "note"})
+    
+    results = tiered.search({"kind": "note"}, limit=10)
+    
+    assert sorted(result["id"] for result in results) == sorted([identifier, cold_only])
+    assert next(result for result in results if result["id"] == identifier)["item"]["content"] == "updated"
+    assert identifier in hot
+    assert cold_only not in hot
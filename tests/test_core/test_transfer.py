@@ -0,0 +1,124 @@
+"""
+Tests for streaming memory export and import.
+"""
+
+import io
+import json
+
+import pytest
+
+from anus.core.memory import (
+    LongTermMemory, SegmentMemory, ShardedShortTermMemory, SharedShortTermMemory, ShortTermMemory, SQLiteMemory
+)
+
+STORES = {
+    "short_term": lambda path: ShortTermMemory(),
+    "sharded": lambda path: ShardedShortTermMemory(shards=3),
+    "shared": lambda path: SharedShortTermMemory(path=str(path) + ".table", capacity=256),
+    "long_term": lambda path: LongTermMemory(storage_path=str(path / "long_term")),
+    "segments": lambda path: SegmentMemory(storage_path=str(path / "segments")),
+    "sqlite": lambda path: SQLiteMemory(storage_path=str(path / "memory.db")),
+}
+
+ITEMS = [{"content": f"item {i}", "n": i, "nested": {"even": i % 2 == 0}} for i in range(25)]
+
+
+class ForwardOnly(io.RawIOBase):
+    """Readable stream that cannot seek or peek, like a pipe."""
+    
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        chunk = self.data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def contents(memory):
+    return {
+        result["id"]: {key: value for key, value in result["item"].items() if key != "_meta"}
+        for result in memory.iter_search({})
+    }
+
+
+@pytest.mark.parametrize("target_name", sorted(STORES))
+@pytest.mark.parametrize("source_name", sorted(STORES))
+def test_round_trip_keeps_identifiers_and_items(tmp_path, source_name, target_name):
+    source = STORES[source_name](tmp_path / "source")
+    target = STORES[target_name](tmp_path / "target")
+    for item in ITEMS:
+        source.add(dict(item))
+    buffer = io.BytesIO()
+    
+    assert source.export(buffer, chunk_size=7) == len(ITEMS)
+    buffer.seek(0)
+    assert target.import_(buffer, chunk_size=4) == len(ITEMS)
+    
+    assert contents(target) == contents(source)
+    source.close()
+    target.close()
+
+
+def test_gzip_export_is_detected_on_forward_only_streams(tmp_path):
+    source = ShortTermMemory()
+    ids = [source.add(dict(item)) for item in ITEMS]
+    buffer = io.BytesIO()
+    source.export(buffer, compression="gzip")
+    
+    target = ShortTermMemory()
+    target.import_(ForwardOnly(buffer.getvalue()))
+    
+    assert buffer.getvalue()[:2] == b"\x1f\x8b"
+    assert sorted(target.items) == sorted(ids)
+
+
+def test_progress_reports_running_counts():
+    source = ShortTermMemory()
+    for item in ITEMS:
+        source.add(dict(item))
+    buffer = io.BytesIO()
+    exported, imported = [], []
+    
+    source.export(buffer, chunk_size=10, progress=exported.append)
+    buffer.seek(0)
+    ShortTermMemory().import_(buffer, chunk_size=10, progress=imported.append)
+    
+    assert exported == imported == [10, 20, 25]
+
+
+def test_long_term_import_survives_reopen(tmp_path):
+    source = ShortTermMemory()
+    ids = [source.add(dict(item)) for item in ITEMS]
+    buffer = io.BytesIO()
+    source.export(buffer)
+    buffer.seek(0)
+    
+    target = LongTermMemory(storage_path=str(tmp_path))
+    target.import_(buffer)
+    target.close()
+    
+    reopened = LongTermMemory(storage_path=str(tmp_path))
+    assert all(reopened.get(identifier) is not None for identifier in ids)
+    assert len(reopened.search({"nested.even": True}, limit=100)) == 13
+    reopened.close()
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not json\n",
+    json.dumps({"format": "other"}).encode() + b"\n",
+    json.dumps({"format": "anus-memory", "version": 99}).encode() + b"\n",
+    json.dumps({"format": "anus-memory", "version": 1}).encode() + b'\n{"id": "x", "item": 3}\n',
+])
+def test_invalid_exports_are_rejected(data):
+    with pytest.raises(ValueError):
+        ShortTermMemory().import_(io.BytesIO(data))
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        ShortTermMemory().export(io.BytesIO(), compression="zip")
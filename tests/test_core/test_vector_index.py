@@ -0,0 +1,59 @@
+"""
+Tests for the NumPy-backed vector index.
+"""
+
+import math
+import random
+
+import pytest
+
+from anus.core.memory.vector_index import VectorIndex
+
+
+def cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+@pytest.fixture
+def vectors():
+    generator = random.Random(7)
+    return {f"item-{i}": [generator.uniform(-1, 1) for _ in range(16)] for i in range(50)}
+
+
+def test_top_k_matches_brute_force_cosine(vectors):
+    index = VectorIndex(initial_rows=4)
+    for identifier, vector in vectors.items():
+        index.add(identifier, vector)
+    query = [0.5] * 8 + [-0.5] * 8
+    
+    results = index.query(query, k=5)
+    
+    expected = sorted(vectors, key=lambda identifier: cosine(vectors[identifier], query), reverse=True)[:5]
+    assert [identifier for identifier, _ in results] == expected
+    for identifier, score in results:
+        assert score == pytest.approx(cosine(vectors[identifier], query), abs=1e-5)
+
+
+def test_deleted_items_drop_out_of_results(vectors):
+    index = VectorIndex()
+    for identifier, vector in vectors.items():
+        index.add(identifier, vector)
+    
+    best = index.query(vectors["item-3"], k=1)[0][0]
+    assert best == "item-3"
+    index.remove("item-3")
+    
+    assert "item-3" not in [identifier for identifier, _ in index.query(vectors["item-3"], k=50)]
+    assert len(index.query(vectors["item-3"], k=100)) == 49
+
+
+def test_mismatched_dimensions_are_ignored_with_a_warning(caplog):
+    index = VectorIndex()
+    index.add("a", [1.0, 0.0, 0.0])
+    
+    index.add("b", [1.0, 0.0])
+    
+    assert "dimension 2" in caplog.text
+    assert "b" not in index.rows
+    assert [identifier for identifier, _ in index.query([1.0, 0.0, 0.0], k=10)] == ["a"]
@@ -0,0 +1,86 @@
+"""
+Tests for the asynchronous model calls.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from anus.models.base.base_model import BaseModel
+
+
+class BlockingModel(BaseModel):
+    """Synchronous model whose calls block and record their arguments."""
+    
+    def __init__(self, delay=0.0):
+        super().__init__("blocking")
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+    
+    def _call(self, name, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        self.calls.append((name, args, kwargs))
+        time.sleep(self.delay)
+    
+    def generate(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self._call("generate", prompt, system_message=system_message, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        return f"answer to {prompt}"
+    
+    def generate_with_tools(self, prompt, tools, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self._call("generate_with_tools", prompt, tools)
+        return {"content": prompt, "tool_calls": []}
+    
+    def extract_json(self, prompt, schema, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        self._call("extract_json", prompt, schema)
+        return {"value": prompt}
+    
+    def get_embedding(self, text, **kwargs):
+        self._call("get_embedding", text, **kwargs)
+        return [float(len(text))]
+
+
+def test_default_async_calls_delegate_to_sync_calls():
+    model = BlockingModel()
+    
+    async def run():
+        return (
+            await model.agenerate("hi", system_message="be brief", temperature=0.5, max_tokens=10, top_p=0.9),
+            await model.agenerate_with_tools("hi", [{"name": "search"}]),
+            await model.aextract_json("hi", {"type": "object"}),
+            await model.aget_embedding("abc", dimensions=8)
+        )
+    
+    assert asyncio.run(run()) == ("answer to hi", {"content": "hi", "tool_calls": []}, {"value": "hi"}, [3.0])
+    assert model.calls[0] == (
+        "generate", ("hi",), {"system_message": "be brief", "temperature": 0.5, "max_tokens": 10, "top_p": 0.9}
+    )
+    assert model.calls[3] == ("get_embedding", ("abc",), {"dimensions": 8})
+
+
+def test_default_async_calls_do_not_block_the_event_loop():
+    model = BlockingModel(delay=0.2)
+    
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(*(model.agenerate(f"prompt {i}") for i in range(4)))
+        return time.perf_counter() - start
+    
+    assert asyncio.run(run()) < 0.6
+    assert threading.get_ident() not in model.threads
+
+
+def test_async_clients_are_pooled_per_event_loop():
+    pytest.importorskip("openai")
+    from anus.models.openai_model import get_async_client, close_async_clients
+    
+    async def run():
+        first = get_async_client("key")
+        assert get_async_client("key") is first
+        assert get_async_client("other key") is not first
+        await close_async_clients()
+        return first
+    
+    assert asyncio.run(run()) is not asyncio.run(run())
@@ -0,0 +1,141 @@
+"""
+Tests for CachedModel.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from anus.models.base.base_model import BaseModel
+from anus.models.cached_model import CachedModel
+
+
+class CountingModel(BaseModel):
+    """Model that answers from a list of responses and counts calls."""
+    
+    def __init__(self, responses=None, temperature=0.0):
+        super().__init__("counting", temperature)
+        self.responses = list(responses or [])
+        self.calls = 0
+    
+    def _next(self, default):
+        self.calls += 1
+        return self.responses.pop(0) if self.responses else default
+    
+    def generate(self, prompt, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return self._next(f"answer to {prompt}")
+    
+    def generate_with_tools(self, prompt, tools, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return self._next({"content": prompt, "tool_calls": [{"name": "search"}]})
+    
+    def extract_json(self, prompt, schema, system_message=None, temperature=None, max_tokens=None, **kwargs):
+        return self._next({"value": prompt})
+    
+    def get_embedding(self, text, **kwargs):
+        return self._next([float(len(text)), 1.0])
+
+
+def test_repeated_deterministic_calls_hit_the_cache():
+    model = CountingModel()
+    cached = CachedModel(model)
+    
+    assert cached.generate("hi") == cached.generate("hi") == "answer to hi"
+    cached.generate("hi", system_message="be brief")
+    
+    assert model.calls == 2
+    stats = cached.get_stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 2)
+
+
+def test_sampled_calls_bypass_the_cache():
+    model = CountingModel()
+    cached = CachedModel(model)
+    
+    cached.generate("hi", temperature=0.7)
+    cached.generate("hi", temperature=0.7)
+    cached.generate("hi", stream=True)
+    
+    assert model.calls == 3
+    assert cached.get_stats()["bypassed"] == 3
+
+
+@pytest.mark.parametrize("error", ["Error: rate limit exceeded", "", None])
+def test_error_responses_are_not_cached(error):
+    model = CountingModel([error])
+    cached = CachedModel(model)
+    
+    assert cached.generate("hi") == error
+    assert cached.generate("hi") == "answer to hi"
+    assert model.calls == 2
+
+
+def test_failed_json_and_embedding_calls_are_not_cached():
+    model = CountingModel([{"error": "bad schema"}])
+    cached = CachedModel(model)
+    
+    assert cached.extract_json("x", {}) == {"error": "bad schema"}
+    assert cached.extract_json("x", {}) == {"value": "x"}
+    model.responses.append([])
+    assert cached.get_embedding("abc") == []
+    assert cached.get_embedding("abc") == [3.0, 1.0]
+    assert model.calls == 4
+
+
+def test_cached_responses_are_copies():
+    model = CountingModel()
+    cached = CachedModel(model)
+    
+    response = cached.generate_with_tools("hi", tools=[])
+    response["tool_calls"].clear()
+    
+    assert cached.generate_with_tools("hi", tools=[])["tool_calls"] == [{"name": "search"}]
+    assert model.calls == 1
+
+
+def test_entries_expire_after_ttl():
+    model = CountingModel()
+    cached = CachedModel(model, ttl=0.01)
+    
+    cached.get_embedding("abc")
+    time.sleep(0.02)
+    cached.get_embedding("abc")
+    
+    assert model.calls == 2
+    assert cached.get_stats()["expired"] == 1
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    first_model = CountingModel()
+    CachedModel(first_model, path=str(tmp_path)).generate("hi")
+    
+    second_model = CountingModel()
+    cached = CachedModel(second_model, path=str(tmp_path))
+    
+    assert cached.generate("hi") == "answer to hi"
+    assert cached.generate("hi") == "answer to hi"
+    assert second_model.calls == 0
+    stats = cached.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+
+
+def test_clear_removes_memory_and_disk_entries(tmp_path):
+    model = CountingModel()
+    cached = CachedModel(model, path=str(tmp_path))
+    cached.generate("hi")
+    
+    cached.clear()
+    cached.generate("hi")
+    
+    assert model.calls == 2
+
+
+def test_async_calls_share_the_cache():
+    model = CountingModel()
+    cached = CachedModel(model)
+    
+    cached.generate("hi")
+    
+    assert asyncio.run(cached.agenerate("hi")) == "answer to hi"
+    assert asyncio.run(cached.aget_embedding("abc")) == asyncio.run(cached.aget_embedding("abc"))
+    assert model.calls == 2